@@ -4,6 +4,12 @@ from tkinter import messagebox
 from PIL import Image, ImageTk
 import random
 import os
+import sys
+
+# The shared instrumentation module lives in the portfolio folder one level up
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import instrumentation as perf
+
 # Define difficulty levels
 DIFFICULTY = {1: (1, 9), 2: (10, 99), 3: (1000, 9999)}
 # Main Game Class
@@ -73,6 +79,7 @@ class GameQuiz:
 
     # Load image helper
     # This function loads an image from a file path and resizes it
+    @perf.timed("quiz.load_image")
     def load_image(self, path, default_size=(100,100)):
         # Try to open and resize the image
         try:
@@ -85,7 +92,15 @@ class GameQuiz:
             # Log the error
             return Image.new("RGBA", default_size, (200,200,200,255))
         
+    # Resize image helper
+    # This function resizes an image and converts it for Tkinter
+    @perf.timed("quiz.resize_image")
+    def resized_photo(self, image, size):
+        # Resize and wrap the image for the canvas
+        return ImageTk.PhotoImage(image.resize(size))
+
     # Handle window resize
+    @perf.timed("quiz.on_resize")
     def on_resize(self, event):
         # Check if the event is for the root window
         if event.widget == self.root:
@@ -137,7 +152,7 @@ class GameQuiz:
         # Clear canvas
         self.clearCanvas()
         # Resize and display background
-        self.bg_image = ImageTk.PhotoImage(self.bg_orig.resize((self.width, self.height)))
+        self.bg_image = self.resized_photo(self.bg_orig, (self.width, self.height))
         # Draw background image
         self.canvas.create_image(0, 0, image=self.bg_image, anchor="nw")
 
@@ -187,11 +202,11 @@ class GameQuiz:
         # Clear canvas
         self.clearCanvas()
         # Resize and display background
-        self.bg_image = ImageTk.PhotoImage(self.bg_orig.resize((self.width, self.height)))
+        self.bg_image = self.resized_photo(self.bg_orig, (self.width, self.height))
         # Load and resize decorations
-        self.mushroom_img = ImageTk.PhotoImage(self.mushroom_orig.resize((int(self.width*0.08), int(self.height*0.08))))
+        self.mushroom_img = self.resized_photo(self.mushroom_orig, (int(self.width*0.08), int(self.height*0.08)))
         # Load and resize tree image
-        self.tree_img = ImageTk.PhotoImage(self.tree_orig.resize((int(self.width*0.12), int(self.height*0.12))))
+        self.tree_img = self.resized_photo(self.tree_orig, (int(self.width*0.12), int(self.height*0.12)))
 
         # Draw background and decorations
         # Draw background image
@@ -261,7 +276,7 @@ class GameQuiz:
         # Clear canvas
         self.clearCanvas()
         # Resize and display background
-        self.bg_image = ImageTk.PhotoImage(self.bg_orig.resize((self.width, self.height)))
+        self.bg_image = self.resized_photo(self.bg_orig, (self.width, self.height))
         # Draw background image
         self.canvas.create_image(0, 0, image=self.bg_image, anchor="nw")
 
@@ -305,6 +320,7 @@ class GameQuiz:
 
     # Check the submitted answer
     # Validate user input
+    @perf.timed("quiz.check_answer")
     def checkAnswer(self):
         # Ensure answer entry is not empty
         try:
@@ -367,7 +383,7 @@ class GameQuiz:
         # Clear canvas
         self.clearCanvas()
         # Set background image
-        self.bg_image = ImageTk.PhotoImage(self.bg_orig.resize((self.width, self.height)))
+        self.bg_image = self.resized_photo(self.bg_orig, (self.width, self.height))
         # Add background image to canvas
         self.canvas.create_image(0, 0, image=self.bg_image, anchor="nw")
 
@@ -417,5 +433,7 @@ if __name__ == "__main__":
     root = tk.Tk()
     # Create game instance
     app = GameQuiz(root)
+    # Hidden performance report (Ctrl+Shift+D)
+    perf.install_debug_panel(root)
     # Start the Tkinter event loop
     root.mainloop()
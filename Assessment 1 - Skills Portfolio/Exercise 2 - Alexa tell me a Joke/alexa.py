@@ -3,6 +3,13 @@ import tkinter as tk
 from tkinter import messagebox
 import random
 import os
+import sys
+
+# The shared instrumentation module lives in the portfolio folder one level up
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import instrumentation as perf
+
+from joke_ingest import JokeLoadStats, load_jokes
 
 # Define the expected path to the joke file
 FILE_PATH = os.path.join("resources", "randomJokes.txt")
@@ -82,21 +89,16 @@ class JokeTellerApp:
         self.quit_button.pack(pady=(10, 0))
     
     # --- Application Methods ---
+    @perf.timed("jokes.load_jokes_from_file")
     def load_jokes_from_file(self, file_path):
         """Attempts to load jokes from the specified file path."""
         jokes_list = []
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if '?' in line:
-                        try:
-                            # Split only on the first question mark
-                            setup, punchline = line.split('?', 1) 
-                            jokes_list.append((setup.strip() + '?', punchline.strip()))
-                        except ValueError:
-                            # Skip lines that are malformed after the split
-                            continue
+            # Split on the first question mark, normalised, with repeated jokes left out
+            stats = JokeLoadStats()
+            jokes_list = load_jokes(file_path, stats)
+            perf.count("jokes.malformed_lines", stats.malformed)
+            perf.count("jokes.duplicates", stats.duplicates)
             # Check if any jokes were loaded
             if not jokes_list:
                 # Show error if no valid jokes were found
@@ -112,6 +114,7 @@ class JokeTellerApp:
             # Return an empty list if an unexpected error occurred
         return jokes_list
     # --- Button Command Methods ---
+    @perf.timed("jokes.tell_new_joke")
     def tell_new_joke(self):
         """Randomly selects a new joke, displays the setup, and resets the view."""
         if not self.jokes:
@@ -136,6 +139,7 @@ class JokeTellerApp:
         if self.joke_button['text'] == "Alexa tell me a Joke":
             self.joke_button.config(text="Next Joke")
 
+    @perf.timed("jokes.show_punchline")
     def show_punchline(self):
         """Displays the punchline for the current joke."""
         _, punchline = self.current_joke
@@ -150,4 +154,6 @@ class JokeTellerApp:
 if __name__ == "__main__":
     root = tk.Tk()
     app = JokeTellerApp(root)
+    # Hidden performance report (Ctrl+Shift+D)
+    perf.install_debug_panel(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,296 @@
+# Alexa - Multi-Process Joke Service
+# Serves jokes to many clients from one copy of the corpus. The loader parses
+# the jokes file once (normalised and deduplicated, as the app loads it) and
+# packs the jokes and an offset index into a multiprocessing.shared_memory
+# block. Worker processes attach to the block by name and read jokes straight
+# out of it, so each worker's own memory stays the same however big the
+# corpus grows, and workers can be added until the cores run out.
+#
+# Usage (from this folder):
+#   python -m joke_server                                  # resources/randomJokes.txt on 127.0.0.1:8766
+#   python -m joke_server --file clean.txt --workers 4 --port 9001
+#
+# Protocol: one command per line over TCP, one reply line each (UTF-8).
+#   tell me a joke | joke     the setup of a joke this client has not heard yet
+#   punchline                 the punchline of the last joke told
+#   stats                     corpus size, worker pid and jokes told on this connection
+#   quit                      close the connection
+# Errors are replied as 'ERROR: <message>'. Each connection is one client: it
+# hears every joke once, in a shuffled order, before any joke comes round again.
+#
+# Shared block layout: a 16-byte header (magic, joke count), then 2 * count + 1
+# little-endian uint64 offsets, then the UTF-8 text. Joke i's setup is
+# text[offsets[2i]:offsets[2i + 1]] and its punchline runs to offsets[2i + 2].
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import struct
+import sys
+from array import array
+from multiprocessing import shared_memory
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+DEFAULT_WORKERS = os.cpu_count() or 1
+BACKLOG = 2048
+# Longest command line accepted from a client
+MAX_COMMAND_BYTES = 1024
+
+HEADER = struct.Struct("<4sxxxxQ")
+MAGIC = b"JOKE"
+OFFSET_SIZE = 8
+
+JOKE_COMMANDS = {"tell me a joke", "joke", "alexa tell me a joke"}
+PUNCHLINE_COMMANDS = {"punchline", "show punchline"}
+# Rounds of the Feistel network that shuffles each client's joke order
+FEISTEL_ROUNDS = 6
+
+
+# --- Shared corpus ---
+def create_corpus(jokes):
+    """Packs (setup, punchline) pairs into a new SharedMemory block and returns it.
+
+    The caller owns the block and must close() and unlink() it when finished.
+    """
+    offsets = array('Q', [0])
+    text = bytearray()
+    for setup, punchline in jokes:
+        text += setup.encode('utf-8')
+        offsets.append(len(text))
+        text += punchline.encode('utf-8')
+        offsets.append(len(text))
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    index_end = HEADER.size + len(offsets) * OFFSET_SIZE
+    # A zero-sized block cannot be created, so an empty corpus still has its header
+    block = shared_memory.SharedMemory(create=True, size=index_end + len(text))
+    HEADER.pack_into(block.buf, 0, MAGIC, len(jokes))
+    block.buf[HEADER.size:index_end] = offsets.tobytes()
+    block.buf[index_end:index_end + len(text)] = text
+    return block
+
+
+class SharedCorpus:
+    """Read-only view of a corpus block; jokes are decoded on demand, nothing is copied up front."""
+    def __init__(self, name):
+        # Workers are started by the loader and share its resource tracker, so attaching
+        # here never makes a worker's exit unlink the block; only the loader does that
+        self._block = shared_memory.SharedMemory(name=name)
+        buf = self._block.buf
+        magic, self.count = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            self._block.close()
+            raise ValueError(f"shared memory block '{name}' is not a joke corpus")
+        index_end = HEADER.size + (2 * self.count + 1) * OFFSET_SIZE
+        self._offsets = buf[HEADER.size:index_end].cast('Q')
+        self._text = buf[index_end:]
+
+    def __len__(self):
+        return self.count
+
+    def setup(self, i):
+        offsets = self._offsets
+        return str(self._text[offsets[2 * i]:offsets[2 * i + 1]], 'utf-8')
+
+    def punchline(self, i):
+        offsets = self._offsets
+        return str(self._text[offsets[2 * i + 1]:offsets[2 * i + 2]], 'utf-8')
+
+    def close(self):
+        # The views must be released before the mapping can be closed
+        self._offsets.release()
+        self._text.release()
+        self._block.close()
+
+
+class NoRepeatOrder:
+    """Yields 0..n-1 in a shuffled order with no repeats, then reshuffles, in constant memory.
+
+    Each cycle is a keyed permutation: a small Feistel network over the bits
+    of the index, with random round keys, and indexes that land past n are fed
+    through again (cycle-walking) until they fall inside. A client's state is
+    a few integers rather than a shuffled list the size of the corpus.
+    """
+    def __init__(self, n, rng):
+        self.n = n
+        self.rng = rng
+        self.last = None
+        # The network runs over 2 * half_bits bits, the fewest that cover 0..n-1
+        self.half_bits = max(1, ((n - 1).bit_length() + 1) // 2)
+        self.half_mask = (1 << self.half_bits) - 1
+        self._reshuffle()
+
+    def _reshuffle(self):
+        self.keys = [self.rng.getrandbits(64) for _ in range(FEISTEL_ROUNDS)]
+        # Don't start the new cycle with the joke that ended the last one
+        while self.n > 1 and self._permute(0) == self.last:
+            self.keys = [self.rng.getrandbits(64) for _ in range(FEISTEL_ROUNDS)]
+        self.position = 0
+
+    def _permute(self, index):
+        value = self._feistel(index)
+        # The domain is under 4n, so this takes fewer than four passes on average
+        while value >= self.n:
+            value = self._feistel(value)
+        return value
+
+    def _feistel(self, value):
+        bits, mask = self.half_bits, self.half_mask
+        left, right = value >> bits, value & mask
+        for key in self.keys:
+            # Round function: a 64-bit multiply-xorshift hash of the keyed half, top bits kept
+            mixed = ((right ^ key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+            mixed = ((mixed ^ (mixed >> 32)) * 0xD6E8FEB86659FD93) & 0xFFFFFFFFFFFFFFFF
+            left, right = right, left ^ (mixed >> (64 - bits))
+        return (left << bits) | right
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.n:
+            raise StopIteration
+        if self.position == self.n:
+            self._reshuffle()
+        self.last = self._permute(self.position)
+        self.position += 1
+        return self.last
+
+
+# --- Worker ---
+class JokeWorker:
+    """Answers joke commands on the shared listening socket from one process."""
+    def __init__(self, corpus):
+        self.corpus = corpus
+        self.rng = random.Random()
+
+    def reply(self, command, client):
+        """Returns the reply line for one command; client is the connection's state dict."""
+        corpus = self.corpus
+        if command in JOKE_COMMANDS:
+            if not corpus.count:
+                return "ERROR: There are no jokes loaded."
+            client['current'] = next(client['order'])
+            client['told'] += 1
+            return corpus.setup(client['current'])
+        if command in PUNCHLINE_COMMANDS:
+            if client['current'] is None:
+                return "ERROR: Ask for a joke first."
+            return corpus.punchline(client['current'])
+        if command == "stats":
+            return f"jokes={corpus.count} worker={os.getpid()} told={client['told']}"
+        return f"ERROR: Unknown command '{command}'. Try 'tell me a joke' or 'punchline'."
+
+    async def handle(self, reader, writer):
+        client = {'order': NoRepeatOrder(self.corpus.count, self.rng), 'current': None, 'told': 0}
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    # ValueError: a command longer than the stream limit
+                    return
+                if not line:
+                    return
+                command = line.decode('utf-8', 'replace').strip().lower()
+                if command == "quit":
+                    return
+                writer.write(self.reply(command, client).encode('utf-8') + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, listener):
+        server = await asyncio.start_server(self.handle, sock=listener, limit=MAX_COMMAND_BYTES)
+        async with server:
+            await server.serve_forever()
+
+
+def worker_main(listener, block_name):
+    """Process entry point: attaches to the corpus and serves until terminated."""
+    # The loader stops the workers with SIGTERM; Ctrl+C goes to the loader only
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    corpus = SharedCorpus(block_name)
+    try:
+        asyncio.run(JokeWorker(corpus).serve(listener))
+    finally:
+        corpus.close()
+
+
+# --- Loader ---
+def _listen(host, port):
+    listener = socket.create_server((host, port), backlog=BACKLOG)
+    listener.setblocking(False)
+    return listener
+
+
+def serve(file_path, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_WORKERS, ready=None):
+    """Loads the corpus into shared memory and runs workers until interrupted or terminated.
+
+    ready (if given) is called with (joke count, block size, bound port) once the workers are started.
+    """
+    from joke_ingest import JokeLoadStats, load_jokes
+    stats = JokeLoadStats()
+    jokes = load_jokes(file_path, stats)
+    block = create_corpus(jokes)
+    # The block holds the corpus now; the loader keeps no copy of its own
+    del jokes
+    listener = _listen(host, port)
+    # Workers start from a fresh interpreter, so none inherits the loader's memory
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=worker_main, args=(listener, block.name), daemon=True)
+                 for _ in range(max(1, workers))]
+    # SIGTERM unwinds through the finally below, so the block is always unlinked
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        for process in processes:
+            process.start()
+        if ready is not None:
+            ready(stats.loaded, block.size, listener.getsockname()[1])
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            if process.pid is not None:
+                process.join()
+        listener.close()
+        block.close()
+        block.unlink()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="joke_server", description="Serve jokes from shared memory to many clients.")
+    parser.add_argument("--file", default=os.path.join("resources", "randomJokes.txt"),
+                        help="jokes file to serve (default: %(default)s)")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port (default: %(default)s; 0 picks one)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="worker processes (default: one per CPU, %(default)s)")
+    args = parser.parse_args(argv)
+
+    def ready(count, size, port):
+        # The load-test client waits for this line when it starts the server itself
+        print(f"Serving {count} jokes ({size / (1024 * 1024):.1f} MB shared) with {args.workers} workers "
+              f"on {args.host}:{port}", flush=True)
+
+    try:
+        serve(args.file, args.host, args.port, args.workers, ready)
+    except OSError as e:
+        print(f"joke_server: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,115 +2,33 @@
 # This program reads student marks from a file, processes the data,
 import tkinter as tk
 from tkinter import messagebox, simpledialog, scrolledtext
-import os
 
-# Define the expected path to the student marks file
-FILE_PATH = os.path.join("resources", "studentMarks.txt")
-
-# --- Data Structure for Students ---
-class Student:
-    # Initializes a Student object with provided data and calculates totals, percentage, and grade.
-    def __init__(self, code, name, c1, c2, c3, exam):
-        # Raw Data
-        self.code = code
-        self.name = name
-        self.c1 = int(c1)
-        self.c2 = int(c2)
-        self.c3 = int(c3)
-        self.exam = int(exam)
-        
-        # Calculations
-        self.coursework_total = self.c1 + self.c2 + self.c3 # Max 60
-        self.overall_total = self.coursework_total + self.exam # Max 160
-        self.percentage = (self.overall_total / 160) * 100
-        self.grade = self.calculate_grade()
-
-    def calculate_grade(self):
-        """Calculates the student's grade based on percentage."""
-        # 'A' for 70%+, 'B' for 60%-69%, 'C' for 50%-59%, 'D' for 40%-49%, 'F' for under 40%
-        if self.percentage >= 70:
-            return 'A'
-        elif 60 <= self.percentage < 70:
-            return 'B'
-        elif 50 <= self.percentage < 60:
-            return 'C'
-        elif 40 <= self.percentage < 50:
-            return 'D'
-        else:
-            return 'F'
-
-    def format_details(self):
-        """Formats the student's results into a readable string."""
-        return (
-            f"Student Name: {self.name}\n"
-            f"Student Number: {self.code}\n"
-            f"Coursework Total: {self.coursework_total} / 60\n"
-            f"Exam Mark: {self.exam} / 100\n"
-            f"Overall Percentage: {self.percentage:.2f}%\n"
-            f"Student Grade: {self.grade}\n"
-            f"{'-' * 40}"
-        )
+from student_core import FILE_PATH, StudentStore
+from student_gui import StudentAppBase, perf
+from student_writeback import WriteBackEngine
 
 # --- Main Application Class ---
-class StudentApp:
+class StudentApp(StudentAppBase):
     def __init__(self, master):
         self.master = master
         master.title("Student Marks Analyser")
-        master.geometry("600x450")
+        master.geometry("600x580")
         master.config(bg='#f0f0f0')
 
         # --- Data Storage ---
         self.students = self.load_data()
         self.num_students = len(self.students)
+        # Saves edits from menu items 6-8 back to the marks file (SQLite and archive stores are read-only)
+        self.writer = None
+        if isinstance(self.students, StudentStore):
+            self.writer = WriteBackEngine(self.students, FILE_PATH, load_stats=self.load_stats)
         
         # --- GUI Elements ---
         self.create_menu()
+        self.create_search_bar(self.master).pack(fill='x', padx=10, pady=(10, 0))
         self.create_output_area()
         self.display_welcome()
 
-    # --- Data Loading and Parsing ---
-    def load_data(self):
-        """Loads data from the 'studentMarks.txt' file and parses it into Student objects."""
-        students_list = []
-        data_lines = []
-        
-        try:
-            with open(FILE_PATH, 'r', encoding='utf-8') as f:
-                data_lines = f.readlines()
-        except FileNotFoundError:
-            messagebox.showerror("File Not Found", 
-                                f"FATAL ERROR: The required file '{FILE_PATH}' was not found. Please ensure it is in the correct location and restart the application.")
-            return []
-        except Exception as e:
-            messagebox.showerror("Loading Error", f"An error occurred while reading the file: {e}")
-            return []
-
-        if not data_lines:
-            messagebox.showwarning("Empty File", f"The file '{FILE_PATH}' is empty.")
-            return []
-
-        # Process subsequent lines (after the initial student count)
-        for line in data_lines[1:]:
-            parts = line.strip().split(',')
-            if len(parts) == 6:
-                try:
-                    code, name, c1, c2, c3, exam = parts
-                    students_list.append(Student(code.strip(), name.strip(), c1, c2, c3, exam))
-                except ValueError:
-                    # Skip lines with non-integer mark values
-                    continue
-        
-        # Optional: Check if the loaded count matches the first line's count
-        try:
-            expected_count = int(data_lines[0].strip())
-            if len(students_list) != expected_count:
-                messagebox.showwarning("Data Mismatch", 
-                                    f"WARNING: File header specified {expected_count} students, but only {len(students_list)} valid records were loaded.")
-        except ValueError:
-            messagebox.showwarning("Header Error", "WARNING: Could not parse the student count from the first line of the file.")
-
-        return students_list
-
     # --- GUI Setup ---
     def create_menu(self):
         """Creates the main menu bar for the application."""
@@ -128,10 +46,28 @@ class StudentApp:
         actions_menu.add_command(label="3. Show Highest Total Score", command=self.show_highest_score)
         # Menu Item 4
         actions_menu.add_command(label="4. Show Lowest Total Score", command=self.show_lowest_score)
+        actions_menu.add_command(label="Students in Percentage Range", command=self.view_percentage_range)
+        actions_menu.add_command(label="Show Charts", command=self.show_charts)
+        actions_menu.add_command(label="Cohort Statistics", command=self.show_statistics)
+        actions_menu.add_command(label="Export Current View...", command=self.export_current_view)
+        actions_menu.add_command(label="Compare Cohort Files...", command=self.compare_cohorts)
+
+        actions_menu.add_separator()
+        # Menu Item 6
+        actions_menu.add_command(label="6. Add a Student Record", command=self.add_student_record)
+        # Menu Item 7
+        actions_menu.add_command(label="7. Delete a Student Record", command=self.delete_student_record)
+        # Menu Item 8
+        actions_menu.add_command(label="8. Update a Student's Record", command=self.update_student_record)
         
         actions_menu.add_separator()
         actions_menu.add_command(label="Quit", command=self.master.destroy)
 
+        grading_menu = tk.Menu(menu_bar, tearoff=0)
+        menu_bar.add_cascade(label="Grading", menu=grading_menu)
+        grading_menu.add_command(label="Switch Grading Scheme...", command=self.switch_grading_scheme)
+        grading_menu.add_command(label="Compare Two Schemes...", command=self.compare_grading_schemes)
+
     def create_output_area(self):
         """Creates the main scrolled text area for displaying output."""
         output_frame = tk.Frame(self.master, padx=10, pady=10, bg='#ffffff')
@@ -144,13 +80,6 @@ class StudentApp:
         self.output_area.pack(fill='both', expand=True)
         self.output_area.config(state=tk.DISABLED)
 
-    def display_output(self, text):
-        """Helper to safely insert text into the output area."""
-        self.output_area.config(state=tk.NORMAL)
-        self.output_area.delete('1.0', tk.END)
-        self.output_area.insert(tk.END, text)
-        self.output_area.config(state=tk.DISABLED)
-
     def display_welcome(self):
         """Displays a welcome message on startup."""
         if not self.students:
@@ -169,99 +98,122 @@ class StudentApp:
             "1. View all student records\n"
             "2. View individual student record\n"
             "3. Show student with highest total score\n"
-            "4. Show student with lowest total score"
+            "4. Show student with lowest total score\n"
+            "6. Add a student record\n"
+            "7. Delete a student record\n"
+            "8. Update a student's record"
         )
 
-    # --- Menu Functionality ---
-    
-    # 1. View all student records
-    def view_all_records(self):
-        """Outputs all student records and class summary."""
-        if not self.students:
-            self.display_output("No student data available to view.")
+    # --- Editing Functionality ---
+    def ask_student(self, title):
+        """Asks for a student code or name and returns the matching student, or None."""
+        search_term = simpledialog.askstring(title, "Enter Student Code or Name:", parent=self.master)
+        if not search_term:
+            return None
+        student = self.students.find(search_term)
+        if student is None:
+            self.display_output(f"Error: Student with code or name '{search_term.strip().lower()}' not found.")
+        return student
+
+    def ensure_writable(self):
+        """Returns True if edits can be saved; otherwise shows the Read Only message and returns False."""
+        if self.writer is None:
+            messagebox.showerror("Read Only", "Editing is only available when using the text marks file.",
+                                 parent=self.master)
+            return False
+        return True
+
+    def save_edit(self, edit, *args, **kwargs):
+        """Runs one write-back edit, showing any validation or file error. Returns the student or None."""
+        # The export thread is reading the same list of students
+        if self.export_job is not None:
+            messagebox.showerror("Export Running", "Please wait for the export to finish or cancel it first.",
+                                 parent=self.master)
+            return None
+        try:
+            with self.changing_store():
+                student = edit(*args, **kwargs)
+        except ValueError as e:
+            messagebox.showerror("Invalid Record", str(e), parent=self.master)
+            return None
+        except OSError as e:
+            messagebox.showerror("Save Error", f"The change could not be saved to '{FILE_PATH}': {e}",
+                                 parent=self.master)
+            return None
+        self.num_students = len(self.students)
+        # The shared copy of the marks is out of date now
+        self.drop_shared_cohort()
+        return student
+
+    # 6. Add a student record
+    def add_student_record(self):
+        """Prompts for every field of a new student and saves it."""
+        if not self.ensure_writable():
+            return
+        fields = []
+        for prompt in ("Student Code (1000-9999):", "Student Name:", "Coursework 1 Mark (0-20):",
+                       "Coursework 2 Mark (0-20):", "Coursework 3 Mark (0-20):", "Exam Mark (0-100):"):
+            value = simpledialog.askstring("Add Student", prompt, parent=self.master)
+            if value is None:
+                return
+            fields.append(value)
+
+        student = self.save_edit(self.writer.add_student, *fields)
+        if student:
+            self.display_output(f"--- STUDENT ADDED ---\n{student.format_details()}")
+
+    # 7. Delete a student record
+    def delete_student_record(self):
+        """Deletes a student chosen by code or name after confirmation."""
+        if not self.ensure_writable():
             return
-
-        all_details = "--- ALL STUDENT RECORDS ---\n"
-        total_percentage_sum = 0
-        
-        for student in self.students:
-            all_details += student.format_details()
-            total_percentage_sum += student.percentage
-
-        # Summary calculations
-        average_percentage = total_percentage_sum / self.num_students if self.num_students > 0 else 0
-
-        summary = (
-            "\n--- CLASS SUMMARY ---\n"
-            f"Number of Students in Class: {self.num_students}\n"
-            f"Average Percentage Mark Obtained: {average_percentage:.2f}%\n"
-            "---------------------"
-        )
-        
-        self.display_output(all_details + summary)
-        
-    def view_individual_record(self):
-        """Allows user to select a student by code or name and displays their record."""
         if not self.students:
             self.display_output("No student data available.")
             return
-
-        search_term = simpledialog.askstring("Search Student", "Enter Student Code or Name:", 
-                                            parent=self.master)
-        
-        if not search_term:
+        student = self.ask_student("Delete Student")
+        if student is None:
             return
-
-        search_term = search_term.strip().lower()
-        found_student = None
-
-        for student in self.students:
-            if student.code == search_term or student.name.lower() == search_term:
-                found_student = student
-                break
-        
-        if found_student:
-            output = f"--- INDIVIDUAL STUDENT RECORD ---\n{found_student.format_details()}"
-        else:
-            output = f"Error: Student with code or name '{search_term}' not found."
-            
-        self.display_output(output)
-
-    def show_highest_score(self):
-        """Identifies and displays the student with the highest overall score."""
-        if not self.students:
-            self.display_output("No student data available to analyse.")
+        if not messagebox.askyesno("Delete Student", f"Delete the record for {student.name} ({student.code})?",
+                                   parent=self.master):
             return
 
-        highest_student = max(self.students, key=lambda s: s.overall_total)
+        if self.save_edit(self.writer.delete_student, student.code):
+            self.display_output(f"--- STUDENT DELETED ---\n{student.format_details()}")
 
-        output = (
-            "--- STUDENT WITH HIGHEST TOTAL SCORE ---\n"
-            f"Highest Score: {highest_student.overall_total} / 160\n"
-            f"{'-' * 40}\n"
-            f"{highest_student.format_details()}"
-        )
-        self.display_output(output)
-
-    # 4. Show student with lowest overall mark
-    def show_lowest_score(self):
-        """Identifies and displays the student with the lowest overall score."""
+    # 8. Update a student's record
+    def update_student_record(self):
+        """Updates one field of a student chosen by code or name."""
+        if not self.ensure_writable():
+            return
         if not self.students:
-            self.display_output("No student data available to analyse.")
+            self.display_output("No student data available.")
+            return
+        student = self.ask_student("Update Student")
+        if student is None:
             return
 
-        lowest_student = min(self.students, key=lambda s: s.overall_total)
+        # Sub-menu of the fields that can be changed
+        fields = [('code', "Code"), ('name', "Name"), ('c1', "Coursework 1"), ('c2', "Coursework 2"),
+                  ('c3', "Coursework 3"), ('exam', "Exam")]
+        menu_text = "\n".join(f"{i}. {label} (currently {getattr(student, field)})"
+                              for i, (field, label) in enumerate(fields, start=1))
+        choice = simpledialog.askinteger("Update Student", f"Which item do you want to update?\n{menu_text}",
+                                         parent=self.master, minvalue=1, maxvalue=len(fields))
+        if choice is None:
+            return
+        field, label = fields[choice - 1]
+        value = simpledialog.askstring("Update Student", f"New {label}:", parent=self.master)
+        if value is None:
+            return
 
-        output = (
-            "--- STUDENT WITH LOWEST TOTAL SCORE ---\n"
-            f"Lowest Score: {lowest_student.overall_total} / 160\n"
-            f"{'-' * 40}\n"
-            f"{lowest_student.format_details()}"
-        )
-        self.display_output(output)
+        updated = self.save_edit(self.writer.update_student, student.code, **{field: value})
+        if updated:
+            self.display_output(f"--- STUDENT UPDATED ---\n{updated.format_details()}")
 
 # --- Main Execution ---
 if __name__ == "__main__":
     root = tk.Tk()
     app = StudentApp(root)
+    # Hidden performance report (Ctrl+Shift+D)
+    perf.install_debug_panel(root)
     root.mainloop()
\ No newline at end of file
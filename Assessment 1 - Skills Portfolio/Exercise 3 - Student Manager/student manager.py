@@ -1,82 +1,28 @@
 # Student Manager Application
 import tkinter as tk
-from tkinter import messagebox, simpledialog, scrolledtext
-import os
-import sys
+from tkinter import scrolledtext
 
-# Define the expected path to the student marks file
-FILE_PATH = os.path.join("resources", "studentMarks.txt")
-
-# --- Data Structure for Students ---
-class Student:
-    # (Student class definition remains unchanged)
-    def __init__(self, code, name, c1, c2, c3, exam):
-        # Initialize student attributes and calculate totals, percentage, and grade
-        self.code = code
-        # Student's full name
-        self.name = name
-        # Coursework and exam marks
-        self.c1 = int(c1)
-        # Coursework 1 mark
-        self.c2 = int(c2)
-        # Coursework 2 mark
-        self.c3 = int(c3)
-        # Coursework 3 mark
-        self.exam = int(exam)
-        
-        # Calculate totals and grade
-        self.coursework_total = self.c1 + self.c2 + self.c3 
-        # Total coursework marks out of 60
-        self.overall_total = self.coursework_total + self.exam 
-        # Overall total marks out of 160
-        self.percentage = (self.overall_total / 160) * 100
-        # Calculate the student's grade based on the percentage
-        self.grade = self.calculate_grade()
-    
-    # Calculate the student's grade based on percentage
-    def calculate_grade(self):
-        # Determine grade based on percentage thresholds
-        # A: 70% and above, B: 60-69%, C: 50-59%, D: 40-49%, F: below 40%
-        if self.percentage >= 70:
-            return 'A'
-        elif 60 <= self.percentage < 70:
-            return 'B'
-        elif 50 <= self.percentage < 60:
-            return 'C'
-        elif 40 <= self.percentage < 50:
-            return 'D'
-        else:
-            return 'F'
-    # Format student details for display
-    def format_details(self):
-        # Return a formatted string of the student's details
-        return (
-            # Student details formatted for display
-            f"Student Name: {self.name}\n"
-            f"Student Number: {self.code}\n"
-            f"Coursework Total: {self.coursework_total} / 60\n"
-            f"Exam Mark: {self.exam} / 100\n"
-            f"Overall Percentage: {self.percentage:.2f}%\n"
-            f"Student Grade: {self.grade}\n"
-            f"{'-' * 40}"
-        )
+from student_gui import StudentAppBase, perf
 
 # --- Main Application Class ---
-class StudentApp:
+class StudentApp(StudentAppBase):
+    # The file is required, so close the window if it cannot be loaded
+    EXIT_ON_LOAD_ERROR = True
+
     # Initialize the application with the main window (master)
     def __init__(self, master):
         # Set up the main application window
         self.master = master
         # Configure the main window's title, size, and background color
         master.title("Student Marks Analyser 📊")
-        # Set the window size to 800x600 pixels
-        master.geometry("800x600")
+        # Set the window size to 800x700 pixels
+        master.geometry("800x700")
         # Set the background color
         master.config(bg='#f0f0f0')
         
-        # Configure the main window grid: Column 0 expands, Row 2 expands
+        # Configure the main window grid: Column 0 expands, Row 3 (the output) expands
         master.grid_columnconfigure(0, weight=1)
-        master.grid_rowconfigure(2, weight=1) 
+        master.grid_rowconfigure(3, weight=1)
 
         # --- Data Storage ---
         self.students = self.load_data()
@@ -85,58 +31,10 @@ class StudentApp:
         # --- GUI Elements ---
         self.create_title_label()
         self.create_button_bar() 
+        self.create_search_area()
         self.create_output_area() 
         self.display_welcome()
 
-    # --- Data Loading and Parsing (Unchanged) ---
-    # Load student data from the specified file
-    def load_data(self):
-        # Initialize an empty list to hold student records
-        students_list = []
-        # Initialize an empty list to hold lines read from the file
-        data_lines = []
-
-        # Attempt to open and read the student marks file
-        try:
-            # Open the file with UTF-8 encoding
-            with open(FILE_PATH, 'r', encoding='utf-8') as f:
-                # Read all lines from the file
-                data_lines = f.readlines()
-        # Handle file not found error
-        except FileNotFoundError:
-            # Show error message and exit application
-            messagebox.showerror("File Not Found", 
-                                f"FATAL ERROR: The required file '{FILE_PATH}' was not found. Exiting.")
-            # Exit the application due to missing file
-            sys.exit() 
-        # Handle other exceptions during file reading
-        except Exception as e:
-            messagebox.showerror("Loading Error", f"An error occurred while reading the file: {e}")
-            sys.exit()
-        # Check if the file is empty
-        if not data_lines:
-            messagebox.showwarning("Empty File", f"The file '{FILE_PATH}' is empty.")
-            return []
-        # Parse each line after the header to create Student objects
-        for line in data_lines[1:]:
-            parts = line.strip().split(',')
-            if len(parts) == 6:
-                try:
-                    code, name, c1, c2, c3, exam = parts
-                    students_list.append(Student(code.strip(), name.strip(), c1, c2, c3, exam))
-                except ValueError:
-                    continue
-        # Check for mismatch between expected and actual student count
-        try:
-            expected_count = int(data_lines[0].strip())
-            if len(students_list) != expected_count:
-                messagebox.showwarning("Data Mismatch", 
-                                    f"WARNING: File header specified {expected_count} students, but only {len(students_list)} valid records were loaded.")
-        # Consider handling this discrepancy, e.g., logging or adjusting the list
-        except ValueError:
-            messagebox.showwarning("Header Error", "WARNING: Could not parse the student count from the first line of the file.")
-        return students_list
-
     # --- GUI Setup with Buttons and Labels ---
     def create_title_label(self):
         """Creates a descriptive title label."""
@@ -156,7 +54,7 @@ class StudentApp:
             button_bar.grid_columnconfigure(i, weight=1)
 
         # *** MODIFIED BUTTON TEXTS FOR CONCISENESS ***
-        btn_style = {'font': ('Arial', 10, 'bold'), 'width': 18, 'pady': 5} # Reduced width for space
+        btn_style = {'font': ('Arial', 10, 'bold'), 'width': 12, 'pady': 5} # Reduced width for space
 
         # 1. View All
         btn_all = tk.Button(button_bar, text="1. View All", command=self.view_all_records,
@@ -183,12 +81,51 @@ class StudentApp:
                              bg='#F44336', fg='white', **btn_style)
         btn_quit.grid(row=0, column=4, padx=5, sticky='ew')
 
+        # Second row: extra views and export
+        # Percentage Range
+        btn_range = tk.Button(button_bar, text="% Range", command=self.view_percentage_range,
+                              bg='#9C27B0', fg='white', **btn_style)
+        btn_range.grid(row=1, column=0, padx=5, pady=(5, 0), sticky='ew')
+
+        # Charts
+        btn_charts = tk.Button(button_bar, text="Charts", command=self.show_charts,
+                               bg='#009688', fg='white', **btn_style)
+        btn_charts.grid(row=1, column=1, padx=5, pady=(5, 0), sticky='ew')
+
+        # Export the results on screen
+        btn_export = tk.Button(button_bar, text="Export...", command=self.export_current_view,
+                               bg='#607D8B', fg='white', **btn_style)
+        btn_export.grid(row=1, column=2, padx=5, pady=(5, 0), sticky='ew')
+
+        # Grading schemes
+        btn_scheme = tk.Button(button_bar, text="Grading...", command=self.switch_grading_scheme,
+                               bg='#795548', fg='white', **btn_style)
+        btn_scheme.grid(row=1, column=3, padx=5, pady=(5, 0), sticky='ew')
+
+        btn_compare = tk.Button(button_bar, text="Compare...", command=self.compare_grading_schemes,
+                                bg='#3F51B5', fg='white', **btn_style)
+        btn_compare.grid(row=1, column=4, padx=5, pady=(5, 0), sticky='ew')
+
+        # Third row: compare several marks files
+        btn_cohorts = tk.Button(button_bar, text="Cohorts...", command=self.compare_cohorts,
+                                bg='#00796B', fg='white', **btn_style)
+        btn_cohorts.grid(row=2, column=0, padx=5, pady=(5, 0), sticky='ew')
+
+        btn_stats = tk.Button(button_bar, text="Statistics", command=self.show_statistics,
+                              bg='#5D4037', fg='white', **btn_style)
+        btn_stats.grid(row=2, column=1, padx=5, pady=(5, 0), sticky='ew')
+
+
+    def create_search_area(self):
+        """Creates the search-as-you-type box and its list of matches."""
+        # Placed in Row 2
+        self.create_search_bar(self.master).grid(row=2, column=0, sticky='ew', padx=20, pady=5)
 
     def create_output_area(self):
         """Creates the main scrolled text area for displaying output."""
         output_frame = tk.Frame(self.master, padx=10, pady=5, bg='#ffffff')
-        # Placed in Row 2
-        output_frame.grid(row=2, column=0, sticky='nsew', padx=10, pady=5)
+        # Placed in Row 3
+        output_frame.grid(row=3, column=0, sticky='nsew', padx=10, pady=5)
         
         self.output_area = scrolledtext.ScrolledText(output_frame, wrap=tk.WORD, 
                                                     font=('Consolas', 10), 
@@ -197,13 +134,6 @@ class StudentApp:
         self.output_area.pack(fill='both', expand=True)
         self.output_area.config(state=tk.DISABLED)
 
-    def display_output(self, text):
-        """Helper to safely insert text into the output area."""
-        self.output_area.config(state=tk.NORMAL)
-        self.output_area.delete('1.0', tk.END)
-        self.output_area.insert(tk.END, text)
-        self.output_area.config(state=tk.DISABLED)
-
     def display_welcome(self):
         """Displays a welcome message on startup."""
         if not self.students:
@@ -219,88 +149,10 @@ class StudentApp:
             "Use the buttons above to perform an action."
         )
 
-    # --- Functionality Methods (Unchanged) ---
-    def view_all_records(self):
-        if not self.students:
-            self.display_output("No student data available to view.")
-            return
-
-        all_details = "--- ALL STUDENT RECORDS ---\n"
-        total_percentage_sum = 0
-        
-        for student in self.students:
-            all_details += student.format_details()
-            total_percentage_sum += student.percentage
-
-        average_percentage = total_percentage_sum / self.num_students if self.num_students > 0 else 0
-
-        summary = (
-            "\n--- CLASS SUMMARY ---\n"
-            f"Number of Students in Class: {self.num_students}\n"
-            f"Average Percentage Mark Obtained: {average_percentage:.2f}%\n"
-            "---------------------"
-        )
-        
-        self.display_output(all_details + summary)
-
-    def view_individual_record(self):
-        if not self.students:
-            self.display_output("No student data available.")
-            return
-
-        search_term = simpledialog.askstring("Search Student", "Enter Student Code or Name:", 
-                                            parent=self.master)
-        
-        if not search_term:
-            return
-
-        search_term = search_term.strip().lower()
-        found_student = None
-
-        for student in self.students:
-            if student.code == search_term or student.name.lower() == search_term:
-                found_student = student
-                break
-        
-        if found_student:
-            output = f"--- INDIVIDUAL STUDENT RECORD ---\n{found_student.format_details()}"
-        else:
-            output = f"Error: Student with code or name '{search_term}' not found."
-            
-        self.display_output(output)
-
-    def show_highest_score(self):
-        if not self.students:
-            self.display_output("No student data available to analyse.")
-            return
-
-        highest_student = max(self.students, key=lambda s: s.overall_total)
-
-        output = (
-            "--- STUDENT WITH HIGHEST TOTAL SCORE ---\n"
-            f"Highest Score: {highest_student.overall_total} / 160\n"
-            f"{'-' * 40}\n"
-            f"{highest_student.format_details()}"
-        )
-        self.display_output(output)
-
-    def show_lowest_score(self):
-        if not self.students:
-            self.display_output("No student data available to analyse.")
-            return
-
-        lowest_student = min(self.students, key=lambda s: s.overall_total)
-
-        output = (
-            "--- STUDENT WITH LOWEST TOTAL SCORE ---\n"
-            f"Lowest Score: {lowest_student.overall_total} / 160\n"
-            f"{'-' * 40}\n"
-            f"{lowest_student.format_details()}"
-        )
-        self.display_output(output)
-
 # --- Main Execution ---
 if __name__ == "__main__":
     root = tk.Tk()
     app = StudentApp(root)
+    # Hidden performance report (Ctrl+Shift+D)
+    perf.install_debug_panel(root)
     root.mainloop()
\ No newline at end of file
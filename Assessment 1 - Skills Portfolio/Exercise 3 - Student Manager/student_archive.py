@@ -0,0 +1,383 @@
+# Student Manager - Compressed Marks Archive
+# Packs studentMarks.txt-format files into a compact archive that still allows
+# random access. Records are sorted by student code (file order within a code)
+# and split into blocks of about BLOCK_BYTES of marks file lines, each
+# compressed on its own with zlib or lzma. An index of each block's code range
+# and a footer of class summary figures sit at the end of the file.
+#
+# Usage (from this folder):
+#   python -m student_archive pack resources/studentMarks.txt resources/studentMarks.mka --codec lzma
+#   python -m student_archive summary resources/studentMarks.mka
+#   python -m student_archive get resources/studentMarks.mka 8439
+#   python -m student_archive unpack resources/studentMarks.mka restored.txt
+#   STUDENT_MARKS_DB=resources/studentMarks.mka python "student manager.py"
+#
+# ArchiveStudentStore offers the same read methods as student_core.StudentStore.
+# A lookup by code decompresses the one block whose range holds the code, and
+# the class summary comes from the footer without decompressing anything.
+# Lookups by name, fuzzy and prefix searches decompress every block once, on
+# first use, to index the names.
+#
+# File layout: an 8-byte header (magic, version, codec), the compressed blocks,
+# the index and summary as UTF-8 JSON, then a 12-byte trailer holding the JSON's
+# offset and the magic again, so a reader finds the index from the end.
+import argparse
+import json
+import lzma
+import os
+import struct
+import sys
+import zlib
+from bisect import bisect_left
+from collections import OrderedDict
+from operator import itemgetter
+
+from student_core import LoadStats, Summary, TOTAL_MAX, format_line, format_summary, iter_students, parse_line
+
+ARCHIVE_SUFFIX = ".mka"
+
+HEADER = struct.Struct("<4sBB2x")
+TRAILER = struct.Struct("<Q4s")
+MAGIC = b"MKAR"
+VERSION = 1
+
+# Codec name -> (id stored in the header, compress, decompress)
+CODECS = {
+    'zlib': (1, lambda data: zlib.compress(data, 9), zlib.decompress),
+    'lzma': (2, lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+CODEC_NAMES = {codec_id: name for name, (codec_id, _, _) in CODECS.items()}
+DEFAULT_CODEC = 'zlib'
+
+# Uncompressed marks file text per block: bigger blocks compress better, smaller
+# ones make a lookup decompress less
+BLOCK_BYTES = 64 * 1024
+# Decompressed blocks kept for repeat lookups
+BLOCK_CACHE_SIZE = 16
+
+
+# --- Packing ---
+def pack(text_path, archive_path, codec=DEFAULT_CODEC, block_bytes=BLOCK_BYTES, stats=None):
+    """Writes the valid records of a marks file to a new archive and returns the LoadStats.
+
+    The records are sorted by code before they are blocked, so they are held in
+    memory (as lines, not Students) while packing. The archive is written to a
+    temporary file first, so a failed pack never leaves a partial archive.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec '{codec}'; choose from {', '.join(CODECS)}.")
+    if stats is None:
+        stats = LoadStats()
+    codec_id, compress, _ = CODECS[codec]
+    summary = Summary()
+    records = []
+    for student in iter_students(text_path, stats):
+        summary.add(student)
+        records.append((student.code, format_line(student)))
+    # A stable sort, so students sharing a code stay in file order
+    records.sort(key=itemgetter(0))
+
+    temp_path = archive_path + ".part"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, codec_id))
+            blocks = []
+            start = 0
+            while start < len(records):
+                stop, size = start, 0
+                while stop < len(records) and size < block_bytes:
+                    size += len(records[stop][1])
+                    stop += 1
+                data = compress("".join([line for _, line in records[start:stop]]).encode('utf-8'))
+                # [offset, compressed size, rows, first code, last code]
+                blocks.append([f.tell(), len(data), stop - start, records[start][0], records[stop - 1][0]])
+                f.write(data)
+                start = stop
+            footer_offset = f.tell()
+            f.write(json.dumps({'codec': codec, 'blocks': blocks, 'summary': {
+                'count': summary.count,
+                'percentage_sum': summary.percentage_sum,
+                'highest': format_line(summary.highest) if summary.highest else None,
+                'lowest': format_line(summary.lowest) if summary.lowest else None,
+                'header_count': stats.header_count,
+                'skipped': stats.skipped,
+            }}, separators=(',', ':')).encode('utf-8'))
+            f.write(TRAILER.pack(footer_offset, MAGIC))
+        os.replace(temp_path, archive_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return stats
+
+
+# --- Reading ---
+class ArchiveSummary:
+    """Class summary read from an archive's footer; mirrors student_core.Summary."""
+    def __init__(self, footer):
+        self.count = footer['count']
+        self.percentage_sum = footer['percentage_sum']
+        self.highest = parse_line(footer['highest']) if footer['highest'] else None
+        self.lowest = parse_line(footer['lowest']) if footer['lowest'] else None
+        # Header count and malformed lines of the packed file, for reporting
+        self.header_count = footer['header_count']
+        self.skipped = footer['skipped']
+
+    @property
+    def average_percentage(self):
+        return self.percentage_sum / self.count if self.count > 0 else 0
+
+    @property
+    def max_total(self):
+        return self.highest.overall_total if self.highest else None
+
+    @property
+    def min_total(self):
+        return self.lowest.overall_total if self.lowest else None
+
+
+class ArchiveStudentStore:
+    """Read-only student store backed by a block-compressed marks archive.
+
+    Students come back in archive order (by code, file order within a code),
+    and find() prefers a code match to a name match.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._read_footer()
+        except BaseException:
+            self._file.close()
+            raise
+        # Block number -> (codes, lines) of recently decompressed blocks
+        self._cache = OrderedDict()
+        self.blocks_read = 0
+        # {lower-case name: (block, line)} of each name's first student, built on first use
+        self._by_name = None
+        self._codes = None
+        # Trigram and prefix indexes for fuzzy_find and prefix_find, built on first use
+        self._name_index = None
+        self._prefix_index = None
+
+    def _read_footer(self):
+        f = self._file
+        header = f.read(HEADER.size)
+        end = f.seek(0, os.SEEK_END)
+        if len(header) < HEADER.size or end < HEADER.size + TRAILER.size:
+            raise ValueError(f"'{self.path}' is not a marks archive.")
+        magic, version, codec_id = HEADER.unpack(header)
+        f.seek(end - TRAILER.size)
+        footer_offset, trailer_magic = TRAILER.unpack(f.read(TRAILER.size))
+        if magic != MAGIC or trailer_magic != MAGIC or not HEADER.size <= footer_offset <= end - TRAILER.size:
+            raise ValueError(f"'{self.path}' is not a marks archive.")
+        if version != VERSION or codec_id not in CODEC_NAMES:
+            raise ValueError(f"'{self.path}' was written by a newer version of student_archive.")
+        f.seek(footer_offset)
+        footer = json.loads(f.read(end - TRAILER.size - footer_offset))
+        self.codec = footer['codec']
+        self._decompress = CODECS[self.codec][2]
+        self._blocks = footer['blocks']
+        self._first_codes = [block[3] for block in self._blocks]
+        self._last_codes = [block[4] for block in self._blocks]
+        self._summary = ArchiveSummary(footer['summary'])
+
+    def close(self):
+        self._file.close()
+
+    def for_thread(self):
+        """Opens a second store on the same archive for use by another thread."""
+        return ArchiveStudentStore(self.path)
+
+    def _lines(self, number):
+        """Decompresses one block and returns its marks file lines."""
+        offset, size = self._blocks[number][:2]
+        self._file.seek(offset)
+        self.blocks_read += 1
+        return self._decompress(self._file.read(size)).decode('utf-8').splitlines()
+
+    def _block(self, number):
+        """Returns (codes, lines) for a block, from the cache when it was read recently."""
+        cached = self._cache.get(number)
+        if cached is not None:
+            self._cache.move_to_end(number)
+            return cached
+        lines = self._lines(number)
+        cached = ([line[:line.index(',')] for line in lines], lines)
+        self._cache[number] = cached
+        if len(self._cache) > BLOCK_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return cached
+
+    def _iter_lines(self):
+        # A full pass skips the cache, so it does not evict the blocks lookups are using
+        for number in range(len(self._blocks)):
+            yield from self._lines(number)
+
+    def _code_position(self, code):
+        """Returns (block, line) of the first student with this code, or None."""
+        # The first block whose range ends at or after the code is the only one that can start it
+        number = bisect_left(self._last_codes, code)
+        if number == len(self._blocks) or self._first_codes[number] > code:
+            return None
+        codes, _ = self._block(number)
+        line = bisect_left(codes, code)
+        return (number, line) if line < len(codes) and codes[line] == code else None
+
+    def _ensure_key_index(self):
+        if self._by_name is not None:
+            return
+        by_name = {}
+        codes = set()
+        for number in range(len(self._blocks)):
+            for line_number, line in enumerate(self._lines(number)):
+                code, name, _ = line.split(',', 2)
+                codes.add(code)
+                by_name.setdefault(name.lower(), (number, line_number))
+        self._codes = codes
+        self._by_name = by_name
+
+    def _student_at(self, position):
+        number, line = position
+        return parse_line(self._block(number)[1][line])
+
+    def __len__(self):
+        return self._summary.count
+
+    def __iter__(self):
+        return map(parse_line, self._iter_lines())
+
+    def iter_marks(self):
+        """Yields (c1, c2, c3, exam) tuples straight from the lines, without building Students."""
+        for line in self._iter_lines():
+            _, _, c1, c2, c3, exam = line.split(',')
+            yield int(c1), int(c2), int(c3), int(exam)
+
+    @property
+    def summary(self):
+        return self._summary
+
+    def average_percentage(self):
+        return self._summary.average_percentage
+
+    def get(self, code):
+        """Returns the student with this exact code, or None, decompressing at most one block."""
+        position = self._code_position(str(code).strip())
+        return None if position is None else self._student_at(position)
+
+    def find(self, search_term):
+        """Returns the first student whose code, or else (case-insensitive) name, matches, or None."""
+        search_term = search_term.strip().lower()
+        position = self._code_position(search_term)
+        if position is None:
+            self._ensure_key_index()
+            position = self._by_name.get(search_term)
+        return None if position is None else self._student_at(position)
+
+    def fuzzy_find(self, search_term, limit=10):
+        """Returns up to limit (distance, student) pairs for names within a few typos, closest first."""
+        from student_fuzzy import NameIndex, fuzzy_find
+        if self._name_index is None:
+            self._ensure_key_index()
+            self._name_index = NameIndex(self._by_name)
+        return fuzzy_find(self, self._name_index, search_term, limit)
+
+    def prefix_find(self, search_term, limit=50):
+        """Returns an iterator over up to limit students whose code or name starts with the search term."""
+        from student_search import PrefixIndex, prefix_find
+        # Built here rather than in the iterator, so a call with limit 0 prepares the index
+        if self._prefix_index is None:
+            self._ensure_key_index()
+            self._prefix_index = PrefixIndex(self._codes, self._by_name)
+        return prefix_find(self, self._prefix_index, search_term, limit)
+
+    def highest(self):
+        """Returns the student with the highest overall total (first in file order on ties)."""
+        return self._summary.highest
+
+    def lowest(self):
+        """Returns the student with the lowest overall total (first in file order on ties)."""
+        return self._summary.lowest
+
+    def between(self, low_percentage, high_percentage):
+        """Returns students whose overall percentage is within the inclusive range, highest first."""
+        low_total = low_percentage * TOTAL_MAX / 100
+        high_total = high_percentage * TOTAL_MAX / 100
+        found = [s for s in self if low_total <= s.overall_total <= high_total]
+        found.sort(key=lambda s: s.overall_total, reverse=True)
+        return found
+
+
+def unpack(archive_path, text_path):
+    """Writes an archive's records back out as a marks file (in archive order); returns the count."""
+    store = ArchiveStudentStore(archive_path)
+    temp_path = text_path + ".part"
+    try:
+        with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(f"{len(store)}\n")
+            for line in store._iter_lines():
+                f.write(line + "\n")
+        os.replace(temp_path, text_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        store.close()
+    return len(store)
+
+
+# --- Command Line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="student_archive",
+                                     description="Pack marks files into compressed, block-indexed archives.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack_parser = commands.add_parser("pack", help="pack a marks file into an archive")
+    pack_parser.add_argument("text_path")
+    pack_parser.add_argument("archive_path")
+    pack_parser.add_argument("--codec", choices=sorted(CODECS), default=DEFAULT_CODEC)
+    pack_parser.add_argument("--block-kb", type=int, default=BLOCK_BYTES // 1024,
+                             help="uncompressed text per block in KB (default: %(default)s)")
+    summary_parser = commands.add_parser("summary", help="show the class summary from the footer")
+    summary_parser.add_argument("archive_path")
+    get_parser = commands.add_parser("get", help="show the student with a code")
+    get_parser.add_argument("archive_path")
+    get_parser.add_argument("code")
+    unpack_parser = commands.add_parser("unpack", help="write an archive back out as a marks file")
+    unpack_parser.add_argument("archive_path")
+    unpack_parser.add_argument("text_path")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "pack":
+            stats = pack(args.text_path, args.archive_path, args.codec, args.block_kb * 1024)
+            share = os.path.getsize(args.archive_path) / max(1, os.path.getsize(args.text_path))
+            print(f"Packed {stats.loaded} students into '{args.archive_path}' ({share:.1%} of the text size, "
+                  f"{stats.skipped} malformed lines skipped).")
+        elif args.command == "unpack":
+            count = unpack(args.archive_path, args.text_path)
+            print(f"Wrote {count} students to '{args.text_path}'.")
+        else:
+            store = ArchiveStudentStore(args.archive_path)
+            try:
+                if args.command == "summary":
+                    summary = store.summary
+                    print(f"{len(store._blocks)} {store.codec} blocks"
+                          + (f"; total scores {summary.min_total} to {summary.max_total}" if summary.count else "")
+                          + format_summary(summary))
+                else:
+                    student = store.get(args.code)
+                    if student is None:
+                        print(f"No student with code '{args.code}'.", file=sys.stderr)
+                        return 1
+                    print(student.format_details())
+            finally:
+                store.close()
+    except (OSError, ValueError) as e:
+        print(f"student_archive: {args.command} failed: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
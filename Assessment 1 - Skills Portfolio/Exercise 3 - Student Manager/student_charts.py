@@ -0,0 +1,186 @@
+# Student Manager - Charts Panel
+# Grade distribution, coursework and exam histograms and a component-vs-exam
+# density plot, drawn on a Tk canvas.
+#
+# The cohort is binned once (CohortBins) and every chart is drawn from those
+# bins: one canvas item per bar or per non-empty density cell, never one per
+# student. Redraws and resizes therefore cost the same for 10 students or 10M.
+import math
+import tkinter as tk
+
+from student_core import GRADES, TOTAL_MAX, COURSEWORK_MAX, EXAM_MAX, grade_for_percentage
+
+# Histogram bin widths in marks
+COURSEWORK_BIN = 5
+EXAM_BIN = 10
+# Density grid: one column per coursework mark (0-20), exam marks in rows of this height
+COMPONENT_MAX = 20
+DENSITY_EXAM_BIN = 4
+
+COMPONENTS = ("c1", "c2", "c3")
+
+# Grade for every possible overall total, so binning needs no percentage maths per student
+GRADE_BY_TOTAL = [grade_for_percentage((total / TOTAL_MAX) * 100) for total in range(TOTAL_MAX + 1)]
+
+GRADE_COLOURS = {'A': '#4CAF50', 'B': '#2196F3', 'C': '#FFC107', 'D': '#FF9800', 'F': '#F44336'}
+# Colours by position for grading schemes with other grade names
+BAND_COLOURS = ['#4CAF50', '#2196F3', '#FFC107', '#FF9800', '#F44336', '#9C27B0', '#607D8B']
+BAR_COLOUR = '#1E90FF'
+# Density shades from lightest (few students) to darkest (most students)
+DENSITY_SHADES = ['#%02x%02x%02x' % (int(230 - 200 * i / 15), int(240 - 170 * i / 15), 255 - int(80 * i / 15))
+                  for i in range(16)]
+
+
+def _clamp(value, low, high):
+    return low if value < low else high if value > high else value
+
+
+# --- Binning ---
+class CohortBins:
+    """Counts for every chart, filled in a single pass over (c1, c2, c3, exam) tuples.
+
+    Grades follow the given GradingScheme, or the standard grading if it is None.
+    """
+    def __init__(self, scheme=None):
+        self.count = 0
+        self.scheme = scheme
+        self.grades = dict.fromkeys(GRADES if scheme is None else scheme.grades, 0)
+        self.coursework = [0] * (COURSEWORK_MAX // COURSEWORK_BIN)
+        self.exam = [0] * (EXAM_MAX // EXAM_BIN)
+        self.density_rows = EXAM_MAX // DENSITY_EXAM_BIN + 1
+        # density[component][mark * density_rows + exam_row]
+        self.density = [[0] * ((COMPONENT_MAX + 1) * self.density_rows) for _ in COMPONENTS]
+
+    @classmethod
+    def from_store(cls, store):
+        bins = cls(getattr(store, 'scheme', None))
+        bins.add_all(store.iter_marks())
+        return bins
+
+    def add_all(self, marks):
+        """Adds every (c1, c2, c3, exam) tuple from an iterable."""
+        grades = self.grades
+        coursework = self.coursework
+        exam_hist = self.exam
+        density = self.density
+        rows = self.density_rows
+        last_cw = len(coursework) - 1
+        last_exam = len(exam_hist) - 1
+        scheme_result = self.scheme.result if self.scheme is not None else None
+        count = 0
+        for c1, c2, c3, exam in marks:
+            count += 1
+            coursework_total = c1 + c2 + c3
+            total = coursework_total + exam
+            if scheme_result is not None:
+                grades[scheme_result(c1, c2, c3, exam)[1]] += 1
+            elif 0 <= total <= TOTAL_MAX:
+                grades[GRADE_BY_TOTAL[total]] += 1
+            else:
+                grades[grade_for_percentage((total / TOTAL_MAX) * 100)] += 1
+            # The top mark (e.g. 60/60) shares the last bin
+            coursework[_clamp(coursework_total // COURSEWORK_BIN, 0, last_cw)] += 1
+            exam_hist[_clamp(exam // EXAM_BIN, 0, last_exam)] += 1
+            row = _clamp(exam // DENSITY_EXAM_BIN, 0, rows - 1)
+            density[0][_clamp(c1, 0, COMPONENT_MAX) * rows + row] += 1
+            density[1][_clamp(c2, 0, COMPONENT_MAX) * rows + row] += 1
+            density[2][_clamp(c3, 0, COMPONENT_MAX) * rows + row] += 1
+        self.count += count
+
+
+# --- Charts Window ---
+class ChartsWindow:
+    """Toplevel window showing the four charts for a CohortBins."""
+    def __init__(self, master, bins):
+        self.bins = bins
+        self.window = tk.Toplevel(master)
+        self.window.title("Student Marks Charts")
+        self.window.geometry("760x560")
+
+        controls = tk.Frame(self.window, bg='#f0f0f0')
+        controls.pack(fill='x')
+        tk.Label(controls, text=f"{bins.count} students   Density plot:",
+                 bg='#f0f0f0', font=('Arial', 10, 'bold')).pack(side=tk.LEFT, padx=10, pady=5)
+        self.component = tk.StringVar(value=COMPONENTS[0])
+        for index, name in enumerate(COMPONENTS, start=1):
+            tk.Radiobutton(controls, text=f"Coursework {index} vs Exam", value=name,
+                           variable=self.component, command=self.redraw,
+                           bg='#f0f0f0').pack(side=tk.LEFT)
+
+        self.canvas = tk.Canvas(self.window, bg='white', highlightthickness=0)
+        self.canvas.pack(fill='both', expand=True)
+        self._redraw_pending = False
+        self.canvas.bind("<Configure>", self.schedule_redraw)
+
+    def schedule_redraw(self, event=None):
+        """Coalesces a burst of resize events into one redraw when Tk is idle."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.canvas.after_idle(self.redraw)
+
+    def redraw(self):
+        self._redraw_pending = False
+        self.canvas.delete('all')
+        width = max(self.canvas.winfo_width(), 200)
+        height = max(self.canvas.winfo_height(), 200)
+        half_w, half_h = width / 2, height / 2
+        bins = self.bins
+
+        title = "Grade Distribution" if bins.scheme is None else f"Grade Distribution ({bins.scheme.name})"
+        self.draw_bars((0, 0, half_w, half_h), title,
+                       [(grade, count, GRADE_COLOURS.get(grade, BAND_COLOURS[i % len(BAND_COLOURS)]))
+                        for i, (grade, count) in enumerate(bins.grades.items())])
+        self.draw_bars((half_w, 0, width, half_h), "Coursework Total (out of 60)",
+                       [(str(i * COURSEWORK_BIN), n, BAR_COLOUR) for i, n in enumerate(bins.coursework)])
+        self.draw_bars((0, half_h, half_w, height), "Exam Mark (out of 100)",
+                       [(str(i * EXAM_BIN), n, BAR_COLOUR) for i, n in enumerate(bins.exam)])
+        component = COMPONENTS.index(self.component.get())
+        self.draw_density((half_w, half_h, width, height), component)
+
+    def draw_bars(self, box, title, bars):
+        """Draws a bar chart of (label, count, colour) in the box (x0, y0, x1, y1)."""
+        x0, y0, x1, y1 = box
+        self.canvas.create_text((x0 + x1) / 2, y0 + 12, text=title, font=('Arial', 10, 'bold'))
+        left, right, top, bottom = x0 + 30, x1 - 10, y0 + 30, y1 - 25
+        self.canvas.create_line(left, bottom, right, bottom)
+        highest = max((count for _, count, _ in bars), default=0) or 1
+        self.canvas.create_text(left - 4, top, text=str(highest), anchor='e', font=('Arial', 8))
+        slot = (right - left) / len(bars)
+        # Skip some axis labels when bars are too narrow to fit them all
+        label_step = max(1, math.ceil(24 / slot))
+        for index, (label, count, colour) in enumerate(bars):
+            bar_left = left + index * slot + 2
+            bar_top = bottom - (bottom - top) * count / highest
+            if count:
+                self.canvas.create_rectangle(bar_left, bar_top, bar_left + slot - 4, bottom,
+                                             fill=colour, outline='')
+            if index % label_step == 0:
+                self.canvas.create_text(bar_left + (slot - 4) / 2, bottom + 10, text=label, font=('Arial', 8))
+
+    def draw_density(self, box, component):
+        """Draws the component-vs-exam density grid, shading each non-empty cell by its count."""
+        x0, y0, x1, y1 = box
+        name = COMPONENTS[component]
+        self.canvas.create_text((x0 + x1) / 2, y0 + 12, text=f"Coursework {component + 1} vs Exam",
+                                font=('Arial', 10, 'bold'))
+        left, right, top, bottom = x0 + 30, x1 - 10, y0 + 30, y1 - 25
+        self.canvas.create_rectangle(left, top, right, bottom, outline='#999999')
+        self.canvas.create_text((left + right) / 2, bottom + 10, text=f"{name} (0-{COMPONENT_MAX})", font=('Arial', 8))
+        self.canvas.create_text(left - 4, top, text=str(EXAM_MAX), anchor='e', font=('Arial', 8))
+        self.canvas.create_text(left - 4, bottom, text="0", anchor='e', font=('Arial', 8))
+
+        cells = self.bins.density[component]
+        rows = self.bins.density_rows
+        highest = max(cells) or 1
+        # Log scale so sparse cells stay visible next to dense ones
+        scale = (len(DENSITY_SHADES) - 1) / math.log1p(highest)
+        cell_w = (right - left) / (COMPONENT_MAX + 1)
+        cell_h = (bottom - top) / rows
+        for index, count in enumerate(cells):
+            if not count:
+                continue
+            mark, row = divmod(index, rows)
+            cx = left + mark * cell_w
+            cy = bottom - (row + 1) * cell_h
+            shade = DENSITY_SHADES[int(math.log1p(count) * scale)]
+            self.canvas.create_rectangle(cx, cy, cx + cell_w, cy + cell_h, fill=shade, outline='')
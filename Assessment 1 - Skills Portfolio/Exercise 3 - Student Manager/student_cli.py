@@ -0,0 +1,329 @@
+# Student Manager - Headless Command Line Reports
+# Runs the Student Manager queries without Tk over one or many marks files.
+#
+# Usage (from this folder):
+#   python -m student_cli all resources/studentMarks.txt
+#   python -m student_cli individual --search "Jo Hyde" cohort*.txt
+#   python -m student_cli highest --top 5 --format jsonl -o top.jsonl a.txt b.txt
+#   python -m student_cli all --grade A --grade B --format csv cohort.txt
+#   python -m student_cli all --scheme honours --grade First cohort.txt
+#
+# Records are streamed line by line, so memory stays bounded by --top
+# (or constant without it) no matter how many rows a file holds. Grades
+# follow the grading schemes file's default scheme, as in the GUI.
+import argparse
+import csv
+import heapq
+import json
+import os
+import sys
+
+from student_core import Summary, format_summary, iter_students, matches, LoadStats
+
+REPORTS = ("all", "individual", "highest", "lowest")
+FORMATS = ("text", "csv", "jsonl")
+
+CSV_FIELDS = ['source', 'code', 'name', 'c1', 'c2', 'c3', 'exam',
+              'coursework_total', 'overall_total', 'percentage', 'grade']
+
+
+# --- Output Writers ---
+class OutputError(Exception):
+    """A write to the report output failed; the OSError is the cause."""
+
+
+class ReportOutput:
+    """Wraps the output file so write failures raise OutputError, not OSError.
+
+    Records are read and written in turn, so this keeps a full disk or a closed
+    pipe from being reported as an error reading the marks file.
+    """
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, text):
+        try:
+            return self.out.write(text)
+        except OSError as e:
+            raise OutputError(e) from e
+
+    def flush(self):
+        try:
+            self.out.flush()
+        except OSError as e:
+            raise OutputError(e) from e
+
+
+class TextWriter:
+    """Writes reports in the same layout as the Student Manager output area."""
+    def __init__(self, out):
+        self.out = out
+
+    def begin(self, source, title):
+        self.out.write(f"=== {source} ===\n--- {title} ---\n")
+
+    def student(self, source, student):
+        self.out.write(student.format_details())
+        self.out.write("\n")
+
+    def summary(self, source, summary):
+        self.out.write(format_summary(summary).lstrip("\n"))
+        self.out.write("\n")
+
+    def message(self, source, text):
+        self.out.write(text + "\n")
+
+    def end(self, source):
+        self.out.write("\n")
+
+
+class CsvWriter:
+    """Writes one CSV row per student; summaries and messages are omitted."""
+    def __init__(self, out):
+        self.writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+        self.writer.writeheader()
+
+    def begin(self, source, title):
+        pass
+
+    def student(self, source, student):
+        row = student.to_dict()
+        row['source'] = source
+        self.writer.writerow(row)
+
+    def summary(self, source, summary):
+        pass
+
+    def message(self, source, text):
+        pass
+
+    def end(self, source):
+        pass
+
+
+class JsonLinesWriter:
+    """Writes one JSON object per line, tagging each with a 'type' field."""
+    def __init__(self, out):
+        self.out = out
+
+    def _emit(self, obj):
+        self.out.write(json.dumps(obj, ensure_ascii=False))
+        self.out.write("\n")
+
+    def begin(self, source, title):
+        pass
+
+    def student(self, source, student):
+        record = student.to_dict()
+        record['type'] = 'student'
+        record['source'] = source
+        self._emit(record)
+
+    def summary(self, source, summary):
+        self._emit({
+            'type': 'summary',
+            'source': source,
+            'count': summary.count,
+            'average_percentage': round(summary.average_percentage, 2),
+        })
+
+    def message(self, source, text):
+        self._emit({'type': 'message', 'source': source, 'text': text})
+
+    def end(self, source):
+        pass
+
+
+WRITERS = {'text': TextWriter, 'csv': CsvWriter, 'jsonl': JsonLinesWriter}
+
+
+# --- Report Runners ---
+def filtered_students(students, args):
+    """Streams the students that pass the --grade and --code filters."""
+    grades = {g.upper() for g in args.grade} if args.grade else None
+    codes = {code.strip() for code in args.code} if args.code else None
+    for student in students:
+        if grades is not None and student.grade.upper() not in grades:
+            continue
+        if codes is not None and student.code not in codes:
+            continue
+        yield student
+
+
+def regraded(students, scheme):
+    """Streams students re-graded with a GradingScheme."""
+    for student in students:
+        scheme.apply(student)
+        yield student
+
+
+def summarised(students, summary):
+    """Streams students, folding each into a Summary on the way."""
+    for student in students:
+        summary.add(student)
+        yield student
+
+
+def run_all(path, students, args, writer):
+    writer.begin(path, "ALL STUDENT RECORDS")
+    # The summary covers every filtered student, even when --top lists only some
+    summary = Summary()
+    students = summarised(filtered_students(students, args), summary)
+    if args.top:
+        # nlargest keeps only --top students in memory at once
+        students = heapq.nlargest(args.top, students, key=lambda s: s.overall_total)
+    for student in students:
+        writer.student(path, student)
+    if summary.count == 0:
+        writer.message(path, "No student data available to view.")
+    else:
+        writer.summary(path, summary)
+
+
+def run_individual(path, students, args, writer):
+    writer.begin(path, "INDIVIDUAL STUDENT RECORD")
+    found = 0
+    for student in filtered_students(students, args):
+        if matches(student, args.search):
+            writer.student(path, student)
+            found += 1
+            if found >= (args.top or 1):
+                break
+    if not found:
+        writer.message(path, f"Error: Student with code or name '{args.search.strip().lower()}' not found.")
+
+
+def run_extreme(path, students, args, writer, highest):
+    label = "HIGHEST" if highest else "LOWEST"
+    writer.begin(path, f"STUDENT WITH {label} TOTAL SCORE")
+    select = heapq.nlargest if highest else heapq.nsmallest
+    chosen = select(args.top or 1, filtered_students(students, args),
+                    key=lambda s: s.overall_total)
+    if not chosen:
+        writer.message(path, "No student data available to analyse.")
+        return
+    for student in chosen:
+        writer.message(path, f"{label.title()} Score: {student.overall_total} / 160\n{'-' * 40}")
+        writer.student(path, student)
+
+
+def run_report(path, args, writer):
+    """Runs the selected report for one file and returns its LoadStats."""
+    stats = LoadStats()
+    students = iter_students(path, stats)
+    if args.scheme is not None:
+        students = regraded(students, args.scheme)
+    if args.report == "all":
+        run_all(path, students, args, writer)
+    elif args.report == "individual":
+        run_individual(path, students, args, writer)
+    else:
+        run_extreme(path, students, args, writer, highest=(args.report == "highest"))
+    writer.end(path)
+    return stats
+
+
+# --- Entry Point ---
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="student_cli",
+        description="Run Student Manager reports headless over one or more marks files.")
+    parser.add_argument("report", choices=REPORTS, help="report to generate")
+    parser.add_argument("files", nargs="+", help="studentMarks.txt-format files")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="text",
+                        help="output format (default: text)")
+    parser.add_argument("-o", "--output", help="write to this file instead of stdout")
+    parser.add_argument("-s", "--search", help="student code or name (required by the 'individual' report)")
+    parser.add_argument("--top", type=int, default=0, metavar="N",
+                        help="limit to the N highest (or lowest) scoring students")
+    parser.add_argument("--grade", action="append", metavar="G",
+                        help="only include students with this grade (repeatable)")
+    parser.add_argument("--code", action="append", metavar="CODE",
+                        help="only include the student with this code (repeatable)")
+    parser.add_argument("--scheme", metavar="NAME",
+                        help="grade with this scheme from the grading schemes file (default: the file's default)")
+    parser.add_argument("--schemes", metavar="PATH",
+                        help="grading schemes JSON file (default: resources/grading_schemes.json)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.top < 0:
+        print("student_cli: --top must not be negative", file=sys.stderr)
+        return 2
+    if args.report == "individual" and not (args.search or "").strip():
+        print("student_cli: the 'individual' report needs --search CODE_OR_NAME", file=sys.stderr)
+        return 2
+    # Grade as the GUI does: with the config's default scheme unless --scheme names another
+    from student_grading import SCHEMES_PATH, STANDARD, load_schemes
+    try:
+        schemes, default = load_schemes(args.schemes or SCHEMES_PATH)
+    except (OSError, ValueError) as e:
+        print(f"student_cli: {e}", file=sys.stderr)
+        return 2
+    name = default if args.scheme is None else args.scheme
+    if name not in schemes:
+        print(f"student_cli: unknown grading scheme '{name}' "
+              f"(available: {', '.join(schemes)})", file=sys.stderr)
+        return 2
+    # The standard scheme is how Students grade themselves already
+    args.scheme = None if name == STANDARD.name else schemes[name]
+
+    destination = f"'{args.output}'" if args.output else "standard output"
+    try:
+        out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    except OSError as e:
+        print(f"student_cli: cannot write {destination}: {e}", file=sys.stderr)
+        return 1
+    try:
+        exit_code = run_reports(args, ReportOutput(out))
+        if out is not sys.stdout:
+            out.close()
+        else:
+            # Buffered output can still fail here, e.g. on a full disk
+            ReportOutput(out).flush()
+    except (OutputError, OSError) as e:
+        error = e.__cause__ if isinstance(e, OutputError) else e
+        if isinstance(error, BrokenPipeError):
+            # The reader went away (e.g. '| head'); stop quietly. Point stdout at devnull
+            # so the interpreter's final flush does not fail again.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+        print(f"student_cli: cannot write {destination}: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout and not out.closed:
+            try:
+                out.close()
+            except OSError:
+                pass
+    return exit_code
+
+
+def run_reports(args, out):
+    """Runs the report over every file; returns 1 if any file could not be read, else 0.
+
+    Read errors skip to the next file. Write errors raise OutputError and stop the run.
+    """
+    exit_code = 0
+    writer = WRITERS[args.format](out)
+    for path in args.files:
+        try:
+            stats = run_report(path, args, writer)
+        except OSError as e:
+            print(f"student_cli: cannot read '{path}': {e}", file=sys.stderr)
+            exit_code = 1
+            continue
+        # Mirror the GUI's header check as a warning on stderr
+        if stats.header_count is None:
+            print(f"student_cli: WARNING: could not parse the student count in '{path}'",
+                  file=sys.stderr)
+        elif args.report == "all" and stats.header_count != stats.loaded:
+            print(f"student_cli: WARNING: '{path}' header specified {stats.header_count} "
+                  f"students, but {stats.loaded} valid records were loaded.", file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,556 @@
+# Student Manager - Core Data Model
+# Shared Student class, streaming parser, indexed store and queries for the marks file format.
+# This module never imports tkinter so it can be used headless.
+import itertools
+import os
+import threading
+from collections import OrderedDict
+
+# Define the expected path to the student marks file
+FILE_PATH = os.path.join("resources", "studentMarks.txt")
+
+# Marks available for each part of the assessment
+COURSEWORK_MAX = 60
+EXAM_MAX = 100
+TOTAL_MAX = COURSEWORK_MAX + EXAM_MAX
+
+# Letter grades from best to worst
+GRADES = ('A', 'B', 'C', 'D', 'F')
+
+
+def grade_for_percentage(percentage):
+    """Returns the letter grade for an overall percentage."""
+    # 'A' for 70%+, 'B' for 60%-69%, 'C' for 50%-59%, 'D' for 40%-49%, 'F' for under 40%
+    if percentage >= 70:
+        return 'A'
+    elif 60 <= percentage < 70:
+        return 'B'
+    elif 50 <= percentage < 60:
+        return 'C'
+    elif 40 <= percentage < 50:
+        return 'D'
+    else:
+        return 'F'
+
+
+# --- Data Structure for Students ---
+class Student:
+    # Initializes a Student object with provided data and calculates totals, percentage, and grade.
+    def __init__(self, code, name, c1, c2, c3, exam):
+        # Raw Data
+        self.code = code
+        self.name = name
+        self.c1 = int(c1)
+        self.c2 = int(c2)
+        self.c3 = int(c3)
+        self.exam = int(exam)
+
+        # Calculations
+        self.coursework_total = self.c1 + self.c2 + self.c3 # Max 60
+        self.overall_total = self.coursework_total + self.exam # Max 160
+        self.percentage = (self.overall_total / TOTAL_MAX) * 100
+        self.grade = self.calculate_grade()
+        # Edits replace the Student, so a new version keeps cached text from going stale
+        self.version = next(_record_versions)
+
+    def calculate_grade(self):
+        """Calculates the student's grade based on percentage."""
+        return grade_for_percentage(self.percentage)
+
+    def set_result(self, percentage, grade):
+        """Replaces the percentage and grade (e.g. under another grading scheme)."""
+        self.percentage = percentage
+        self.grade = grade
+        # The rendered text changes, so cached copies must not match any more
+        self.version = next(_record_versions)
+
+    def format_details(self):
+        """Formats the student's results into a readable string."""
+        return record_cache.render(self, 'plain')
+
+    def render(self, template='plain'):
+        """Returns the student's text in one of the record_cache templates ('plain', 'compact', 'csv')."""
+        return record_cache.render(self, template)
+
+    def to_dict(self):
+        """Returns the student's raw marks and derived results as a plain dict."""
+        return {
+            'code': self.code,
+            'name': self.name,
+            'c1': self.c1,
+            'c2': self.c2,
+            'c3': self.c3,
+            'exam': self.exam,
+            'coursework_total': self.coursework_total,
+            'overall_total': self.overall_total,
+            'percentage': round(self.percentage, 2),
+            'grade': self.grade,
+        }
+
+
+# --- Rendered Record Cache ---
+# Version numbers handed out to Student objects as they are created
+_record_versions = itertools.count(1)
+
+# Rendered records kept per template by the shared cache (about 250 bytes each for 'plain')
+RECORD_CACHE_SIZE = 100000
+
+
+def _render_plain(s):
+    return (
+        f"Student Name: {s.name}\n"
+        f"Student Number: {s.code}\n"
+        f"Coursework Total: {s.coursework_total} / 60\n"
+        f"Exam Mark: {s.exam} / 100\n"
+        f"Overall Percentage: {s.percentage:.2f}%\n"
+        f"Student Grade: {s.grade}\n"
+        f"{'-' * 40}"
+    )
+
+
+def _render_compact(s):
+    return (f"{s.code} {s.name}: coursework {s.coursework_total}/60, exam {s.exam}/100, "
+            f"{s.percentage:.2f}% ({s.grade})")
+
+
+def _render_csv(s):
+    return (f"{s.code},{s.name},{s.c1},{s.c2},{s.c3},{s.exam},"
+            f"{s.coursework_total},{s.overall_total},{s.percentage:.2f},{s.grade}")
+
+
+TEMPLATES = {'plain': _render_plain, 'compact': _render_compact, 'csv': _render_csv}
+
+
+class RecordCache:
+    """Bounded LRU caches of rendered student text, one per template.
+
+    Entries are keyed by Student.version, which is unique to each record and
+    changes whenever it is edited (edits create a new Student), so stale text
+    is never returned and simply falls off the end of the LRU.
+
+    A view bigger than the cache would evict every entry before it is reused,
+    so after maxsize misses in a row on a full cache, new text is no longer
+    stored until the next hit. The entries already cached keep serving hits.
+    """
+    def __init__(self, maxsize=RECORD_CACHE_SIZE, templates=TEMPLATES):
+        # maxsize applies to each template separately
+        self.maxsize = maxsize
+        self.templates = {}
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._miss_streak = 0
+        for name, render in templates.items():
+            self.add_template(name, render)
+
+    def render(self, student, template='plain'):
+        """Returns the student's text in the given template, formatting it only on a cache miss."""
+        entries = self._entries[template]
+        key = student.version
+        text = entries.get(key)
+        if text is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            self._miss_streak = 0
+            return text
+        self.misses += 1
+        self._miss_streak += 1
+        text = self.templates[template](student)
+        if len(entries) < self.maxsize:
+            entries[key] = text
+        elif self.maxsize > 0 and self._miss_streak <= self.maxsize:
+            entries.popitem(last=False)
+            entries[key] = text
+        return text
+
+    def add_template(self, name, render):
+        """Registers render(student) -> str under a template name, replacing any cached text for it."""
+        self.templates[name] = render
+        self._entries[name] = OrderedDict()
+
+    def clear(self):
+        for entries in self._entries.values():
+            entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self._miss_streak = 0
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Returns the cache's size, limit and hit rate as a plain dict."""
+        return {'size': len(self), 'maxsize_per_template': self.maxsize, 'hits': self.hits,
+                'misses': self.misses, 'hit_rate': round(self.hit_rate, 4)}
+
+
+# Shared by every Student.format_details() call
+record_cache = RecordCache()
+
+
+# --- Parsing ---
+class LoadStats:
+    """Counters collected while a marks file is being parsed."""
+    def __init__(self):
+        self.empty = False
+        self.header_count = None  # None when the header line could not be parsed
+        self.loaded = 0
+        self.skipped = 0
+        # (records loaded before it, line) for each skipped line, so a save can keep it
+        self.malformed = []
+
+
+def parse_line(line):
+    """Parses one 'code,name,c1,c2,c3,exam' line, returning a Student or None if malformed."""
+    parts = line.strip().split(',')
+    if len(parts) != 6:
+        return None
+    code, name, c1, c2, c3, exam = parts
+    try:
+        return Student(code.strip(), name.strip(), c1, c2, c3, exam)
+    except ValueError:
+        # Skip lines with non-integer mark values
+        return None
+
+
+def iter_students(file_path, stats=None):
+    """Yields Student objects from a marks file one line at a time.
+
+    Only the current line is held in memory, so arbitrarily large files can be
+    processed. Pass a LoadStats to collect the header count and skip totals.
+    The file is opened immediately, so OSError is raised here rather than on
+    the first iteration.
+    """
+    if stats is None:
+        stats = LoadStats()
+    f = open(file_path, 'r', encoding='utf-8')
+    return _read_students(f, stats)
+
+
+def _read_students(f, stats):
+    with f:
+        header = f.readline()
+        if not header:
+            stats.empty = True
+            return
+        try:
+            stats.header_count = int(header.strip())
+        except ValueError:
+            stats.header_count = None
+        for line in f:
+            if not line.strip():
+                continue
+            student = parse_line(line)
+            if student is None:
+                stats.skipped += 1
+                stats.malformed.append((stats.loaded, line.rstrip("\r\n")))
+                continue
+            stats.loaded += 1
+            yield student
+
+
+# --- Queries ---
+class Summary:
+    """Single-pass class summary: count, average percentage, highest and lowest student."""
+    def __init__(self):
+        self.count = 0
+        self.percentage_sum = 0.0
+        self.highest = None
+        self.lowest = None
+
+    def add(self, student):
+        """Folds one student into the running summary."""
+        self.count += 1
+        self.percentage_sum += student.percentage
+        # Strict comparisons keep the first student on ties, matching max()/min()
+        if self.highest is None or student.overall_total > self.highest.overall_total:
+            self.highest = student
+        if self.lowest is None or student.overall_total < self.lowest.overall_total:
+            self.lowest = student
+
+    @property
+    def average_percentage(self):
+        return self.percentage_sum / self.count if self.count > 0 else 0
+
+
+def matches(student, search_term):
+    """Returns True if the search term equals the student's code or (case-insensitive) name."""
+    search_term = search_term.strip().lower()
+    return student.code == search_term or student.name.lower() == search_term
+
+
+def format_summary(summary):
+    """Formats the class summary block shown after all student records."""
+    return (
+        "\n--- CLASS SUMMARY ---\n"
+        f"Number of Students in Class: {summary.count}\n"
+        f"Average Percentage Mark Obtained: {summary.average_percentage:.2f}%\n"
+        "---------------------"
+    )
+
+
+# --- Validation ---
+# Ranges from the assignment brief
+CODE_RANGE = (1000, 9999)
+COURSEWORK_MARK_MAX = 20
+
+
+def validate_record(code, name, c1, c2, c3, exam):
+    """Checks a record against the marks file rules and returns it with marks as ints.
+
+    Raises ValueError with a user-facing message if any field is invalid.
+    """
+    code = str(code).strip()
+    name = str(name).strip()
+    if not code.isdigit() or not CODE_RANGE[0] <= int(code) <= CODE_RANGE[1]:
+        raise ValueError(f"Student code must be a number between {CODE_RANGE[0]} and {CODE_RANGE[1]}.")
+    if not name:
+        raise ValueError("Student name must not be empty.")
+    if ',' in name or '\n' in name or '\r' in name:
+        raise ValueError("Student name must not contain commas or line breaks.")
+    marks = []
+    for label, value, maximum in (("Coursework 1", c1, COURSEWORK_MARK_MAX),
+                                  ("Coursework 2", c2, COURSEWORK_MARK_MAX),
+                                  ("Coursework 3", c3, COURSEWORK_MARK_MAX),
+                                  ("Exam", exam, EXAM_MAX)):
+        try:
+            mark = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{label} mark must be a whole number.") from None
+        if not 0 <= mark <= maximum:
+            raise ValueError(f"{label} mark must be between 0 and {maximum}.")
+        marks.append(mark)
+    return (code, name, *marks)
+
+
+def format_line(student):
+    """Formats a student as one 'code,name,c1,c2,c3,exam' line of the marks file."""
+    return f"{student.code},{student.name},{student.c1},{student.c2},{student.c3},{student.exam}\n"
+
+
+def format_lines(students):
+    """Formats many students as one block of marks file lines."""
+    # An inline comprehension avoids a function call per record on large saves
+    return ''.join([f"{s.code},{s.name},{s.c1},{s.c2},{s.c3},{s.exam}\n" for s in students])
+
+
+# --- Indexed Store ---
+class StudentStore:
+    """Holds a loaded cohort with code/name indexes and a precomputed summary.
+
+    Lookups by code or name are dictionary hits instead of list scans, and the
+    highest, lowest and average results are computed once at load time.
+    Adding a student updates the indexes in place. Editing marks or regrading
+    leaves the indexes valid and only marks the summary stale; changing a
+    code or name, or deleting, marks the indexes stale too. Edits find their
+    student without rebuilding (by a list scan while the indexes are stale),
+    so a batch of edits costs at most one rebuild, on the next query.
+
+    Queries may come from the GUI thread and the search worker at once (edits
+    never overlap them; the GUI pauses the worker). A rebuild builds new
+    indexes on the side and swaps them in under a lock, so only one thread
+    rebuilds and neither ever sees a half-built index.
+    """
+    def __init__(self, students=()):
+        self.students = list(students)
+        # Trigram index of names for fuzzy_find, built on first use
+        self._name_index = None
+        # Sorted codes and names for prefix_find, built on first use
+        self._prefix_index = None
+        # GradingScheme applied by regrade(); None means the standard grading
+        self.scheme = None
+        # Held while stale indexes or a stale summary are rebuilt
+        self._lock = threading.Lock()
+        self._rebuild()
+
+    def _rebuild(self):
+        # Map each code and lower-case name to the position of its first occurrence
+        by_code = {}
+        by_name = {}
+        summary = Summary()
+        for position, student in enumerate(self.students):
+            by_code.setdefault(student.code, position)
+            by_name.setdefault(student.name.lower(), position)
+            summary.add(student)
+        self.by_code, self.by_name, self._summary = by_code, by_name, summary
+        self._stale = False
+        self._summary_stale = False
+
+    def _resummarise(self):
+        summary = Summary()
+        for student in self.students:
+            summary.add(student)
+        self._summary = summary
+        self._summary_stale = False
+
+    def _ensure_indexes(self):
+        if self._stale:
+            with self._lock:
+                # Another thread may have rebuilt while this one waited
+                if self._stale:
+                    self._rebuild()
+
+    @classmethod
+    def from_file(cls, file_path, stats=None):
+        """Loads a marks file into a new store. Raises OSError if it cannot be read."""
+        return cls(iter_students(file_path, stats))
+
+    def for_thread(self):
+        """Returns a store that is safe to read from another thread (this one, as it holds no connection)."""
+        return self
+
+    def __len__(self):
+        return len(self.students)
+
+    def __iter__(self):
+        return iter(self.students)
+
+    def iter_marks(self):
+        """Yields (c1, c2, c3, exam) tuples for every student."""
+        return ((s.c1, s.c2, s.c3, s.exam) for s in self.students)
+
+    @property
+    def summary(self):
+        self._ensure_indexes()
+        if self._summary_stale:
+            with self._lock:
+                if self._summary_stale:
+                    self._resummarise()
+        return self._summary
+
+    def find(self, search_term):
+        """Returns the first student whose code or name matches, or None."""
+        self._ensure_indexes()
+        search_term = search_term.strip().lower()
+        positions = [p for p in (self.by_code.get(search_term), self.by_name.get(search_term))
+                     if p is not None]
+        # Same result as scanning the list in order for the first match
+        return self.students[min(positions)] if positions else None
+
+    def fuzzy_find(self, search_term, limit=10):
+        """Returns up to limit (distance, student) pairs for names within a few typos, closest first."""
+        # Imported on first use so loading never pays for it
+        from student_fuzzy import NameIndex, fuzzy_find
+        if self._name_index is None:
+            self._ensure_indexes()
+            self._name_index = NameIndex(self.by_name)
+        return fuzzy_find(self, self._name_index, search_term, limit)
+
+    def prefix_find(self, search_term, limit=50):
+        """Returns an iterator over up to limit students whose code or name starts with the search term."""
+        # Imported on first use so loading never pays for it
+        from student_search import PrefixIndex, prefix_find
+        # Built here rather than in the iterator, so a call with limit 0 prepares the index
+        if self._prefix_index is None:
+            self._ensure_indexes()
+            self._prefix_index = PrefixIndex(self.by_code, self.by_name)
+        return prefix_find(self, self._prefix_index, search_term, limit)
+
+    def get(self, code):
+        """Returns the student with this exact code, or None."""
+        self._ensure_indexes()
+        position = self.by_code.get(str(code).strip())
+        return None if position is None else self.students[position]
+
+    def position(self, code):
+        """Returns the list position of the first student with this code, or None, without a rebuild."""
+        code = str(code).strip()
+        if not self._stale:
+            return self.by_code.get(code)
+        for position, student in enumerate(self.students):
+            if student.code == code:
+                return position
+        return None
+
+    def highest(self):
+        """Returns the student with the highest overall total (first on ties)."""
+        return self.summary.highest
+
+    def lowest(self):
+        """Returns the student with the lowest overall total (first on ties)."""
+        return self.summary.lowest
+
+    def average_percentage(self):
+        return self.summary.average_percentage
+
+    def between(self, low_percentage, high_percentage):
+        """Returns students whose overall percentage is within the inclusive range, highest first."""
+        found = [s for s in self.students if low_percentage <= s.percentage <= high_percentage]
+        found.sort(key=lambda s: s.percentage, reverse=True)
+        return found
+
+    def regrade(self, scheme):
+        """Re-grades every student with a GradingScheme in one pass; later edits use it too."""
+        scheme.regrade(self.students)
+        self.scheme = scheme
+        # The summary's average percentage changes with the scheme
+        self._summary_stale = True
+
+    # --- Editing ---
+    def add(self, code, name, c1, c2, c3, exam):
+        """Validates and appends a new student. Raises ValueError if invalid or the code exists."""
+        record = validate_record(code, name, c1, c2, c3, exam)
+        if self.position(record[0]) is not None:
+            raise ValueError(f"A student with code {record[0]} already exists.")
+        student = Student(*record)
+        if self.scheme is not None:
+            self.scheme.apply(student)
+        self.students.append(student)
+        # Appending never moves existing positions, so the indexes stay valid
+        if not self._stale:
+            self.by_code.setdefault(student.code, len(self.students) - 1)
+            self.by_name.setdefault(student.name.lower(), len(self.students) - 1)
+        self._summary.add(student)
+        if self._name_index is not None:
+            self._name_index.add(student.name)
+        if self._prefix_index is not None:
+            self._prefix_index.add(student.code, student.name)
+        return student
+
+    def update(self, old_code, **changes):
+        """Replaces fields of the student with this code (e.g. exam=70 or code='2222') and returns the new record.
+
+        Raises KeyError if no such student exists and ValueError if the result is
+        invalid or the new code belongs to another student.
+        """
+        position = self.position(old_code)
+        if position is None:
+            raise KeyError(old_code)
+        old = self.students[position]
+        fields = {'code': old.code, 'name': old.name, 'c1': old.c1,
+                  'c2': old.c2, 'c3': old.c3, 'exam': old.exam}
+        unknown = set(changes) - set(fields)
+        if unknown:
+            raise TypeError(f"Unknown student fields: {', '.join(sorted(unknown))}")
+        fields.update(changes)
+        record = validate_record(**fields)
+        if record[0] != old.code and self.position(record[0]) is not None:
+            raise ValueError(f"A student with code {record[0]} already exists.")
+        student = Student(*record)
+        if self.scheme is not None:
+            self.scheme.apply(student)
+        self.students[position] = student
+        # Same position, so the indexes only go stale if the code or name moved
+        if student.code != old.code or student.name.lower() != old.name.lower():
+            self._stale = True
+        self._summary_stale = True
+        if self._name_index is not None:
+            self._name_index.add(student.name)
+        if self._prefix_index is not None:
+            self._prefix_index.add(student.code, student.name)
+        return student
+
+    def delete(self, code):
+        """Removes and returns the student with this code. Raises KeyError if not found."""
+        position = self.position(code)
+        if position is None:
+            raise KeyError(code)
+        student = self.students.pop(position)
+        # Every later position moves down one
+        self._stale = True
+        return student
@@ -0,0 +1,158 @@
+# Student Manager - Background Export
+# Streams a view of student records to CSV, JSON Lines or HTML on a worker
+# thread, so the window stays responsive and large exports can be cancelled.
+#
+# Rows are formatted in batches and written through a large file buffer, so
+# memory stays constant however many rows are exported. Output goes to a
+# '.part' file that is renamed into place only when the export completes.
+import csv
+import html
+import io
+import json
+import os
+import threading
+
+from student_core import Summary, format_summary
+
+# Rows formatted per write
+EXPORT_BATCH = 1000
+# Bytes buffered by the output file between writes to disk
+WRITE_BUFFER = 1024 * 1024
+
+FIELDS = ['code', 'name', 'c1', 'c2', 'c3', 'exam',
+          'coursework_total', 'overall_total', 'percentage', 'grade']
+
+
+# --- Formats ---
+class CsvFormat:
+    def header(self, title):
+        return ",".join(FIELDS) + "\n"
+
+    def rows(self, students):
+        # One csv.writer call per batch instead of one write per row
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        # FIELDS is in to_dict() order
+        writer.writerows(s.to_dict().values() for s in students)
+        return buffer.getvalue()
+
+    def footer(self, summary):
+        return ""
+
+
+class JsonLinesFormat:
+    def header(self, title):
+        return ""
+
+    def rows(self, students):
+        return "".join(json.dumps(s.to_dict(), ensure_ascii=False) + "\n" for s in students)
+
+    def footer(self, summary):
+        return ""
+
+
+class HtmlFormat:
+    def header(self, title):
+        cells = "".join(f"<th>{html.escape(f)}</th>" for f in FIELDS)
+        return (
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+            f"<title>{html.escape(title)}</title>"
+            "<style>body{font-family:Arial,sans-serif}table{border-collapse:collapse}"
+            "td,th{border:1px solid #ccc;padding:2px 6px}th{background:#1E90FF;color:white}</style>"
+            f"</head><body>\n<h1>{html.escape(title)}</h1>\n<table>\n<tr>{cells}</tr>\n"
+        )
+
+    def rows(self, students):
+        lines = []
+        for s in students:
+            record = s.to_dict()
+            lines.append("<tr>" + "".join(f"<td>{html.escape(str(record[f]))}</td>" for f in FIELDS) + "</tr>\n")
+        return "".join(lines)
+
+    def footer(self, summary):
+        text = html.escape(format_summary(summary).strip())
+        return f"</table>\n<pre>{text}</pre>\n</body></html>\n"
+
+
+FORMATS = {'.csv': CsvFormat, '.jsonl': JsonLinesFormat, '.html': HtmlFormat}
+
+
+def format_for_path(path):
+    """Returns the export format for a file name, or None if the extension is not supported."""
+    factory = FORMATS.get(os.path.splitext(path)[1].lower())
+    return factory() if factory else None
+
+
+# --- Worker ---
+class ExportJob:
+    """Exports one view of a store on a background thread.
+
+    rows is called in the worker with the worker's own store (see
+    for_thread) and returns the students to export. The GUI polls
+    `exported`, `done`, `cancelled` and `error`; `total` is None when the
+    number of rows is not known up front.
+    """
+    def __init__(self, path, title, store, rows, total=None):
+        self.path = path
+        self.title = title
+        self.store = store
+        self.rows = rows
+        self.total = total
+        self.exported = 0
+        self.done = False
+        self.cancelled = False
+        self.error = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="student-export", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Asks the worker to stop after the current batch; the partial file is removed."""
+        self._cancel.set()
+
+    def _run(self):
+        export_format = format_for_path(self.path)
+        temp_path = self.path + ".part"
+        # SQLite connections belong to the thread that opened them
+        store = self.store.for_thread()
+        try:
+            self._export(store, export_format, temp_path)
+            if self._cancel.is_set():
+                self.cancelled = True
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, self.path)
+        except Exception as e:
+            self.error = e
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        finally:
+            if store is not self.store:
+                store.close()
+            self.done = True
+
+    def _export(self, store, export_format, temp_path):
+        summary = Summary()
+        with open(temp_path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER) as f:
+            f.write(export_format.header(self.title))
+            batch = []
+            for student in self.rows(store):
+                batch.append(student)
+                if len(batch) >= EXPORT_BATCH:
+                    self._write_batch(f, export_format, batch, summary)
+                    batch = []
+                    if self._cancel.is_set():
+                        return
+            self._write_batch(f, export_format, batch, summary)
+            f.write(export_format.footer(summary))
+
+    def _write_batch(self, f, export_format, batch, summary):
+        f.write(export_format.rows(batch))
+        for student in batch:
+            summary.add(student)
+        self.exported += len(batch)
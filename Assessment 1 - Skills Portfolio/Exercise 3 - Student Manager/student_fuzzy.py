@@ -0,0 +1,144 @@
+# Student Manager - Fuzzy Name Search
+# Typo-tolerant name lookup: a trigram inverted index finds the few names
+# that could be within a small edit distance of the search term, and only
+# those are checked with a bounded Levenshtein distance.
+#
+# Every edit (insert, delete or substitute one character) can break at most
+# three trigrams, so a name within k edits of the term is missing at most 3k
+# of the term's trigrams. Among any 3k + m of the term's trigram lists it
+# must therefore appear in at least m. Only the rarest lists are counted
+# (trigrams that appear in no name at all are the rarest of all), so the
+# long lists of common trigrams are never scanned.
+from array import array
+from collections import Counter
+
+# One typo is allowed per this many characters of the search term (at least one, at most MAX_EDITS)
+CHARS_PER_EDIT = 6
+MAX_EDITS = 3
+DEFAULT_LIMIT = 10
+# Trigram lists counted beyond the 3k a match may miss; a candidate must appear in this many
+SCAN_MARGIN = 3
+
+
+def trigrams(text):
+    """Returns the set of three-character slices of text, padded so word edges count too."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_distance_for(search_term):
+    """Edits allowed for a search term: one per CHARS_PER_EDIT characters, between 1 and MAX_EDITS."""
+    return min(MAX_EDITS, max(1, len(search_term) // CHARS_PER_EDIT))
+
+
+def levenshtein(a, b, max_distance=None):
+    """Returns the edit distance between a and b, or None if it is more than max_distance."""
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return None
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1,          # delete from a
+                               current[j - 1] + 1,       # insert into a
+                               previous[j - 1] + (char_a != char_b)))
+        # Every later row is at least this row's minimum, so stop early
+        if max_distance is not None and min(current) > max_distance:
+            return None
+        previous = current
+    distance = previous[-1]
+    if max_distance is not None and distance > max_distance:
+        return None
+    return distance
+
+
+class NameIndex:
+    """Trigram inverted index over distinct lower-case names."""
+    def __init__(self, names=()):
+        self.names = []
+        self._ids = {}
+        # trigram -> ids of the names containing it, in increasing order
+        self.postings = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name):
+        """Indexes a name (case-insensitive); names already indexed are ignored."""
+        name = name.strip().lower()
+        if name in self._ids:
+            return
+        name_id = len(self.names)
+        self._ids[name] = name_id
+        self.names.append(name)
+        postings = self.postings
+        for gram in trigrams(name):
+            ids = postings.get(gram)
+            if ids is None:
+                ids = postings[gram] = array('I')
+            ids.append(name_id)
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, search_term, limit=DEFAULT_LIMIT, max_distance=None):
+        """Returns up to limit (distance, name) pairs within max_distance edits, closest first."""
+        term = search_term.strip().lower()
+        if not term:
+            return []
+        if max_distance is None:
+            max_distance = max_distance_for(term)
+        term_grams = trigrams(term)
+        required = len(term_grams) - 3 * max_distance
+        if required <= 0:
+            # Too short for the trigram bound to rule anything out
+            return brute_force_search(self.names, term, limit, max_distance)
+
+        # Count the names in the rarest 3k + SCAN_MARGIN lists (missing trigrams are empty lists)
+        lists = sorted((self.postings.get(gram, ()) for gram in term_grams), key=len)
+        scanned = min(len(lists), 3 * max_distance + SCAN_MARGIN)
+        counts = Counter()
+        for ids in lists[:scanned]:
+            counts.update(ids)
+        needed = scanned - 3 * max_distance
+
+        names = self.names
+        low, high = len(term) - max_distance, len(term) + max_distance
+        found = []
+        for name_id in [name_id for name_id, count in counts.items() if count >= needed]:
+            name = names[name_id]
+            if not low <= len(name) <= high:
+                continue
+            if len(term_grams & trigrams(name)) < required:
+                continue
+            distance = levenshtein(term, name, max_distance)
+            if distance is not None:
+                found.append((distance, name))
+        found.sort()
+        return found[:limit]
+
+
+def fuzzy_find(store, index, search_term, limit=DEFAULT_LIMIT):
+    """Returns up to limit (distance, student) pairs from a store for the closest indexed names."""
+    found = []
+    for distance, name in index.search(search_term, limit):
+        student = store.find(name)
+        # Names of deleted students stay in the index, so skip any that are gone
+        if student is not None:
+            found.append((distance, student))
+    return found
+
+
+def brute_force_search(names, search_term, limit=DEFAULT_LIMIT, max_distance=None):
+    """Checks every name with the bounded edit distance; the reference the index must match."""
+    term = search_term.strip().lower()
+    if max_distance is None:
+        max_distance = max_distance_for(term)
+    found = []
+    for name in names:
+        distance = levenshtein(term, name, max_distance)
+        if distance is not None:
+            found.append((distance, name))
+    found.sort()
+    return found[:limit]
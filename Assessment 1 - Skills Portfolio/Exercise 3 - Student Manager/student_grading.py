@@ -0,0 +1,211 @@
+# Student Manager - Grading Schemes
+# Grading schemes loaded from a JSON config file, each with per-component
+# weights, caps and grade bands.
+#
+# A scheme is compiled once into lookup tables indexed by the weighted total:
+# weights are scaled to whole numbers, so every possible total is an integer
+# between 0 and max_total, and grading a student is a single list index.
+#
+# Config format (resources/grading_schemes.json):
+#   {"default": "standard",
+#    "schemes": {"exam_weighted": {"description": "...",
+#                                  "weights": {"c1": 1, "c2": 1, "c3": 1, "exam": 1.5},
+#                                  "caps": {"exam": 90},
+#                                  "bands": [["A", 70], ["B", 60], ["C", 50], ["D", 40], ["F", 0]]}}}
+# Weights default to 1 and components are uncapped. Marks above a cap count as
+# the cap; percentages are still out of the full weighted maximum.
+import json
+import math
+import os
+from fractions import Fraction
+
+from student_core import COURSEWORK_MARK_MAX, EXAM_MAX
+
+SCHEMES_PATH = os.path.join("resources", "grading_schemes.json")
+
+COMPONENTS = ('c1', 'c2', 'c3', 'exam')
+COMPONENT_MAX = {'c1': COURSEWORK_MARK_MAX, 'c2': COURSEWORK_MARK_MAX,
+                 'c3': COURSEWORK_MARK_MAX, 'exam': EXAM_MAX}
+
+# The hard-coded grading from the assignment brief
+STANDARD_BANDS = [('A', 70), ('B', 60), ('C', 50), ('D', 40), ('F', 0)]
+
+
+# --- Schemes ---
+class GradingScheme:
+    """A grading scheme compiled to grade and percentage tables over every integer weighted total."""
+    def __init__(self, name, bands=STANDARD_BANDS, weights=None, caps=None, description=""):
+        self.name = name
+        self.description = description
+        weights = weights or {}
+        caps = caps or {}
+        unknown = (set(weights) | set(caps)) - set(COMPONENTS)
+        if unknown:
+            raise ValueError(f"Scheme '{name}': unknown components {', '.join(sorted(unknown))}.")
+
+        # Scale the weights by the lowest common denominator so they become integers
+        fractions = [Fraction(str(weights.get(c, 1))) for c in COMPONENTS]
+        if any(w < 0 for w in fractions) or not any(fractions):
+            raise ValueError(f"Scheme '{name}': weights must be non-negative and not all zero.")
+        scale = math.lcm(*(w.denominator for w in fractions))
+        self.multipliers = tuple(int(w * scale) for w in fractions)
+        self.caps = tuple(None if caps.get(c) is None else int(caps[c]) for c in COMPONENTS)
+        if any(cap is not None and not 0 <= cap <= COMPONENT_MAX[c] for c, cap in zip(COMPONENTS, self.caps)):
+            raise ValueError(f"Scheme '{name}': caps must be between 0 and the component's maximum.")
+        self.weights = dict(zip(COMPONENTS, fractions))
+
+        self.bands = sorted(((str(grade), float(minimum)) for grade, minimum in bands),
+                            key=lambda band: band[1], reverse=True)
+        if not self.bands or self.bands[-1][1] > 0:
+            raise ValueError(f"Scheme '{name}': the lowest band must start at 0%.")
+        # Grades from best to worst, for charts and comparisons
+        self.grades = tuple(dict.fromkeys(grade for grade, _ in self.bands))
+        self.compile()
+
+    def compile(self):
+        """Builds the grade and percentage lookup tables for totals 0..max_total."""
+        self.max_total = sum(m * COMPONENT_MAX[c] for m, c in zip(self.multipliers, COMPONENTS))
+        # Weighted, capped contribution of every valid mark, so a total is four list lookups
+        self.contributions = tuple(
+            [m * (mark if cap is None else min(mark, cap)) for mark in range(COMPONENT_MAX[c] + 1)]
+            for m, cap, c in zip(self.multipliers, self.caps, COMPONENTS))
+        # Same expression as Student.__init__, so the standard scheme gives identical percentages
+        self.percentages = [(total / self.max_total) * 100 for total in range(self.max_total + 1)]
+        self.table = [self.grade_for_percentage(p) for p in self.percentages]
+
+    def grade_for_percentage(self, percentage):
+        for grade, minimum in self.bands:
+            if percentage >= minimum:
+                return grade
+        return self.bands[-1][0]
+
+    def total(self, c1, c2, c3, exam):
+        """Returns the weighted, capped integer total for a set of marks."""
+        if c1 | c2 | c3 | exam >= 0:
+            t1, t2, t3, te = self.contributions
+            try:
+                return t1[c1] + t2[c2] + t3[c3] + te[exam]
+            except IndexError:
+                pass
+        # A mark outside its range (e.g. 25 out of 20) is weighted as it is
+        return sum(m * (mark if cap is None else min(mark, cap))
+                   for m, cap, mark in zip(self.multipliers, self.caps, (c1, c2, c3, exam)))
+
+    def result(self, c1, c2, c3, exam):
+        """Returns (percentage, grade) for a set of marks."""
+        total = self.total(c1, c2, c3, exam)
+        if 0 <= total <= self.max_total:
+            return self.percentages[total], self.table[total]
+        # Marks outside the brief's ranges (e.g. negative) are graded without the tables
+        percentage = (total / self.max_total) * 100
+        return percentage, self.grade_for_percentage(percentage)
+
+    def apply(self, student):
+        """Re-grades one student in place."""
+        student.set_result(*self.result(student.c1, student.c2, student.c3, student.exam))
+
+    def regrade(self, students):
+        """Re-grades every student in one pass over the lookup tables."""
+        percentages = self.percentages
+        table = self.table
+        t1, t2, t3, te = self.contributions
+        for student in students:
+            c1, c2, c3, exam = student.c1, student.c2, student.c3, student.exam
+            # Same as result(), inlined for the common case of marks within range
+            if c1 | c2 | c3 | exam >= 0:
+                try:
+                    total = t1[c1] + t2[c2] + t3[c3] + te[exam]
+                except IndexError:
+                    pass
+                else:
+                    student.set_result(percentages[total], table[total])
+                    continue
+            student.set_result(*self.result(c1, c2, c3, exam))
+
+    def describe(self):
+        """Returns a short text description of the weights, caps and bands."""
+        weights = ", ".join(f"{c} x{float(w):g}" for c, w in self.weights.items())
+        caps = ", ".join(f"{c} <= {cap}" for c, cap in zip(COMPONENTS, self.caps) if cap is not None)
+        bands = ", ".join(f"{grade} {minimum:g}%+" for grade, minimum in self.bands)
+        text = f"{self.name}: weights {weights}; bands {bands}"
+        if caps:
+            text += f"; caps {caps}"
+        return text
+
+
+STANDARD = GradingScheme("standard", description="Coursework and exam marks out of 160 (assignment brief).")
+
+
+# --- Config ---
+def load_schemes(path=SCHEMES_PATH):
+    """Returns ({name: GradingScheme}, default name) from a JSON config file.
+
+    The built-in 'standard' scheme is always available. A missing file gives
+    just that scheme; a malformed one raises ValueError.
+    """
+    schemes = {STANDARD.name: STANDARD}
+    try:
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return schemes, STANDARD.name
+    except json.JSONDecodeError as e:
+        raise ValueError(f"'{path}' is not valid JSON: {e}") from None
+
+    try:
+        for name, options in config.get("schemes", {}).items():
+            schemes[name] = GradingScheme(name, options.get("bands", STANDARD_BANDS),
+                                          options.get("weights"), options.get("caps"),
+                                          options.get("description", ""))
+    except (AttributeError, TypeError) as e:
+        raise ValueError(f"'{path}' has a malformed scheme: {e}") from None
+    default = config.get("default", STANDARD.name)
+    if default not in schemes:
+        raise ValueError(f"'{path}': default scheme '{default}' is not defined.")
+    return schemes, default
+
+
+# --- Comparison ---
+class SchemeComparison:
+    """Grades of every student under two schemes, with a grade-to-grade cross-tabulation."""
+    def __init__(self, first, second, students, keep_changes=1000):
+        self.first = first
+        self.second = second
+        self.count = 0
+        self.crosstab = {}
+        self.changed = 0
+        # (student, first result, second result) for the first keep_changes differing grades
+        self.changes = []
+        first_result, second_result = first.result, second.result
+        for student in students:
+            marks = (student.c1, student.c2, student.c3, student.exam)
+            a = first_result(*marks)
+            b = second_result(*marks)
+            self.count += 1
+            key = (a[1], b[1])
+            self.crosstab[key] = self.crosstab.get(key, 0) + 1
+            if a[1] != b[1]:
+                self.changed += 1
+                if len(self.changes) < keep_changes:
+                    self.changes.append((student, a, b))
+
+    def format(self):
+        """Formats the comparison as text for the output area."""
+        first, second = self.first, self.second
+        column = max(6, *(len(g) for g in second.grades)) + 1
+        lines = [f"--- GRADING SCHEMES: {first.name.upper()} vs {second.name.upper()} ---",
+                 first.describe(), second.describe(), "",
+                 f"Rows: grade under '{first.name}'; columns: grade under '{second.name}'",
+                 " " * column + "".join(g.rjust(column) for g in second.grades)]
+        for a in first.grades:
+            lines.append(a.ljust(column) + "".join(str(self.crosstab.get((a, b), 0)).rjust(column)
+                                                   for b in second.grades))
+        lines.append("")
+        lines.append(f"{self.changed} of {self.count} students change grade.")
+        if self.changes:
+            lines.append(f"{'-' * 40}")
+        for student, (pa, ga), (pb, gb) in self.changes:
+            lines.append(f"{student.code} {student.name}: {ga} ({pa:.2f}%) -> {gb} ({pb:.2f}%)")
+        if self.changed > len(self.changes):
+            lines.append(f"... and {self.changed - len(self.changes)} more.")
+        return "\n".join(lines)
@@ -0,0 +1,667 @@
+# Student Manager - Shared GUI Behaviour
+# Base class used by both Student Manager windows (button bar and menu versions).
+# Subclasses only build their own layout; loading and the shared actions live here.
+import tkinter as tk
+from tkinter import filedialog, messagebox, simpledialog, ttk
+import atexit
+import contextlib
+import heapq
+import itertools
+import os
+import sys
+import time
+
+from student_core import FILE_PATH, LoadStats, StudentStore, format_summary, record_cache
+
+# The shared instrumentation module lives in the portfolio folder one level up
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import instrumentation as perf
+
+# Size and hit rate of the rendered-record cache appear in the performance report
+perf.gauge("student.record_cache", record_cache.stats)
+
+# Set this environment variable to a database made by 'python -m student_sqlite import'
+# (or an archive made by 'python -m student_archive pack') to read students from it
+# instead of the text file
+DB_ENV_VAR = "STUDENT_MARKS_DB"
+# student_archive.ARCHIVE_SUFFIX, repeated so choosing the loader imports nothing
+ARCHIVE_SUFFIX = ".mka"
+
+# Records inserted into the output area per event-loop turn while streaming
+STREAM_CHUNK = 500
+
+# Milliseconds between progress updates while an export runs
+EXPORT_POLL_MS = 100
+
+# Milliseconds the search box waits after a keystroke, so fast typing runs one query
+SEARCH_DEBOUNCE_MS = 25
+# Milliseconds between checks for results while a live search is running
+SEARCH_POLL_MS = 5
+
+
+class StudentAppBase:
+    # Set to True to close the application when the marks file is missing
+    EXIT_ON_LOAD_ERROR = False
+
+    # (title, rows(store), total) for the results on screen, used by Export
+    current_view = None
+    # {name: GradingScheme} from the grading config, loaded on first use
+    grading_schemes = None
+    # The running ExportJob, if any
+    export_job = None
+    # SearchWorker for the live search box, started with the box
+    search_worker = None
+    # SharedCohort of the loaded marks and the ParallelAnalytics pool, made on first use
+    shared_cohort = None
+    analytics = None
+
+    # --- Data Loading and Parsing ---
+    def load_data(self):
+        """Loads the configured student store, reporting problems in message boxes."""
+        self.load_stats = LoadStats()
+        db_path = os.environ.get(DB_ENV_VAR)
+        if db_path and db_path.lower().endswith(ARCHIVE_SUFFIX):
+            return self.load_archive(db_path)
+        if db_path:
+            return self.load_database(db_path)
+        store = self.load_text_file()
+        self.apply_default_scheme(store)
+        return store
+
+    @perf.timed("student.load_database")
+    def load_database(self, db_path):
+        """Opens a SQLite student database; nothing is read into memory up front."""
+        # Imported here so the text-file path never loads sqlite3
+        import sqlite3
+        from student_sqlite import SqliteStudentStore
+        try:
+            return SqliteStudentStore(db_path)
+        except sqlite3.Error as e:
+            messagebox.showerror("Loading Error", f"An error occurred while opening the database '{db_path}': {e}")
+            return self._load_failed()
+
+    @perf.timed("student.load_archive")
+    def load_archive(self, archive_path):
+        """Opens a compressed marks archive; only its index and summary are read up front."""
+        from student_archive import ArchiveStudentStore
+        try:
+            return ArchiveStudentStore(archive_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Loading Error", f"An error occurred while opening the archive '{archive_path}': {e}")
+            return self._load_failed()
+
+    @perf.timed("student.load_data")
+    def load_text_file(self):
+        """Loads the marks file into an indexed StudentStore."""
+        stats = self.load_stats
+        try:
+            store = StudentStore.from_file(FILE_PATH, stats)
+        except FileNotFoundError:
+            messagebox.showerror("File Not Found",
+                                f"FATAL ERROR: The required file '{FILE_PATH}' was not found. "
+                                + ("Exiting." if self.EXIT_ON_LOAD_ERROR else
+                                   "Please ensure it is in the correct location and restart the application."))
+            return self._load_failed()
+        except Exception as e:
+            messagebox.showerror("Loading Error", f"An error occurred while reading the file: {e}")
+            return self._load_failed()
+
+        if stats.empty:
+            messagebox.showwarning("Empty File", f"The file '{FILE_PATH}' is empty.")
+            return store
+
+        # Check if the loaded count matches the first line's count
+        if stats.header_count is None:
+            messagebox.showwarning("Header Error", "WARNING: Could not parse the student count from the first line of the file.")
+        elif len(store) != stats.header_count:
+            messagebox.showwarning("Data Mismatch",
+                                f"WARNING: File header specified {stats.header_count} students, but only {len(store)} valid records were loaded.")
+        return store
+
+    def _load_failed(self):
+        if self.EXIT_ON_LOAD_ERROR:
+            sys.exit()
+        return StudentStore()
+
+    # --- Output ---
+    def display_output(self, text):
+        """Helper to safely insert text into the output area."""
+        # Stop any stream that is still filling the output area
+        if getattr(self, '_stream_job', None) is not None:
+            self.master.after_cancel(self._stream_job)
+            self._stream_job = None
+        self.output_area.config(state=tk.NORMAL)
+        self.output_area.delete('1.0', tk.END)
+        self.output_area.insert(tk.END, text)
+        self.output_area.config(state=tk.DISABLED)
+
+    @perf.timed("student.stream_first_chunk")
+    def stream_output(self, header, students, footer="", render=None):
+        """Replaces the output with header, each student's details and footer.
+
+        Records are inserted STREAM_CHUNK at a time from the Tk event loop, so
+        long results appear progressively and the window stays responsive.
+        render formats one record (default: its format_details()); footer may
+        be a function, called once every record has been shown.
+        """
+        self.display_output(header)
+        records = iter(students)
+        if render is None:
+            render = lambda student: student.format_details()
+
+        def insert_chunk():
+            perf.count("student.streamed_chunks")
+            chunk = [render(record) for _, record in zip(range(STREAM_CHUNK), records)]
+            self.output_area.config(state=tk.NORMAL)
+            self.output_area.insert(tk.END, "".join(chunk))
+            if len(chunk) < STREAM_CHUNK:
+                self.output_area.insert(tk.END, footer() if callable(footer) else footer)
+                self._stream_job = None
+            else:
+                self._stream_job = self.master.after(1, insert_chunk)
+            self.output_area.config(state=tk.DISABLED)
+
+        insert_chunk()
+
+    # --- Functionality Methods ---
+    # 1. View all student records
+    @perf.timed("student.view_all_records")
+    def view_all_records(self):
+        """Outputs all student records and class summary."""
+        if not self.students:
+            self.display_output("No student data available to view.")
+            return
+
+        self.stream_output("--- ALL STUDENT RECORDS ---\n", self.students,
+                           format_summary(self.students.summary))
+        self.current_view = ("All Student Records", lambda store: store, len(self.students))
+
+    # 2. View individual student record
+    def view_individual_record(self):
+        """Allows user to select a student by code or name and displays their record."""
+        if not self.students:
+            self.display_output("No student data available.")
+            return
+
+        search_term = simpledialog.askstring("Search Student", "Enter Student Code or Name:",
+                                            parent=self.master)
+
+        if not search_term:
+            return
+
+        search_term = search_term.strip().lower()
+        with perf.timer("student.find"):
+            found_student = self.students.find(search_term)
+
+        if found_student:
+            self.show_student_record("--- INDIVIDUAL STUDENT RECORD ---", found_student)
+            return
+
+        # No exact match, so look for names within a few typos
+        with perf.timer("student.fuzzy_find"):
+            candidates = self.students.fuzzy_find(search_term)
+        if len(candidates) == 1:
+            self.show_student_record(f"--- CLOSEST MATCH FOR '{search_term}' ---", candidates[0][1])
+        elif candidates:
+            self.choose_student(search_term, candidates)
+        else:
+            self.display_output(f"Error: Student with code or name '{search_term}' not found.")
+            self.current_view = None
+
+    def show_student_record(self, heading, student):
+        """Displays one student's record under a heading."""
+        self.display_output(f"{heading}\n{student.format_details()}")
+        self.current_view = (f"Student Record {student.code}", lambda store: [student], 1)
+
+    def choose_student(self, search_term, candidates):
+        """Shows a pick list of (distance, student) candidates; the chosen one is displayed."""
+        window = tk.Toplevel(self.master)
+        window.title("Did you mean...?")
+        window.transient(self.master)
+        tk.Label(window, text=f"No exact match for '{search_term}'. Closest names:",
+                 font=('Arial', 10, 'bold')).pack(padx=10, pady=(10, 5), anchor='w')
+        listbox = tk.Listbox(window, width=50, height=len(candidates), font=('Consolas', 10))
+        listbox.pack(padx=10, fill='both', expand=True)
+        for distance, student in candidates:
+            typos = "typo" if distance == 1 else "typos"
+            listbox.insert(tk.END, f"{student.code}  {student.name}  ({distance} {typos})")
+        listbox.selection_set(0)
+        listbox.focus_set()
+
+        def show(event=None):
+            selection = listbox.curselection()
+            if selection:
+                window.destroy()
+                self.show_student_record("--- INDIVIDUAL STUDENT RECORD ---", candidates[selection[0]][1])
+
+        listbox.bind("<Double-Button-1>", show)
+        listbox.bind("<Return>", show)
+        buttons = tk.Frame(window)
+        buttons.pack(pady=10)
+        tk.Button(buttons, text="Show", width=10, command=show).pack(side=tk.LEFT, padx=5)
+        tk.Button(buttons, text="Cancel", width=10, command=window.destroy).pack(side=tk.LEFT, padx=5)
+
+    # --- Live Search ---
+    def create_search_bar(self, parent, bg='#f0f0f0'):
+        """Builds the search-as-you-type box and its match list in a frame inside parent.
+
+        Matches are students whose code or name starts with the text typed
+        (see student_search); double-click or Return shows one in the output area.
+        """
+        # Imported here so the window's first paint never waits for it
+        from student_search import SearchWorker
+        frame = tk.Frame(parent, bg=bg)
+        frame.grid_columnconfigure(1, weight=1)
+        tk.Label(frame, text="Search:", font=('Arial', 10, 'bold'), bg=bg).grid(row=0, column=0, padx=(0, 5))
+        self.search_text = tk.StringVar()
+        entry = tk.Entry(frame, textvariable=self.search_text, font=('Arial', 11))
+        entry.grid(row=0, column=1, sticky='ew')
+        self.search_status = tk.Label(frame, text="Type a code or name", font=('Arial', 9), bg=bg, fg='#555555')
+        self.search_status.grid(row=0, column=2, padx=(5, 0))
+        self.search_list = tk.Listbox(frame, height=5, font=('Consolas', 10), activestyle='none')
+        self.search_list.grid(row=1, column=0, columnspan=3, sticky='ew', pady=(3, 0))
+
+        self.search_matches = []
+        self._search_job = None
+        self._search_poll = None
+        self._search_generation = 0
+        self._search_typed_at = None
+        # Started now so the prefix index is built while the user is still reading the window
+        self.search_worker = SearchWorker(self.students).start()
+        self.search_text.trace_add('write', self._search_changed)
+        entry.bind("<Return>", lambda event: self._show_search_match(0))
+        entry.bind("<Down>", lambda event: self.search_list.focus_set())
+        self.search_list.bind("<Double-Button-1>", self._show_selected_match)
+        self.search_list.bind("<Return>", self._show_selected_match)
+        return frame
+
+    def _search_changed(self, *args):
+        # Restart the debounce timer on every keystroke
+        self._search_typed_at = time.perf_counter()
+        if self._search_job is not None:
+            self.master.after_cancel(self._search_job)
+        self._search_job = self.master.after(SEARCH_DEBOUNCE_MS, self._start_search)
+
+    def _start_search(self):
+        self._search_job = None
+        term = self.search_text.get()
+        self.search_matches = []
+        self.search_list.delete(0, tk.END)
+        if not term.strip():
+            # Box cleared: stop the query still running and stop waiting for it
+            self.search_worker.cancel()
+            if self._search_poll is not None:
+                self.master.after_cancel(self._search_poll)
+                self._search_poll = None
+            self.search_status.config(text="Type a code or name")
+            return
+        # A newer generation makes the worker drop the query it is running
+        self._search_generation = self.search_worker.submit(term)
+        perf.count("student.live_searches")
+        self.search_status.config(text="Searching...")
+        if self._search_poll is None:
+            self._poll_search()
+
+    def _poll_search(self):
+        """Adds newly posted matches to the list until the current query finishes."""
+        self._search_poll = None
+        for generation, students, finished in self.search_worker.take():
+            if generation != self._search_generation:
+                # Results of a query that has been superseded
+                continue
+            if isinstance(students, Exception):
+                self.search_status.config(text=f"Search failed: {students}")
+                return
+            if perf.enabled and students and not self.search_matches:
+                perf.record("student.live_search_first_match", (time.perf_counter() - self._search_typed_at) * 1000)
+            self.search_matches.extend(students)
+            self.search_list.insert(tk.END, *(f"{s.code}  {s.name}  ({s.percentage:.2f}%, {s.grade})"
+                                              for s in students))
+            if finished:
+                count = len(self.search_matches)
+                self.search_status.config(text=f"{count} match{'es' if count != 1 else ''}"
+                                               + (" (first shown)" if count >= self.search_worker.limit else ""))
+                return
+        self._search_poll = self.master.after(SEARCH_POLL_MS, self._poll_search)
+
+    @contextlib.contextmanager
+    def changing_store(self):
+        """Wraps a change to self.students made on this thread, e.g. an edit or a regrade.
+
+        The live search reads the same store from its own thread, so it is held
+        off until the change is done and then re-run for the text in the box.
+        """
+        worker = self.search_worker
+        if worker is None:
+            yield
+            return
+        try:
+            with worker.paused():
+                yield
+        finally:
+            # The query in progress was stopped, and its matches may have changed anyway
+            if self.search_text.get().strip():
+                self._search_changed()
+
+    def _show_selected_match(self, event=None):
+        selection = self.search_list.curselection()
+        self._show_search_match(selection[0] if selection else 0)
+
+    def _show_search_match(self, position):
+        if position < len(self.search_matches):
+            self.show_student_record("--- INDIVIDUAL STUDENT RECORD ---", self.search_matches[position])
+
+    # 3. Show student with highest overall mark
+    @perf.timed("student.show_highest_score")
+    def show_highest_score(self):
+        """Identifies and displays the student with the highest overall score."""
+        if not self.students:
+            self.display_output("No student data available to analyse.")
+            return
+
+        highest_student = self.students.highest()
+
+        output = (
+            "--- STUDENT WITH HIGHEST TOTAL SCORE ---\n"
+            f"Highest Score: {highest_student.overall_total} / 160\n"
+            f"{'-' * 40}\n"
+            f"{highest_student.format_details()}"
+        )
+        self.display_output(output)
+        self.current_view = ("Highest Total Score", lambda store: [highest_student], 1)
+
+    # 4. Show student with lowest overall mark
+    @perf.timed("student.show_lowest_score")
+    def show_lowest_score(self):
+        """Identifies and displays the student with the lowest overall score."""
+        if not self.students:
+            self.display_output("No student data available to analyse.")
+            return
+
+        lowest_student = self.students.lowest()
+
+        output = (
+            "--- STUDENT WITH LOWEST TOTAL SCORE ---\n"
+            f"Lowest Score: {lowest_student.overall_total} / 160\n"
+            f"{'-' * 40}\n"
+            f"{lowest_student.format_details()}"
+        )
+        self.display_output(output)
+        self.current_view = ("Lowest Total Score", lambda store: [lowest_student], 1)
+
+    # Students within a percentage range
+    def view_percentage_range(self):
+        """Asks for a percentage range and displays every student inside it, highest first."""
+        if not self.students:
+            self.display_output("No student data available.")
+            return
+
+        low = simpledialog.askfloat("Percentage Range", "Lowest overall percentage:",
+                                    parent=self.master, minvalue=0, maxvalue=100)
+        if low is None:
+            return
+        high = simpledialog.askfloat("Percentage Range", "Highest overall percentage:",
+                                     parent=self.master, minvalue=low, maxvalue=100)
+        if high is None:
+            return
+
+        with perf.timer("student.view_percentage_range"):
+            self.stream_output(f"--- STUDENTS BETWEEN {low:.2f}% AND {high:.2f}% ---\n",
+                               self.students.between(low, high))
+        # The export runs the query again in its own thread, so the count is not known yet
+        self.current_view = (f"Students Between {low:.2f}% and {high:.2f}%",
+                             lambda store: store.between(low, high), None)
+
+    # Charts of the whole cohort
+    @perf.timed("student.show_charts")
+    def show_charts(self):
+        """Opens the charts window, binning the cohort once for all of its charts."""
+        if not self.students:
+            self.display_output("No student data available to chart.")
+            return
+        # Imported on first use so the main window opens without it
+        from student_charts import ChartsWindow, CohortBins
+        ChartsWindow(self.master, CohortBins.from_store(self.students))
+
+    # Statistics computed on every core
+    @perf.timed("student.show_statistics")
+    def show_statistics(self):
+        """Shows mark statistics, grade counts and the top students, analysed in parallel."""
+        if not self.students:
+            self.display_output("No student data available.")
+            return
+        # Imported on first use so the main window opens without it
+        from student_shared import ParallelAnalytics, SharedCohort
+        self.master.config(cursor="watch")
+        self.master.update_idletasks()
+        try:
+            if self.shared_cohort is None:
+                with perf.timer("student.share_cohort"):
+                    self.shared_cohort = SharedCohort.from_store(self.students)
+            if self.analytics is None:
+                self.analytics = ParallelAnalytics()
+                # The pool and the block outlive any one window, so tidy them up as the app exits
+                atexit.register(self.close_analytics)
+            stats = self.analytics.analyse(self.shared_cohort, getattr(self.students, 'scheme', None))
+        finally:
+            self.master.config(cursor="")
+        # Rows are positions in the store's list; a database store only has row numbers
+        students = getattr(self.students, 'students', None)
+        self.display_output(stats.format(students.__getitem__ if students is not None else None))
+        # The export finds the top students again in its own thread; nlargest keeps file order on
+        # equal totals, as the analysis does
+        top = len(stats.top)
+        self.current_view = (f"Top {top} by Overall Total",
+                             lambda store: heapq.nlargest(top, store, key=lambda s: s.overall_total), top)
+
+    def drop_shared_cohort(self):
+        """Frees the shared copy of the marks after an edit; the next Statistics makes a new one."""
+        if self.shared_cohort is not None:
+            self.shared_cohort.close()
+            self.shared_cohort.unlink()
+            self.shared_cohort = None
+
+    def close_analytics(self):
+        if self.analytics is not None:
+            self.analytics.close()
+            self.analytics = None
+        self.drop_shared_cohort()
+
+    # --- Grading Schemes ---
+    def load_grading_schemes(self):
+        """Returns ({name: GradingScheme}, default name), or (None, None) after showing an error."""
+        # Imported on first use so the main window opens without it
+        from student_grading import load_schemes
+        try:
+            return load_schemes()
+        except ValueError as e:
+            messagebox.showerror("Grading Schemes", f"Could not load the grading schemes: {e}")
+            return None, None
+
+    def apply_default_scheme(self, store):
+        """Re-grades a freshly loaded store if the grading config names a non-standard default."""
+        from student_grading import SCHEMES_PATH, STANDARD
+        if not store or not os.path.exists(SCHEMES_PATH):
+            return
+        self.grading_schemes, default = self.load_grading_schemes()
+        if self.grading_schemes and default != STANDARD.name:
+            store.regrade(self.grading_schemes[default])
+
+    def ask_scheme(self, title, prompt):
+        """Asks for the name of a grading scheme; returns the GradingScheme or None."""
+        if self.grading_schemes is None:
+            self.grading_schemes, _ = self.load_grading_schemes()
+            if self.grading_schemes is None:
+                return None
+        names = ", ".join(self.grading_schemes)
+        name = simpledialog.askstring(title, f"{prompt}\nAvailable: {names}", parent=self.master)
+        if not name:
+            return None
+        scheme = self.grading_schemes.get(name.strip())
+        if scheme is None:
+            messagebox.showerror(title, f"There is no grading scheme called '{name.strip()}'.", parent=self.master)
+        return scheme
+
+    def switch_grading_scheme(self):
+        """Re-grades the whole cohort in memory with another grading scheme."""
+        if not self.students:
+            self.display_output("No student data available.")
+            return
+        if not hasattr(self.students, 'regrade'):
+            messagebox.showinfo("Grading Scheme", "Re-grading is only available when using the text marks file.",
+                                parent=self.master)
+            return
+        # The export thread reads the grades being replaced
+        if self.export_job is not None:
+            messagebox.showerror("Export Running", "Please wait for the export to finish or cancel it first.",
+                                 parent=self.master)
+            return
+        scheme = self.ask_scheme("Grading Scheme", "Grade the class with which scheme?")
+        if scheme is None:
+            return
+
+        with perf.timer("student.regrade"), self.changing_store():
+            self.students.regrade(scheme)
+        self.display_output(
+            f"--- GRADING SCHEME: {scheme.name.upper()} ---\n"
+            f"{scheme.description}\n{scheme.describe()}\n"
+            f"Re-graded {len(self.students)} students."
+            f"{format_summary(self.students.summary)}"
+        )
+        self.current_view = (f"All Student Records ({scheme.name} grades)", lambda store: store, len(self.students))
+
+    def compare_grading_schemes(self):
+        """Shows how every student's grade changes between two schemes, without changing any grades."""
+        if not self.students:
+            self.display_output("No student data available.")
+            return
+        first = self.ask_scheme("Compare Grading Schemes", "First scheme:")
+        if first is None:
+            return
+        second = self.ask_scheme("Compare Grading Schemes", "Second scheme:")
+        if second is None:
+            return
+
+        from student_grading import SchemeComparison
+        with perf.timer("student.compare_schemes"):
+            comparison = SchemeComparison(first, second, self.students)
+        self.display_output(comparison.format())
+
+        def changed(store):
+            for student in store:
+                marks = (student.c1, student.c2, student.c3, student.exam)
+                if first.result(*marks)[1] != second.result(*marks)[1]:
+                    yield student
+        # Every student who changes grade, not only the ones listed, with the grades the store uses
+        self.current_view = (f"Students Changing Grade: {first.name} vs {second.name}", changed, comparison.changed)
+
+    # --- Cohort Comparison ---
+    @perf.timed("student.compare_cohorts")
+    def compare_cohorts(self):
+        """Joins two or more marks files on student code and shows each student's movement."""
+        paths = filedialog.askopenfilenames(
+            parent=self.master, title="Choose Marks Files (oldest first)",
+            filetypes=[("Marks files", "*.txt"), ("All files", "*.*")])
+        if not paths:
+            return
+        if len(paths) < 2:
+            messagebox.showinfo("Compare Cohorts", "Please choose at least two marks files.", parent=self.master)
+            return
+
+        # Imported on first use so the main window opens without it
+        from student_join import CohortJoin
+        # The dialog returns files in name order, which is oldest first for names like 2023.txt
+        # Grade every file with the scheme the main view uses
+        join = CohortJoin(sorted(paths), scheme=getattr(self.students, 'scheme', None))
+        records = iter(join)
+        self.master.config(cursor="watch")
+        self.master.update_idletasks()
+        try:
+            # The first record needs every file joined, so read them all up front
+            first = next(records, None)
+        except OSError as e:
+            messagebox.showerror("Compare Cohorts", f"Could not read the marks files: {e}", parent=self.master)
+            return
+        finally:
+            self.master.config(cursor="")
+
+        if first is None:
+            self.display_output("No student records were found in the chosen files.")
+            return
+        labels = join.labels
+        header = (f"--- COHORT MOVEMENT: {' -> '.join(labels)} ---\n"
+                  + ("(More students than fit in memory; joined on disk.)\n" if join.spilled else ""))
+        self.stream_output(header, itertools.chain([first], records),
+                           lambda: "\n" + join.movement.format(),
+                           lambda record: record.format_line(labels) + "\n")
+        # Joined records are not students, so there is nothing to export
+        self.current_view = None
+
+    # --- Export ---
+    def export_current_view(self):
+        """Saves the results on screen to CSV, JSON Lines or HTML on a background thread."""
+        # Imported on first use so the main window opens without it
+        from student_export import ExportJob, format_for_path
+        if self.export_job is not None:
+            messagebox.showinfo("Export", "An export is already running.", parent=self.master)
+            return
+        if self.current_view is None:
+            messagebox.showinfo("Export", "Show some results first (for example View All Records), "
+                                          "then export them.", parent=self.master)
+            return
+
+        path = filedialog.asksaveasfilename(
+            parent=self.master, title="Export Results", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("HTML", "*.html")])
+        if not path:
+            return
+        if format_for_path(path) is None:
+            messagebox.showerror("Export", "Please choose a file ending in .csv, .jsonl or .html.",
+                                 parent=self.master)
+            return
+
+        title, rows, total = self.current_view
+        perf.count("student.exports")
+        self.export_job = ExportJob(path, title, self.students, rows, total).start()
+        self._show_export_progress()
+
+    def _show_export_progress(self):
+        """Opens a small window with a progress bar and Cancel button for the running export."""
+        job = self.export_job
+        window = tk.Toplevel(self.master)
+        window.title("Exporting...")
+        window.resizable(False, False)
+        window.transient(self.master)
+        label = tk.Label(window, text=f"Exporting to {os.path.basename(job.path)}", font=('Arial', 10))
+        label.pack(padx=15, pady=(10, 5))
+        # Determinate when the row count is known, otherwise a moving bar
+        bar = ttk.Progressbar(window, length=300,
+                              mode='determinate' if job.total else 'indeterminate',
+                              maximum=job.total or 100)
+        bar.pack(padx=15, pady=5)
+        if not job.total:
+            bar.start(15)
+        cancel = tk.Button(window, text="Cancel", command=job.cancel, width=10)
+        cancel.pack(pady=(5, 10))
+        # Closing the window cancels the export too
+        window.protocol("WM_DELETE_WINDOW", job.cancel)
+
+        def poll():
+            if not job.done:
+                if job.total:
+                    bar['value'] = job.exported
+                label.config(text=f"Exported {job.exported} of {job.total or '?'} records...")
+                self.master.after(EXPORT_POLL_MS, poll)
+                return
+            self.export_job = None
+            window.destroy()
+            if job.error is not None:
+                messagebox.showerror("Export Failed", f"Could not export to '{job.path}': {job.error}",
+                                     parent=self.master)
+            elif job.cancelled:
+                messagebox.showinfo("Export Cancelled", "The export was cancelled.", parent=self.master)
+            else:
+                messagebox.showinfo("Export Complete", f"Exported {job.exported} records to '{job.path}'.",
+                                    parent=self.master)
+
+        poll()
@@ -0,0 +1,363 @@
+# Student Manager - Cross-Cohort Join
+# Joins several marks files (modules, years) on student code and reports each
+# student's movement between them, plus cohort-level movement.
+#
+# Usage (from this folder):
+#   python -m student_join year1.txt year2.txt year3.txt
+#   python -m student_join 2023.txt 2024.txt --labels 2023 2024 --format csv -o movement.csv
+#   python -m student_join big_a.txt big_b.txt --max-codes 100000 --spill-dir /tmp
+#
+# While the distinct codes fit in --max-codes, the join is a hash join: every
+# file is read once into one dict entry per code holding that student's result
+# in each file. Beyond that it falls back to a sort-merge join: the files are
+# read again and cut into runs sorted by (code, file, position) and spilled to
+# temporary files, and the runs of all the files are merged with heapq.merge
+# (in several passes if there are more than MERGE_FAN_IN, as in student_sort,
+# so the open files stay bounded). Memory is then bounded by the run size, not
+# the input size. Results come out in code order either way, and a code's
+# first record in each file is the one used (as in View Individual).
+import argparse
+import csv
+import heapq
+import json
+import os
+import sys
+import tempfile
+
+from student_core import LoadStats, Student, iter_students
+from student_sort import MERGE_FAN_IN
+
+# Distinct codes held in memory before switching to the sort-merge join
+MAX_CODES_IN_MEMORY = 1000000
+# Records sorted in memory per spilled run
+SPILL_RUN_SIZE = 200000
+# Percentage points of change still counted as 'stable'
+STABLE_MARGIN = 2.0
+
+TRENDS = ("improving", "declining", "stable", "mixed", "single")
+
+
+# --- Joined Records ---
+class JoinedRecord:
+    """One student's results across the joined cohorts (None where the student is absent)."""
+    def __init__(self, code, name, results):
+        self.code = code
+        self.name = name
+        # [(percentage, grade) or None] in cohort order
+        self.results = results
+        present = [r[0] for r in results if r is not None]
+        self.deltas = [b - a for a, b in zip(present, present[1:])]
+        self.change = present[-1] - present[0] if present else 0.0
+        self.trend = trend_for(self.deltas)
+
+    def format_line(self, labels):
+        """Formats the record as one line, e.g. '1234 Amy Khan: 2023 65.00% B -> 2024 70.00% A (+5.00, improving)'."""
+        steps = " -> ".join(f"{label} {r[0]:.2f}% {r[1]}" if r is not None else f"{label} absent"
+                            for label, r in zip(labels, self.results))
+        return f"{self.code} {self.name}: {steps} ({self.change:+.2f}, {self.trend})"
+
+
+def trend_for(deltas):
+    """Classifies a list of percentage changes as improving, declining, stable, mixed or single."""
+    if not deltas:
+        return "single"
+    if all(abs(d) <= STABLE_MARGIN for d in deltas):
+        return "stable"
+    if all(d >= -STABLE_MARGIN for d in deltas):
+        return "improving"
+    if all(d <= STABLE_MARGIN for d in deltas):
+        return "declining"
+    return "mixed"
+
+
+class CohortMovement:
+    """Cohort-level movement, accumulated one JoinedRecord at a time."""
+    def __init__(self, labels):
+        self.labels = labels
+        self.students = 0
+        self.in_all = 0
+        self.present = [0] * len(labels)
+        self.trends = dict.fromkeys(TRENDS, 0)
+        self.change_sum = 0.0
+        self.changed = 0
+        # (first grade, last grade) -> count, for students in more than one cohort
+        self.grade_moves = {}
+        self.biggest_rise = None
+        self.biggest_fall = None
+
+    def add(self, record):
+        self.students += 1
+        present = [r for r in record.results if r is not None]
+        for i, r in enumerate(record.results):
+            if r is not None:
+                self.present[i] += 1
+        if len(present) == len(record.results):
+            self.in_all += 1
+        self.trends[record.trend] += 1
+        if len(present) > 1:
+            self.changed += 1
+            self.change_sum += record.change
+            move = (present[0][1], present[-1][1])
+            self.grade_moves[move] = self.grade_moves.get(move, 0) + 1
+            if self.biggest_rise is None or record.change > self.biggest_rise.change:
+                self.biggest_rise = record
+            if self.biggest_fall is None or record.change < self.biggest_fall.change:
+                self.biggest_fall = record
+
+    @property
+    def average_change(self):
+        return self.change_sum / self.changed if self.changed else 0.0
+
+    def format(self):
+        """Formats the movement summary block."""
+        lines = ["--- COHORT MOVEMENT ---",
+                 f"Students: {self.students} ({self.in_all} in every cohort)"]
+        lines += [f"  in {label}: {count}" for label, count in zip(self.labels, self.present)]
+        lines.append(f"Average change (students in 2+ cohorts): {self.average_change:+.2f} percentage points")
+        lines.append("Trends: " + ", ".join(f"{trend} {count}" for trend, count in self.trends.items()))
+        if self.biggest_rise is not None:
+            lines.append(f"Biggest rise: {self.biggest_rise.code} {self.biggest_rise.name} "
+                         f"({self.biggest_rise.change:+.2f})")
+            lines.append(f"Biggest fall: {self.biggest_fall.code} {self.biggest_fall.name} "
+                         f"({self.biggest_fall.change:+.2f})")
+        if self.grade_moves:
+            lines.append("Grade moves (first -> last cohort):")
+            for (first, last), count in sorted(self.grade_moves.items()):
+                lines.append(f"  {first} -> {last}: {count}")
+        lines.append("-" * 21)
+        return "\n".join(lines)
+
+
+# --- Join Engine ---
+class CohortJoin:
+    """Iterates JoinedRecords for a list of marks files; movement is filled in as it goes.
+
+    Raises OSError if a file cannot be read.
+    """
+    def __init__(self, paths, labels=None, scheme=None, max_codes=MAX_CODES_IN_MEMORY,
+                 run_size=SPILL_RUN_SIZE, spill_dir=None, fan_in=MERGE_FAN_IN):
+        self.paths = list(paths)
+        self.labels = list(labels) if labels else [os.path.splitext(os.path.basename(p))[0] for p in self.paths]
+        if len(self.labels) != len(self.paths):
+            raise ValueError("Give one label per file.")
+        self.scheme = scheme
+        self.max_codes = max_codes
+        self.run_size = run_size
+        self.spill_dir = spill_dir
+        self.fan_in = max(2, fan_in)
+        self.movement = CohortMovement(self.labels)
+        self.load_stats = [LoadStats() for _ in self.paths]
+        # True once the join has fallen back to spilled runs
+        self.spilled = False
+
+    def _students(self, index):
+        students = iter_students(self.paths[index], self.load_stats[index])
+        if self.scheme is None:
+            return students
+        return self._regraded(students)
+
+    def _regraded(self, students):
+        for student in students:
+            self.scheme.apply(student)
+            yield student
+
+    def __iter__(self):
+        self.movement = CohortMovement(self.labels)
+        self.load_stats = [LoadStats() for _ in self.paths]
+        table = self._hash_table()
+        records = self._hash_join(table) if table is not None else self._sort_merge_join()
+        for record in records:
+            self.movement.add(record)
+            yield record
+
+    # --- Hash Join ---
+    def _hash_table(self):
+        """Returns {code: [name, result per file]}, or None if there are more than max_codes codes."""
+        count = len(self.paths)
+        table = {}
+        for index in range(count):
+            for student in self._students(index):
+                entry = table.get(student.code)
+                if entry is None:
+                    if len(table) >= self.max_codes:
+                        return None
+                    entry = table[student.code] = [student.name] + [None] * count
+                if entry[index + 1] is None:
+                    # Keep the first record per file, but the latest name
+                    entry[0] = student.name
+                    entry[index + 1] = (student.percentage, student.grade)
+        return table
+
+    def _hash_join(self, table):
+        for code in sorted(table):
+            entry = table[code]
+            yield JoinedRecord(code, entry[0], entry[1:])
+
+    # --- Sort-Merge Join ---
+    def _sort_merge_join(self):
+        self.spilled = True
+        self.load_stats = [LoadStats() for _ in self.paths]
+        with tempfile.TemporaryDirectory(prefix="student_join_", dir=self.spill_dir) as spill_dir:
+            runs = []
+            for index in range(len(self.paths)):
+                runs += self._spill_runs(index, spill_dir)
+            # Never more than fan_in run files open at once, however many runs were spilled
+            passes = 0
+            while len(runs) > self.fan_in:
+                passes += 1
+                runs = [_merge_to_file(runs[i:i + self.fan_in], spill_dir, passes)
+                        for i in range(0, len(runs), self.fan_in)]
+            count = len(self.paths)
+            current = None
+            name = None
+            results = None
+            for code, index, _, fields in heapq.merge(*(_read_run(r) for r in runs)):
+                if code != current:
+                    if current is not None:
+                        yield JoinedRecord(current, name, results)
+                    current = code
+                    results = [None] * count
+                if results[index] is not None:
+                    # A later record for a code already seen in this file
+                    continue
+                student = Student(code, *fields.split(","))
+                if self.scheme is not None:
+                    self.scheme.apply(student)
+                results[index] = (student.percentage, student.grade)
+                name = student.name
+            if current is not None:
+                yield JoinedRecord(current, name, results)
+
+    def _spill_runs(self, index, spill_dir):
+        """Writes one file's records as sorted runs of run_size records; returns the run paths."""
+        runs = []
+        chunk = []
+        position = 0
+        for student in iter_students(self.paths[index], self.load_stats[index]):
+            chunk.append((student.code, index, position, f"{student.name},{student.c1},{student.c2},"
+                                                         f"{student.c3},{student.exam}"))
+            position += 1
+            if len(chunk) >= self.run_size:
+                runs.append(_write_run(chunk, spill_dir, f"input{index}_run{len(runs)}.txt"))
+                chunk = []
+        if chunk or not runs:
+            runs.append(_write_run(chunk, spill_dir, f"input{index}_run{len(runs)}.txt"))
+        return runs
+
+
+def _write_run(records, spill_dir, name):
+    # Sorting by (code, file, position) keeps each code's first record per file first
+    records.sort()
+    path = os.path.join(spill_dir, name)
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write("".join([f"{code},{index},{position},{fields}\n" for code, index, position, fields in records]))
+    return path
+
+
+def _read_run(path):
+    """Yields (code, file index, position, 'name,c1,c2,c3,exam') from a spilled run, in sorted order."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            code, index, position, fields = line.rstrip("\n").split(",", 3)
+            yield code, int(index), int(position), fields
+
+
+def _merge_to_file(paths, spill_dir, merge_pass):
+    """Merges a group of runs into one new run and removes them; returns its path."""
+    path = os.path.join(spill_dir, f"pass{merge_pass}_{os.path.basename(paths[0])}")
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.writelines(f"{code},{index},{position},{fields}\n"
+                     for code, index, position, fields in heapq.merge(*(_read_run(p) for p in paths)))
+    for p in paths:
+        os.remove(p)
+    return path
+
+
+# --- Headless Export ---
+def write_text(join, out):
+    for record in join:
+        out.write(record.format_line(join.labels))
+        out.write("\n")
+    out.write("\n" + join.movement.format() + "\n")
+
+
+def write_csv(join, out):
+    fields = ['code', 'name']
+    for label in join.labels:
+        fields += [f"percentage_{label}", f"grade_{label}"]
+    fields += ['change', 'trend']
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(fields)
+    for record in join:
+        row = [record.code, record.name]
+        for result in record.results:
+            row += [round(result[0], 2), result[1]] if result is not None else ["", ""]
+        row += [round(record.change, 2), record.trend]
+        writer.writerow(row)
+
+
+def write_jsonl(join, out):
+    for record in join:
+        out.write(json.dumps({
+            'type': 'student', 'code': record.code, 'name': record.name,
+            'results': {label: None if r is None else {'percentage': round(r[0], 2), 'grade': r[1]}
+                        for label, r in zip(join.labels, record.results)},
+            'change': round(record.change, 2), 'trend': record.trend,
+        }, ensure_ascii=False) + "\n")
+    movement = join.movement
+    out.write(json.dumps({
+        'type': 'movement', 'students': movement.students, 'in_all': movement.in_all,
+        'present': dict(zip(join.labels, movement.present)), 'trends': movement.trends,
+        'average_change': round(movement.average_change, 2),
+        'grade_moves': [{'from': a, 'to': b, 'count': n} for (a, b), n in sorted(movement.grade_moves.items())],
+    }, ensure_ascii=False) + "\n")
+
+
+WRITERS = {'text': write_text, 'csv': write_csv, 'jsonl': write_jsonl}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="student_join",
+                                     description="Join marks files on student code and report movement.")
+    parser.add_argument("files", nargs="+", help="studentMarks.txt-format files, oldest first")
+    parser.add_argument("--labels", nargs="+", help="a label per file (default: file names)")
+    parser.add_argument("-f", "--format", choices=tuple(WRITERS), default="text")
+    parser.add_argument("-o", "--output", help="write to this file instead of stdout")
+    parser.add_argument("--scheme", metavar="NAME", help="grade every file with this grading scheme")
+    parser.add_argument("--max-codes", type=int, default=MAX_CODES_IN_MEMORY,
+                        help="distinct codes to join in memory before spilling to disk")
+    parser.add_argument("--spill-dir", help="folder for temporary spill files")
+    args = parser.parse_args(argv)
+    if args.labels and len(args.labels) != len(args.files):
+        parser.error("give one --labels entry per file")
+
+    scheme = None
+    if args.scheme:
+        from student_grading import load_schemes
+        try:
+            schemes, _ = load_schemes()
+        except ValueError as e:
+            print(f"student_join: {e}", file=sys.stderr)
+            return 2
+        if args.scheme not in schemes:
+            print(f"student_join: unknown grading scheme '{args.scheme}'", file=sys.stderr)
+            return 2
+        scheme = schemes[args.scheme]
+
+    join = CohortJoin(args.files, args.labels, scheme, args.max_codes, spill_dir=args.spill_dir)
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        WRITERS[args.format](join, out)
+    except OSError as e:
+        print(f"student_join: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if join.spilled:
+        print(f"student_join: more than {args.max_codes} codes, joined on disk", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
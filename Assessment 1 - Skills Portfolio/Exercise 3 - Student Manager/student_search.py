@@ -0,0 +1,188 @@
+# Student Manager - Search As You Type
+# Prefix lookup for the live search box: the students whose code or
+# (case-insensitive) name starts with what has been typed so far.
+#
+# Matches follow View Individual's rules: the same code and lower-case name
+# keys as StudentStore.find(), and each key gives the first student (in file
+# order) that has it. The student find() would return for the whole term
+# comes first, then code matches in code order, then name matches in
+# alphabetical order.
+#
+# The index is the sorted lists of distinct codes and names, so a prefix is a
+# bisect followed by a walk over just the matches wanted, whatever the cohort
+# size. Queries run on a SearchWorker thread; a newer query cancels the one
+# still running, and matches are handed over in small batches so the GUI can
+# show them as they arrive. A text-file store is shared with the GUI thread,
+# so the GUI holds SearchWorker.lock (see paused()) while it changes the store.
+import contextlib
+import queue
+import threading
+from bisect import bisect_left, insort
+
+# Matches shown in the live search list
+DEFAULT_LIMIT = 50
+# Matches handed to the GUI at a time
+SEARCH_BATCH = 10
+
+
+class PrefixIndex:
+    """Sorted distinct codes and lower-case names, searched by prefix."""
+    def __init__(self, codes=(), names=()):
+        self.codes = sorted(codes)
+        self.names = sorted(names)
+
+    def add(self, code, name):
+        """Indexes a new or changed student's keys; keys already indexed are ignored."""
+        for keys, key in ((self.codes, code), (self.names, name.lower())):
+            i = bisect_left(keys, key)
+            if i == len(keys) or keys[i] != key:
+                insort(keys, key, lo=i)
+
+    def __len__(self):
+        return len(self.codes) + len(self.names)
+
+    @staticmethod
+    def _starting_with(keys, prefix):
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            yield keys[i]
+            i += 1
+
+    def codes_starting_with(self, prefix):
+        return self._starting_with(self.codes, prefix)
+
+    def names_starting_with(self, prefix):
+        return self._starting_with(self.names, prefix.lower())
+
+
+def prefix_find(store, index, search_term, limit=DEFAULT_LIMIT):
+    """Yields up to limit students from a store whose code or name starts with the search term."""
+    term = search_term.strip().lower()
+    if not term or limit <= 0:
+        return
+    seen = set()
+    exact = store.find(term)
+    if exact is not None:
+        seen.add(id(exact))
+        yield exact
+    for keys, lookup in ((index.codes_starting_with(term), store.get),
+                         (index.names_starting_with(term), store.find)):
+        for key in keys:
+            if len(seen) >= limit:
+                return
+            student = lookup(key)
+            # Keys of deleted or renamed students stay in the index, so skip any that are gone
+            if student is not None and id(student) not in seen:
+                seen.add(id(student))
+                yield student
+
+
+class SearchWorker:
+    """Runs live-search queries for one store on a background thread.
+
+    submit() replaces whatever query is pending or running; the worker checks
+    between matches and drops a query as soon as a newer one arrives. Results
+    are posted as (generation, students, finished) tuples that the GUI reads
+    with take(), ignoring any from an older generation.
+
+    The worker reads the store only while holding lock, so code that changes
+    the store from another thread wraps the change in paused().
+    """
+    def __init__(self, store, limit=DEFAULT_LIMIT):
+        self.store = store
+        self.limit = limit
+        self.generation = 0
+        self._term = None
+        self._closed = False
+        self._wake = threading.Condition()
+        self._results = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="student-search", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def submit(self, term):
+        """Queues a query for term and returns its generation number."""
+        with self._wake:
+            self.generation += 1
+            self._term = term
+            self._wake.notify()
+            return self.generation
+
+    def cancel(self):
+        """Drops the pending query and stops the running one without starting another."""
+        with self._wake:
+            self.generation += 1
+            self._term = None
+
+    @contextlib.contextmanager
+    def paused(self):
+        """Stops the running query and keeps the worker off the store until the block exits.
+
+        A query stops at its next match; building the index on startup cannot be
+        interrupted, so the first edit may wait for it.
+        """
+        self.cancel()
+        with self.lock:
+            yield
+
+    def close(self):
+        with self._wake:
+            self._closed = True
+            self.generation += 1
+            self._wake.notify()
+
+    def take(self):
+        """Returns the batches posted since the last call, oldest first."""
+        batches = []
+        while True:
+            try:
+                batches.append(self._results.get_nowait())
+            except queue.Empty:
+                return batches
+
+    def _next_query(self):
+        with self._wake:
+            while self._term is None and not self._closed:
+                self._wake.wait()
+            term, self._term = self._term, None
+            return self.generation, term
+
+    def _run(self):
+        # SQLite connections belong to the thread that opened them
+        store = self.store.for_thread()
+        try:
+            # Build the index now rather than on the first keystroke
+            with self.lock:
+                store.prefix_find("", 0)
+            while True:
+                generation, term = self._next_query()
+                if self._closed:
+                    return
+                self._query(store, generation, term)
+        finally:
+            if store is not self.store:
+                store.close()
+
+    def _query(self, store, generation, term):
+        with self.lock:
+            self._query_locked(store, generation, term)
+
+    def _query_locked(self, store, generation, term):
+        batch = []
+        try:
+            for student in store.prefix_find(term, self.limit):
+                if self.generation != generation:
+                    # A newer query has been submitted; nobody wants these results
+                    return
+                batch.append(student)
+                if len(batch) == SEARCH_BATCH:
+                    self._results.put((generation, batch, False))
+                    batch = []
+        except Exception as e:
+            # Report the failure to the GUI instead of killing the worker
+            self._results.put((generation, e, True))
+            return
+        self._results.put((generation, batch, True))
@@ -0,0 +1,343 @@
+# Student Manager - HTTP Query Service
+# Serves the Student Manager queries as JSON over HTTP on localhost, so marks
+# can be looked up without running the Tk app.
+#
+# Usage (from this folder):
+#   python -m student_server                                # resources/studentMarks.txt on 127.0.0.1:8765
+#   python -m student_server --file cohort.txt --port 9000
+#
+# Endpoints (GET only):
+#   /students?page=1&per_page=100   every student, a page at a time (per_page up to MAX_PER_PAGE)
+#   /students/<code>                one student by code
+#   /search?q=<code or name>        the first student whose code or name matches (as View Individual)
+#   /highest, /lowest               the student with the highest or lowest overall total
+#   /summary                        count, average percentage, highest and lowest
+#   /stats                          response cache and reload counters
+#
+# One asyncio event loop serves every connection (HTTP/1.1 keep-alive) and the
+# cohort is loaded once and shared by all requests. Responses are cached as
+# encoded bytes in an LRU keyed by path and query, so a repeated query is a
+# dictionary hit. The LRU is bounded by the bytes of the bodies it holds, not
+# the number of responses, as one full page of students is thousands of times
+# the size of a single record. The file's modification time and size are checked at most
+# every STAT_INTERVAL seconds; a change reloads the file on a worker thread
+# (the old data keeps being served meanwhile) and empties the cache.
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from student_core import FILE_PATH, LoadStats, StudentStore
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Pending connections the listening socket queues; high enough for a burst of 1,000 clients
+BACKLOG = 2048
+# Seconds between checks of the marks file for changes
+STAT_INTERVAL = 0.5
+# Total bytes of encoded response bodies kept in the LRU cache
+RESPONSE_CACHE_BYTES = 64 * 1024 * 1024
+# Bodies larger than this are sent but never cached, so a few huge pages cannot flush the small ones
+MAX_CACHED_BODY = 1024 * 1024
+DEFAULT_PER_PAGE = 100
+MAX_PER_PAGE = 1000
+# Largest request head (request line and headers) accepted
+MAX_HEAD_BYTES = 16 * 1024
+# Seconds an idle keep-alive connection is held open
+IDLE_TIMEOUT = 30
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           431: "Request Header Fields Too Large", 503: "Service Unavailable"}
+
+
+class ResponseCache:
+    """LRU of (status, body bytes) by request key, holding at most maxbytes of bodies.
+
+    Bodies over max_body bytes are not cached. The cache is emptied whenever
+    the data is reloaded.
+    """
+    def __init__(self, maxbytes=RESPONSE_CACHE_BYTES, max_body=MAX_CACHED_BODY):
+        self.maxbytes = maxbytes
+        self.max_body = min(max_body, maxbytes)
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Responses too large to cache
+        self.uncached = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        size = len(entry[1])
+        if size > self.max_body:
+            self.uncached += 1
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= len(old[1])
+        self._entries[key] = entry
+        self.bytes += size
+        # Evict least recently used entries until the bodies fit again
+        while self.bytes > self.maxbytes:
+            _, (_, body) = self._entries.popitem(last=False)
+            self.bytes -= len(body)
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'size': len(self._entries), 'bytes': self.bytes, 'maxbytes': self.maxbytes,
+                'uncached': self.uncached, 'hits': self.hits,
+                'misses': self.misses, 'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0}
+
+
+# --- Data ---
+def load_store(path):
+    """Loads a marks file into a StudentStore, graded with the configured default scheme."""
+    stats = LoadStats()
+    store = StudentStore.from_file(path, stats)
+    from student_grading import SCHEMES_PATH, STANDARD, load_schemes
+    if store and os.path.exists(SCHEMES_PATH):
+        try:
+            schemes, default = load_schemes()
+        except ValueError as e:
+            print(f"student_server: {e}; using the standard grading", file=sys.stderr)
+        else:
+            if default != STANDARD.name:
+                store.regrade(schemes[default])
+    # Build the lookup indexes and summary now, off the event loop, rather than on the first request
+    store.summary
+    return store, stats
+
+
+def _file_state(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CohortSource:
+    """The loaded cohort, reloaded in the background when the marks file changes."""
+    def __init__(self, path, cache):
+        self.path = path
+        self.cache = cache
+        self.state = _file_state(path)
+        self.store, self.stats = load_store(path)
+        self.reloads = 0
+        self._checked = time.monotonic()
+        self._reloading = None
+
+    def current(self):
+        """Returns the store to answer from, starting a reload if the file has changed."""
+        now = time.monotonic()
+        if now - self._checked >= STAT_INTERVAL and self._reloading is None:
+            self._checked = now
+            try:
+                state = _file_state(self.path)
+            except OSError:
+                # The file is being replaced or was removed; keep serving what was loaded
+                state = self.state
+            if state != self.state:
+                self._reloading = asyncio.get_running_loop().create_task(self._reload(state))
+        return self.store
+
+    async def _reload(self, state):
+        try:
+            store, stats = await asyncio.get_running_loop().run_in_executor(None, load_store, self.path)
+        except OSError as e:
+            print(f"student_server: could not reload '{self.path}': {e}", file=sys.stderr)
+        else:
+            self.store, self.stats, self.state = store, stats, state
+            self.cache.clear()
+            self.reloads += 1
+        finally:
+            self._reloading = None
+
+
+# --- Queries ---
+def _student_or_404(student, message):
+    if student is None:
+        return 404, {'error': message}
+    return 200, student.to_dict()
+
+
+def list_students(store, query):
+    try:
+        page = int(query.get('page', 1))
+        per_page = int(query.get('per_page', DEFAULT_PER_PAGE))
+    except ValueError:
+        return 400, {'error': "page and per_page must be whole numbers."}
+    if page < 1 or not 1 <= per_page <= MAX_PER_PAGE:
+        return 400, {'error': f"page must be at least 1 and per_page between 1 and {MAX_PER_PAGE}."}
+    total = len(store)
+    start = (page - 1) * per_page
+    return 200, {'page': page, 'per_page': per_page, 'total': total,
+                 'pages': max(1, -(-total // per_page)),
+                 'students': [s.to_dict() for s in store.students[start:start + per_page]]}
+
+
+def summary(store, query):
+    result = store.summary
+    return 200, {'count': result.count, 'average_percentage': round(result.average_percentage, 2),
+                 'highest': result.highest.to_dict() if result.highest else None,
+                 'lowest': result.lowest.to_dict() if result.lowest else None,
+                 'scheme': store.scheme.name if store.scheme else "standard"}
+
+
+def search(store, query):
+    term = query.get('q', '').strip()
+    if not term:
+        return 400, {'error': "Give a student code or name as ?q=..."}
+    return _student_or_404(store.find(term), f"No student matches '{term}'.")
+
+
+ROUTES = {
+    '/students': list_students,
+    '/search': search,
+    '/highest': lambda store, query: _student_or_404(store.highest(), "There are no students."),
+    '/lowest': lambda store, query: _student_or_404(store.lowest(), "There are no students."),
+    '/summary': summary,
+}
+
+
+# --- Server ---
+class StudentServer:
+    """Answers HTTP requests for one marks file."""
+    def __init__(self, path, cache_bytes=RESPONSE_CACHE_BYTES):
+        self.cache = ResponseCache(cache_bytes)
+        self.source = CohortSource(path, self.cache)
+        self.requests = 0
+        self.connections = 0
+
+    def respond(self, target):
+        """Returns (status, body bytes) for a GET of target, from the cache when possible."""
+        store = self.source.current()
+        parts = urlsplit(target)
+        path = unquote(parts.path).rstrip('/') or '/'
+        query = dict(parse_qsl(parts.query))
+        if path == '/stats':
+            return 200, json.dumps(self.stats_dict()).encode('utf-8')
+        key = (path, tuple(sorted(query.items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        route = ROUTES.get(path)
+        if route is not None:
+            status, result = route(store, query)
+        elif path.startswith('/students/'):
+            code = path[len('/students/'):]
+            status, result = _student_or_404(store.get(code), f"No student has the code '{code}'.")
+        else:
+            status, result = 404, {'error': f"Unknown path '{path}'.", 'paths': sorted(ROUTES)}
+        response = status, json.dumps(result, ensure_ascii=False).encode('utf-8')
+        self.cache.put(key, response)
+        return response
+
+    def stats_dict(self):
+        return {'file': self.source.path, 'students': len(self.source.store),
+                'skipped_lines': self.source.stats.skipped, 'reloads': self.source.reloads,
+                'requests': self.requests, 'connections': self.connections,
+                'cache': self.cache.stats()}
+
+    async def handle(self, reader, writer):
+        """Serves one connection until the client closes it, asks to, or stays idle too long."""
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    self._write(writer, 431, b'{"error": "Request head too large."}', False)
+                    return
+                status, body, keep_alive = self._handle_head(head)
+                self._write(writer, status, body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _handle_head(self, head):
+        """Returns (status, body, keep alive) for one request head."""
+        self.requests += 1
+        lines = head.decode('latin-1').split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            return 400, b'{"error": "Malformed request line."}', False
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        # HTTP/1.1 connections stay open unless the client says otherwise; 1.0 the reverse
+        connection = headers.get('connection', '')
+        keep_alive = connection == 'keep-alive' if version == "HTTP/1.0" else connection != 'close'
+        if method != "GET":
+            # A request body is never read, so the connection cannot be reused
+            return 405, b'{"error": "Only GET is supported."}', False
+        status, body = self.respond(target)
+        return status, body, keep_alive
+
+    @staticmethod
+    def _write(writer, status, body, keep_alive):
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body)
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        """Serves until cancelled; ready (if given) is called with the bound port once listening."""
+        server = await asyncio.start_server(self.handle, host, port, backlog=BACKLOG, limit=MAX_HEAD_BYTES)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="student_server", description="Serve student marks as JSON over HTTP.")
+    parser.add_argument("--file", default=FILE_PATH, help="marks file to serve (default: %(default)s)")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port (default: %(default)s; 0 picks one)")
+    parser.add_argument("--cache-mb", type=int, default=RESPONSE_CACHE_BYTES // (1024 * 1024),
+                        help="megabytes of responses kept in the cache (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    try:
+        server = StudentServer(args.file, args.cache_mb * 1024 * 1024)
+    except OSError as e:
+        print(f"student_server: {e}", file=sys.stderr)
+        return 1
+
+    def ready(port):
+        # The load-test client waits for this line when it starts the server itself
+        print(f"Serving {len(server.source.store)} students from '{args.file}' on http://{args.host}:{port}/",
+              flush=True)
+
+    try:
+        asyncio.run(server.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
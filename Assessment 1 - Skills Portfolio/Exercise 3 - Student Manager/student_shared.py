@@ -0,0 +1,306 @@
+# Student Manager - Shared-Memory Analytics
+# Runs cohort statistics on every core. The marks are laid out once as int32
+# columns (c1, c2, c3, exam, overall_total) in a multiprocessing.shared_memory
+# block; pool workers attach to it by name and each analyses a range of rows
+# through zero-copy memoryview slices, so no Student objects are pickled. The
+# partial results (histograms, weighted-total counts and top-N candidates) are
+# small and are merged in the calling process.
+#
+# Inside a worker the per-row work is done by C-level builtins over the
+# slices (Counter, map, heapq.nlargest), so a partition costs a few
+# operations per row rather than a Python loop iteration.
+#
+# Usage (from this folder):
+#   python -m student_shared                              # resources/studentMarks.txt, one worker per CPU
+#   python -m student_shared big.txt --workers 4 --top 20
+import argparse
+import heapq
+import math
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from multiprocessing import get_context, shared_memory, util
+from operator import add
+
+COLUMNS = ('c1', 'c2', 'c3', 'exam', 'overall_total')
+MARK_COLUMNS = COLUMNS[:4]
+# Columns and derived totals that statistics are reported for
+STAT_COLUMNS = ('c1', 'c2', 'c3', 'exam', 'coursework_total', 'overall_total')
+TYPECODE = 'i'
+ITEM_SIZE = array(TYPECODE).itemsize
+
+HEADER = struct.Struct("<4sxxxxQ")
+MAGIC = b"MRKS"
+
+# Smaller cohorts are analysed in this process; starting workers would cost more
+PARALLEL_MIN_ROWS = 100000
+# Partitions per worker, so a slow worker does not hold up the others for long
+PARTITIONS_PER_WORKER = 4
+DEFAULT_TOP = 10
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+# --- Shared Cohort ---
+class SharedCohort:
+    """A cohort's marks as int32 columns in one shared memory block.
+
+    Row i is the i-th student in the store's iteration order. The process that
+    creates the block owns it and must close() and unlink() it; workers only
+    attach() and close().
+    """
+    def __init__(self, block):
+        self.block = block
+        magic, self.count = HEADER.unpack_from(block.buf, 0)
+        if magic != MAGIC:
+            block.close()
+            raise ValueError(f"shared memory block '{block.name}' is not a student cohort")
+        size = self.count * ITEM_SIZE
+        self.columns = {name: block.buf[HEADER.size + k * size:HEADER.size + (k + 1) * size].cast(TYPECODE)
+                        for k, name in enumerate(COLUMNS)}
+
+    @classmethod
+    def from_marks(cls, marks):
+        """Creates a block from an iterable of (c1, c2, c3, exam) tuples."""
+        # Flattened into one array, then split into columns by strided slices, all in C
+        flat = array(TYPECODE, chain.from_iterable(marks))
+        columns = [flat[k::len(MARK_COLUMNS)] for k in range(len(MARK_COLUMNS))]
+        del flat
+        c1, c2, c3, exam = columns
+        columns.append(array(TYPECODE, map(add, map(add, c1, c2), map(add, c3, exam))))
+        count = len(c1)
+        # A zero-sized block cannot be created, so an empty cohort still has its header
+        block = shared_memory.SharedMemory(create=True, size=HEADER.size + len(COLUMNS) * count * ITEM_SIZE)
+        HEADER.pack_into(block.buf, 0, MAGIC, count)
+        offset = HEADER.size
+        for column in columns:
+            block.buf[offset:offset + count * ITEM_SIZE] = column.tobytes()
+            offset += count * ITEM_SIZE
+        return cls(block)
+
+    @classmethod
+    def from_store(cls, store):
+        return cls.from_marks(store.iter_marks())
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name))
+
+    @property
+    def name(self):
+        return self.block.name
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        # The views must be released before the mapping can be closed
+        for view in self.columns.values():
+            view.release()
+        self.columns = {}
+        self.block.close()
+
+    def unlink(self):
+        self.block.unlink()
+
+
+# --- Partition Tasks ---
+# Each task analyses rows [start, stop) and returns a small, picklable result
+def _histograms(cohort, start, stop, params):
+    """{column: Counter of values} for the marks, coursework total and overall total."""
+    c1, c2, c3, exam, total = (cohort.columns[name][start:stop] for name in COLUMNS)
+    return {'c1': Counter(c1), 'c2': Counter(c2), 'c3': Counter(c3), 'exam': Counter(exam),
+            'coursework_total': Counter(map(add, map(add, c1, c2), c3)), 'overall_total': Counter(total)}
+
+
+def _weighted_totals(cohort, start, stop, scheme):
+    """Counter of each student's weighted, capped total under a grading scheme."""
+    marks = [cohort.columns[name][start:stop] for name in MARK_COLUMNS]
+    t1, t2, t3, te = scheme.contributions
+    # The lookup tables only cover marks inside the brief's ranges
+    if stop > start and all(0 <= min(column) and max(column) < len(table)
+                            for column, table in zip(marks, scheme.contributions)):
+        c1, c2, c3, exam = marks
+        return Counter(map(add, map(add, map(t1.__getitem__, c1), map(t2.__getitem__, c2)),
+                           map(add, map(t3.__getitem__, c3), map(te.__getitem__, exam))))
+    return Counter(map(scheme.total, *marks))
+
+
+def _top(cohort, start, stop, n):
+    """The n highest (overall total, -row) pairs; -row makes the earliest row win ties."""
+    return heapq.nlargest(n, zip(cohort.columns['overall_total'][start:stop], range(-start, -stop, -1)))
+
+
+TASKS = {'histograms': _histograms, 'weighted_totals': _weighted_totals, 'top': _top}
+
+# The cohort this worker process is attached to, kept between tasks
+_worker_cohort = None
+
+
+def _close_worker_cohort():
+    global _worker_cohort
+    if _worker_cohort is not None:
+        _worker_cohort.close()
+        _worker_cohort = None
+
+
+def _run_partition(task, name, start, stop, params):
+    """Pool entry point: attaches to the named cohort (once per worker) and runs one task."""
+    global _worker_cohort
+    if _worker_cohort is None or _worker_cohort.name != name:
+        if _worker_cohort is None:
+            # Pool workers skip atexit, but run multiprocessing finalizers as they exit
+            util.Finalize(None, _close_worker_cohort, exitpriority=10)
+        _close_worker_cohort()
+        # Workers are started by the owning process and share its resource tracker,
+        # so attaching here never makes a worker's exit unlink the block
+        _worker_cohort = SharedCohort.attach(name)
+    return TASKS[task](_worker_cohort, start, stop, params)
+
+
+# --- Statistics ---
+class ColumnStats:
+    """Count, mean, standard deviation, range and percentiles from a value histogram."""
+    def __init__(self, histogram):
+        self.count = sum(histogram.values())
+        self.min = min(histogram) if histogram else 0
+        self.max = max(histogram) if histogram else 0
+        total = sum(value * n for value, n in histogram.items())
+        self.mean = total / self.count if self.count else 0.0
+        variance = (sum(value * value * n for value, n in histogram.items()) / self.count - self.mean ** 2
+                    if self.count else 0.0)
+        self.sd = math.sqrt(max(variance, 0.0))
+        self.percentiles = {}
+        if self.count:
+            # Nearest-rank percentiles by walking the values in order
+            targets = [(p, max(1, math.ceil(p / 100 * self.count))) for p in PERCENTILES]
+            seen = 0
+            for value in sorted(histogram):
+                seen += histogram[value]
+                while targets and seen >= targets[0][1]:
+                    self.percentiles[targets.pop(0)[0]] = value
+
+
+class CohortStatistics:
+    """Merged results of one analysis: per-column stats, grade counts and the top rows."""
+    def __init__(self, histograms, grades, average_percentage, top, scheme_name):
+        self.columns = {name: ColumnStats(histograms[name]) for name in STAT_COLUMNS}
+        self.count = self.columns['overall_total'].count
+        self.grades = grades
+        self.average_percentage = average_percentage
+        # [(overall total, row)], highest first
+        self.top = top
+        self.scheme_name = scheme_name
+
+    def format(self, lookup=None):
+        """Formats the statistics as text; lookup(row) returns the Student for a top row, if known."""
+        header = f"{'':<17}{'mean':>8}{'sd':>8}{'min':>6}" + "".join(f"{f'p{p}':>6}" for p in PERCENTILES) + f"{'max':>6}"
+        lines = [f"--- COHORT STATISTICS ({self.count} students) ---", header]
+        for name, stats in self.columns.items():
+            lines.append(f"{name:<17}{stats.mean:8.2f}{stats.sd:8.2f}{stats.min:6}"
+                         + "".join(f"{stats.percentiles.get(p, 0):6}" for p in PERCENTILES) + f"{stats.max:6}")
+        lines.append("")
+        lines.append(f"Grades under '{self.scheme_name}' (average {self.average_percentage:.2f}%):")
+        for grade, n in self.grades.items():
+            share = n / self.count * 100 if self.count else 0
+            lines.append(f"  {grade:<6}{n:>10}  {share:6.2f}%")
+        lines.append("")
+        lines.append(f"Top {len(self.top)} by overall total:")
+        for rank, (total, row) in enumerate(self.top, start=1):
+            student = lookup(row) if lookup is not None else None
+            who = f"{student.code} {student.name}" if student is not None else f"row {row + 1}"
+            lines.append(f"  {rank:>3}. {who}: {total} / 160")
+        return "\n".join(lines)
+
+
+class ParallelAnalytics:
+    """Partitioned map/reduce analytics over SharedCohorts on a reusable process pool."""
+    def __init__(self, workers=None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._pool = None
+
+    def _map(self, cohort, task, params=None):
+        """Runs a task over every partition of the cohort and returns the partial results."""
+        count = len(cohort)
+        if self.workers == 1 or count < PARALLEL_MIN_ROWS:
+            return [TASKS[task](cohort, 0, count, params)]
+        if self._pool is None:
+            # Spawned workers start empty, so none inherits the GUI's memory or Tk state
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=get_context('spawn'))
+        parts = self.workers * PARTITIONS_PER_WORKER
+        bounds = [count * i // parts for i in range(parts + 1)]
+        futures = [self._pool.submit(_run_partition, task, cohort.name, start, stop, params)
+                   for start, stop in zip(bounds, bounds[1:])]
+        return [future.result() for future in futures]
+
+    def histograms(self, cohort):
+        merged = {name: Counter() for name in STAT_COLUMNS}
+        for partial in self._map(cohort, 'histograms'):
+            for name, histogram in partial.items():
+                merged[name].update(histogram)
+        return merged
+
+    def weighted_totals(self, cohort, scheme):
+        merged = Counter()
+        for partial in self._map(cohort, 'weighted_totals', scheme):
+            merged.update(partial)
+        return merged
+
+    def top(self, cohort, n=DEFAULT_TOP):
+        """Returns [(overall total, row)] for the n highest totals, earliest row first on ties."""
+        candidates = [pair for partial in self._map(cohort, 'top', n) for pair in partial]
+        return [(total, -negative_row) for total, negative_row in heapq.nlargest(n, candidates)]
+
+    def analyse(self, cohort, scheme=None, top=DEFAULT_TOP):
+        """Returns CohortStatistics for a cohort, graded with scheme (default: the standard grading)."""
+        from student_grading import STANDARD
+        scheme = scheme or STANDARD
+        grades = dict.fromkeys(scheme.grades, 0)
+        percentage_sum = 0.0
+        for total, n in self.weighted_totals(cohort, scheme).items():
+            if 0 <= total <= scheme.max_total:
+                percentage, grade = scheme.percentages[total], scheme.table[total]
+            else:
+                percentage = (total / scheme.max_total) * 100
+                grade = scheme.grade_for_percentage(percentage)
+            grades[grade] += n
+            percentage_sum += percentage * n
+        average = percentage_sum / len(cohort) if len(cohort) else 0.0
+        return CohortStatistics(self.histograms(cohort), grades, average, self.top(cohort, top), scheme.name)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def main(argv=None):
+    from student_core import FILE_PATH, LoadStats, StudentStore
+    parser = argparse.ArgumentParser(prog="student_shared", description="Cohort statistics on every core.")
+    parser.add_argument("file", nargs="?", default=FILE_PATH, help="marks file (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: one per CPU, %(default)s)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="students listed by total")
+    args = parser.parse_args(argv)
+
+    try:
+        store = StudentStore.from_file(args.file, LoadStats())
+    except OSError as e:
+        print(f"student_shared: {e}", file=sys.stderr)
+        return 1
+    cohort = SharedCohort.from_store(store)
+    analytics = ParallelAnalytics(args.workers)
+    try:
+        print(analytics.analyse(cohort, top=args.top).format(store.students.__getitem__))
+    finally:
+        analytics.close()
+        cohort.close()
+        cohort.unlink()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+# Student Manager - Out-of-Core Sorting and Leaderboards
+# Ranks every student in a marks file by overall total, exam mark, coursework
+# total or name, with percentiles, in bounded memory however large the file is.
+#
+# Usage (from this folder):
+#   python -m student_sort resources/studentMarks.txt
+#   python -m student_sort huge.txt --by exam --format csv -o ranking.csv --memory-mb 256
+#   python -m student_sort huge.txt --top 20
+#   python -m student_sort huge.txt --percentiles
+#
+# External merge sort: the file is read in chunks that fit the memory cap, each
+# chunk is sorted and spilled to a temporary run file, and the runs are k-way
+# merged with heapq.merge (in several passes if there are more than
+# MERGE_FAN_IN). Every spilled line is an order-preserving sort key followed by
+# the original record, so sorting and merging only compare plain strings and
+# just the final output is parsed into Students. Percentiles come from a
+# histogram of the key built in the same pass; --top keeps a heap of the best
+# records instead of sorting everything.
+import argparse
+import csv
+import heapq
+import json
+import os
+import sys
+import tempfile
+from collections import Counter
+
+from student_core import LoadStats, parse_line
+
+# Sort keys: numeric keys rank the highest first, names from A to Z
+SORT_KEYS = ('overall_total', 'exam', 'coursework_total', 'name')
+NUMERIC_KEYS = ('overall_total', 'exam', 'coursework_total')
+
+# Memory for the records being sorted before a run is spilled
+DEFAULT_MEMORY_MB = 256
+# Runs merged at once; more than this are merged in several passes
+MERGE_FAN_IN = 64
+# Read buffer per run while merging (MERGE_FAN_IN of these are open at once)
+RUN_BUFFER = 256 * 1024
+# Cohort percentiles shown by --percentiles and in the report footer
+PERCENTILE_POINTS = (1, 10, 25, 50, 75, 90, 99)
+
+# Numeric keys are spilled as (offset - value), zero-padded, so higher values sort first as text
+_KEY_OFFSET = 10 ** 19
+_KEY_LIMIT = 10 ** 18
+# Separates the sort key from the record; sorts before every other character
+_SEPARATOR = "\x00"
+
+
+# --- Percentiles ---
+def percentile_table(histogram):
+    """Returns {value: percentile rank} for a Counter of key values.
+
+    A value's percentile rank is the share of the cohort below it plus half
+    of those equal to it, as a percentage.
+    """
+    total = sum(histogram.values())
+    table = {}
+    below = 0
+    for value in sorted(histogram):
+        count = histogram[value]
+        table[value] = (below + count / 2) / total * 100
+        below += count
+    return table
+
+
+def cohort_percentiles(histogram, points=PERCENTILE_POINTS):
+    """Returns [(p, value)]: the key value at each percentile (nearest rank) of a Counter of key values."""
+    total = sum(histogram.values())
+    if not total:
+        return []
+    results = []
+    values = iter(sorted(histogram.items()))
+    seen = 0
+    value = None
+    for p in sorted(points):
+        # Nearest rank: the smallest value with at least p% of the cohort at or below it
+        needed = max(1, -(-p * total // 100))
+        while seen < needed:
+            value, count = next(values)
+            seen += count
+        results.append((p, value))
+    return results
+
+
+# --- External Merge Sort ---
+class ExternalSorter:
+    """Sorts an iterable of single-line strings in bounded memory, spilling sorted runs to disk."""
+    def __init__(self, memory_bytes=DEFAULT_MEMORY_MB * 1024 * 1024, spill_dir=None, fan_in=MERGE_FAN_IN):
+        self.memory_bytes = memory_bytes
+        self.spill_dir = spill_dir
+        self.fan_in = max(2, fan_in)
+        self.runs = 0
+        self.merge_passes = 0
+
+    def sort(self, entries):
+        """Yields the entries (which must not contain newlines) in sorted order."""
+        with tempfile.TemporaryDirectory(prefix="student_sort_", dir=self.spill_dir) as spill_dir:
+            runs = self._spill(entries, spill_dir)
+            if len(runs) == 1 and isinstance(runs[0], list):
+                # Everything fitted in memory, so nothing was written
+                yield from runs[0]
+                return
+            while len(runs) > self.fan_in:
+                self.merge_passes += 1
+                runs = [self._merge_to_file(runs[i:i + self.fan_in], spill_dir)
+                        for i in range(0, len(runs), self.fan_in)]
+            self.merge_passes += 1
+            yield from heapq.merge(*(_read_run(path) for path in runs))
+
+    def _spill(self, entries, spill_dir):
+        """Writes sorted runs of at most memory_bytes; returns their paths (or [list] if one run fits)."""
+        runs = []
+        chunk = []
+        used = 0
+        # A str of n ASCII characters takes 49 + n bytes, plus 8 for the list slot
+        for entry in entries:
+            chunk.append(entry)
+            used += 57 + len(entry)
+            if used >= self.memory_bytes:
+                chunk.sort()
+                runs.append(self._write_run(chunk, spill_dir))
+                chunk = []
+                used = 0
+        chunk.sort()
+        if not runs:
+            self.runs = 1
+            return [chunk]
+        if chunk:
+            runs.append(self._write_run(chunk, spill_dir))
+        return runs
+
+    def _write_run(self, lines, spill_dir):
+        self.runs += 1
+        path = os.path.join(spill_dir, f"run{self.runs}.txt")
+        with open(path, 'w', encoding='utf-8', newline='\n', buffering=RUN_BUFFER) as f:
+            f.write("\n".join(lines))
+            f.write("\n")
+        return path
+
+    def _merge_to_file(self, paths, spill_dir):
+        path = os.path.join(spill_dir, f"pass{self.merge_passes}_{os.path.basename(paths[0])}")
+        with open(path, 'w', encoding='utf-8', newline='\n', buffering=RUN_BUFFER) as f:
+            f.writelines(f"{entry}\n" for entry in heapq.merge(*(_read_run(p) for p in paths)))
+        for p in paths:
+            os.remove(p)
+        return path
+
+
+def _read_run(path):
+    """Yields the entries of a run file without their newlines.
+
+    Comparing whole lines would be wrong: a newline sorts after characters
+    such as tab, so "a\n" would come after "a\tb" although "a" comes first.
+    """
+    with open(path, encoding='utf-8', newline='\n', buffering=RUN_BUFFER) as f:
+        for line in f:
+            yield line[:-1]
+
+
+# --- Leaderboards ---
+class Leaderboard:
+    """Ranks the students in one marks file by a sort key.
+
+    rankings() yields (rank, percentile, Student) with standard competition
+    ranks (equal keys share a rank: 1, 2, 2, 4). percentile is the key's
+    percentile rank in the cohort, or None when ranking by name. Raises
+    OSError if the file cannot be read.
+    """
+    def __init__(self, path, by='overall_total', memory_bytes=DEFAULT_MEMORY_MB * 1024 * 1024,
+                 spill_dir=None, fan_in=MERGE_FAN_IN):
+        if by not in SORT_KEYS:
+            raise ValueError(f"Cannot rank by '{by}'; choose from {', '.join(SORT_KEYS)}.")
+        self.path = path
+        self.by = by
+        self.sorter = ExternalSorter(memory_bytes, spill_dir, fan_in)
+        self.stats = LoadStats()
+        # Counter of key values, filled as the file is read (numeric keys only)
+        self.histogram = None
+
+    def _entries(self):
+        """Yields 'sort key<SEPARATOR>record' for each valid line, counting the histogram and skips."""
+        by = self.by
+        stats = self.stats = LoadStats()
+        histogram = self.histogram = Counter() if by in NUMERIC_KEYS else None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            header = f.readline()
+            if not header:
+                stats.empty = True
+                return
+            try:
+                stats.header_count = int(header.strip())
+            except ValueError:
+                stats.header_count = None
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                parts = line.split(',')
+                # Same checks as parse_line, so both accept the same lines
+                try:
+                    if len(parts) != 6:
+                        raise ValueError
+                    c1, c2, c3, exam = int(parts[2]), int(parts[3]), int(parts[4]), int(parts[5])
+                except ValueError:
+                    stats.skipped += 1
+                    continue
+                if histogram is None:
+                    stats.loaded += 1
+                    yield f"{parts[1].strip().casefold().replace(_SEPARATOR, '')}{_SEPARATOR}{line}"
+                    continue
+                if by == 'exam':
+                    value = exam
+                elif by == 'coursework_total':
+                    value = c1 + c2 + c3
+                else:
+                    value = c1 + c2 + c3 + exam
+                # Marks this far out of range cannot be written as a fixed-width key
+                if not -_KEY_LIMIT < value < _KEY_LIMIT:
+                    stats.skipped += 1
+                    continue
+                stats.loaded += 1
+                histogram[value] += 1
+                yield f"{_KEY_OFFSET - value:020d}{_SEPARATOR}{line}"
+
+    def rankings(self, top=None):
+        """Yields (rank, percentile, Student) for every student, or only the first top."""
+        if top is not None:
+            # A heap of the top entries in one pass; no spilling needed
+            entries = heapq.nsmallest(top, self._entries())
+        else:
+            entries = self.sorter.sort(self._entries())
+        return self._ranked(entries)
+
+    def _ranked(self, entries):
+        numeric = self.by in NUMERIC_KEYS
+        table = None
+        previous = None
+        rank = percentile = None
+        for position, entry in enumerate(entries, start=1):
+            prefix, record = entry.split(_SEPARATOR, 1)
+            if not numeric:
+                rank = position
+            elif prefix != previous:
+                # The histogram is complete once the first sorted entry exists
+                if table is None:
+                    table = percentile_table(self.histogram)
+                rank = position
+                previous = prefix
+                percentile = table[_KEY_OFFSET - int(prefix)]
+            yield rank, percentile, parse_line(record)
+
+    def percentiles(self, points=PERCENTILE_POINTS):
+        """Returns [(p, value)] for the key's cohort percentiles, reading the file if not ranked yet."""
+        if self.by not in NUMERIC_KEYS:
+            return []
+        if self.histogram is None:
+            for _ in self._entries():
+                pass
+        return cohort_percentiles(self.histogram, points)
+
+
+# --- Headless Export ---
+def write_text(board, rankings, out):
+    numeric = board.by in NUMERIC_KEYS
+    out.write(f"--- LEADERBOARD: {board.by.replace('_', ' ').upper()} ---\n")
+    for rank, percentile, student in rankings:
+        line = f"{rank:>7}. {student.code} {student.name}"
+        if numeric:
+            line += f": {getattr(student, board.by)} ({percentile:.1f} percentile)"
+        out.write(line + "\n")
+    out.write(format_report(board))
+
+
+def write_csv(board, rankings, out):
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(['rank', 'percentile', 'code', 'name', 'c1', 'c2', 'c3', 'exam',
+                     'coursework_total', 'overall_total', 'percentage', 'grade'])
+    for rank, percentile, student in rankings:
+        writer.writerow([rank, "" if percentile is None else round(percentile, 2),
+                         *student.to_dict().values()])
+
+
+def write_jsonl(board, rankings, out):
+    for rank, percentile, student in rankings:
+        record = {'rank': rank, 'percentile': None if percentile is None else round(percentile, 2)}
+        record.update(student.to_dict())
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+WRITERS = {'text': write_text, 'csv': write_csv, 'jsonl': write_jsonl}
+
+
+def format_report(board):
+    """Formats the record counts, sort statistics and cohort percentiles."""
+    # Reads the file first if nothing has been ranked yet, which fills in the stats
+    percentiles = board.percentiles()
+    stats = board.stats
+    lines = ["", f"Students ranked: {stats.loaded} ({stats.skipped} malformed lines skipped)",
+             f"Sorted runs: {board.sorter.runs}, merge passes: {board.sorter.merge_passes}"]
+    if percentiles:
+        lines.append(f"Cohort percentiles ({board.by}): "
+                     + ", ".join(f"P{p} {value}" for p, value in percentiles))
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="student_sort",
+                                     description="Rank the students in a marks file of any size.")
+    parser.add_argument("file", help="studentMarks.txt-format file")
+    parser.add_argument("--by", choices=SORT_KEYS, default="overall_total", help="sort key")
+    parser.add_argument("--top", type=int, metavar="N", help="only the first N students")
+    parser.add_argument("--percentiles", action="store_true",
+                        help="only print the cohort percentiles (one pass, no sorting)")
+    parser.add_argument("-f", "--format", choices=tuple(WRITERS), default="text")
+    parser.add_argument("-o", "--output", help="write to this file instead of stdout")
+    parser.add_argument("--memory-mb", type=float, default=DEFAULT_MEMORY_MB,
+                        help="memory for sorting before runs are spilled to disk (default: %(default)s)")
+    parser.add_argument("--spill-dir", help="folder for temporary run files")
+    args = parser.parse_args(argv)
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be at least 1")
+
+    board = Leaderboard(args.file, args.by, int(args.memory_mb * 1024 * 1024), args.spill_dir)
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        if args.percentiles:
+            out.write(format_report(board).lstrip("\n"))
+        else:
+            WRITERS[args.format](board, board.rankings(args.top), out)
+    except OSError as e:
+        print(f"student_sort: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
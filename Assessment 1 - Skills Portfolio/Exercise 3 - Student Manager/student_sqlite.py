@@ -0,0 +1,267 @@
+# Student Manager - SQLite Storage Backend
+# Imports studentMarks.txt-format files into SQLite and answers the Student
+# Manager queries with indexed SQL instead of full scans over Python objects.
+#
+# Usage (from this folder):
+#   python -m student_sqlite import resources/studentMarks.txt resources/studentMarks.db
+#   STUDENT_MARKS_DB=resources/studentMarks.db python "student manager.py"
+#
+# SqliteStudentStore offers the same read methods as student_core.StudentStore,
+# so the GUIs can use either one. Results are streamed from cursors a batch at
+# a time, so a 10M row database never has to fit in memory.
+import argparse
+import pathlib
+import sqlite3
+import sys
+
+from student_core import LoadStats, Student, TOTAL_MAX, iter_students
+
+# Rows fetched from a cursor (or inserted during import) per batch
+BATCH_SIZE = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    code TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    c1 INTEGER NOT NULL,
+    c2 INTEGER NOT NULL,
+    c3 INTEGER NOT NULL,
+    exam INTEGER NOT NULL,
+    overall_total INTEGER NOT NULL
+)
+"""
+
+# Built after the bulk insert, which is much faster than maintaining them row by row
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_students_code ON students (code)",
+    "CREATE INDEX IF NOT EXISTS idx_students_name ON students (name_lower)",
+    "CREATE INDEX IF NOT EXISTS idx_students_total ON students (overall_total)",
+)
+
+COLUMNS = "code, name, c1, c2, c3, exam"
+
+
+def connect(db_path, read_only=False):
+    """Opens a database for writing, in WAL mode so readers are never blocked by a writer.
+
+    With read_only=True the database must already exist: a mistyped path raises
+    sqlite3.OperationalError instead of quietly creating an empty database.
+    """
+    if read_only:
+        return sqlite3.connect(pathlib.Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+    connection = sqlite3.connect(db_path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def import_text(text_path, db_path, stats=None):
+    """Replaces the students table in db_path with the records of a marks file.
+
+    The file is streamed in batches, so memory use does not grow with its size.
+    Returns the LoadStats gathered while parsing.
+    """
+    if stats is None:
+        stats = LoadStats()
+    rows = ((s.code, s.name, s.name.lower(), s.c1, s.c2, s.c3, s.exam, s.overall_total)
+            for s in iter_students(text_path, stats))
+    connection = connect(db_path)
+    try:
+        with connection:
+            connection.execute("DROP TABLE IF EXISTS students")
+            connection.execute(SCHEMA)
+            while True:
+                batch = [row for _, row in zip(range(BATCH_SIZE), rows)]
+                if not batch:
+                    break
+                connection.executemany(
+                    "INSERT INTO students (code, name, name_lower, c1, c2, c3, exam, overall_total)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+            for statement in INDEXES:
+                connection.execute(statement)
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+    return stats
+
+
+class SqliteSummary:
+    """Class summary answered by aggregate queries; mirrors student_core.Summary."""
+    def __init__(self, store, count, total_average):
+        self._store = store
+        self.count = count
+        self.average_percentage = (total_average or 0) / TOTAL_MAX * 100
+
+    @property
+    def highest(self):
+        return self._store.highest()
+
+    @property
+    def lowest(self):
+        return self._store.lowest()
+
+
+class SqliteStudentStore:
+    """Read-only student store backed by an indexed SQLite database."""
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.connection = connect(db_path, read_only=True)
+        # Fails early with sqlite3.OperationalError if the table was never imported
+        count, total_average = self.connection.execute(
+            "SELECT COUNT(*), AVG(overall_total) FROM students").fetchone()
+        self._summary = SqliteSummary(self, count, total_average)
+        # Trigram index of names for fuzzy_find, built on first use
+        self._name_index = None
+
+    def close(self):
+        self.connection.close()
+
+    def for_thread(self):
+        """Opens a second store on the same database for use by another thread."""
+        return SqliteStudentStore(self.db_path)
+
+    def _students(self, sql, params=()):
+        """Runs a query and yields Student objects, fetching BATCH_SIZE rows at a time."""
+        cursor = self.connection.execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(BATCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield Student(*row)
+        finally:
+            cursor.close()
+
+    def _first(self, sql, params=()):
+        row = self.connection.execute(sql, params).fetchone()
+        return None if row is None else Student(*row)
+
+    def __len__(self):
+        return self._summary.count
+
+    def __iter__(self):
+        return self._students(f"SELECT {COLUMNS} FROM students ORDER BY id")
+
+    def iter_marks(self):
+        """Yields (c1, c2, c3, exam) tuples straight from a cursor, without building Students."""
+        cursor = self.connection.execute("SELECT c1, c2, c3, exam FROM students")
+        try:
+            while True:
+                rows = cursor.fetchmany(BATCH_SIZE)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    @property
+    def summary(self):
+        return self._summary
+
+    def average_percentage(self):
+        return self._summary.average_percentage
+
+    def find(self, search_term):
+        """Returns the first student (in file order) whose code or name matches, or None."""
+        search_term = search_term.strip().lower()
+        return self._first(
+            f"SELECT {COLUMNS} FROM students WHERE id = ("
+            " SELECT MIN(id) FROM ("
+            "  SELECT MIN(id) AS id FROM students WHERE code = ?"
+            "  UNION ALL SELECT MIN(id) FROM students WHERE name_lower = ?))",
+            (search_term, search_term))
+
+    def fuzzy_find(self, search_term, limit=10):
+        """Returns up to limit (distance, student) pairs for names within a few typos, closest first."""
+        from student_fuzzy import NameIndex, fuzzy_find
+        if self._name_index is None:
+            cursor = self.connection.execute("SELECT DISTINCT name_lower FROM students")
+            self._name_index = NameIndex(name for (name,) in cursor)
+        return fuzzy_find(self, self._name_index, search_term, limit)
+
+    def prefix_find(self, search_term, limit=50):
+        """Returns an iterator over up to limit students whose code or name starts with the search term.
+
+        Same order as StudentStore.prefix_find: the find() match, then codes,
+        then names. Each range is read from its index and stops at limit.
+        """
+        term = search_term.strip().lower()
+        if not term or limit <= 0:
+            return iter(())
+        return self._prefix_students(term, limit)
+
+    def _prefix_students(self, term, limit):
+        # The smallest string above every string that starts with term
+        high = term[:-1] + chr(ord(term[-1]) + 1)
+        seen = set()
+        exact = self.find(term)
+        if exact is not None:
+            seen.add((exact.code, exact.name, exact.c1, exact.c2, exact.c3, exact.exam))
+            yield exact
+        for column in ("code", "name_lower"):
+            # MIN(id) per key is the first student with it, as find() and get() return
+            cursor = self.connection.execute(
+                f"SELECT {COLUMNS} FROM students WHERE id IN ("
+                f" SELECT MIN(id) FROM students WHERE {column} >= ? AND {column} < ?"
+                f" GROUP BY {column} ORDER BY {column} LIMIT ?) ORDER BY {column}",
+                (term, high, limit))
+            try:
+                for row in cursor:
+                    if len(seen) >= limit:
+                        return
+                    if row not in seen:
+                        seen.add(row)
+                        yield Student(*row)
+            finally:
+                cursor.close()
+
+    def get(self, code):
+        """Returns the student with this exact code, or None."""
+        return self._first(f"SELECT {COLUMNS} FROM students WHERE code = ? ORDER BY id LIMIT 1",
+                           (str(code).strip(),))
+
+    def highest(self):
+        """Returns the student with the highest overall total (first on ties)."""
+        return self._first(
+            f"SELECT {COLUMNS} FROM students"
+            " WHERE overall_total = (SELECT MAX(overall_total) FROM students) ORDER BY id LIMIT 1")
+
+    def lowest(self):
+        """Returns the student with the lowest overall total (first on ties)."""
+        return self._first(
+            f"SELECT {COLUMNS} FROM students"
+            " WHERE overall_total = (SELECT MIN(overall_total) FROM students) ORDER BY id LIMIT 1")
+
+    def between(self, low_percentage, high_percentage):
+        """Streams students whose overall percentage is within the inclusive range, highest first."""
+        low_total = low_percentage * TOTAL_MAX / 100
+        high_total = high_percentage * TOTAL_MAX / 100
+        return self._students(
+            f"SELECT {COLUMNS} FROM students WHERE overall_total BETWEEN ? AND ?"
+            " ORDER BY overall_total DESC, id", (low_total, high_total))
+
+
+# --- Command Line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="student_sqlite",
+                                     description="Manage SQLite copies of student marks files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="import a marks file into a database")
+    import_parser.add_argument("text_path")
+    import_parser.add_argument("db_path")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = import_text(args.text_path, args.db_path)
+    except (OSError, sqlite3.Error) as e:
+        print(f"student_sqlite: import failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Imported {stats.loaded} students into '{args.db_path}' ({stats.skipped} malformed lines skipped).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
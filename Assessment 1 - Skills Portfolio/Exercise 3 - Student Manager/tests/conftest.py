@@ -0,0 +1,8 @@
+# The Student Manager modules are flat files in the folder above, imported by name
+import os
+import sys
+
+EXERCISE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, EXERCISE)
+# The joke modules (joke_ingest, joke_server) are flat files in the Exercise 2 folder next to it
+sys.path.insert(1, os.path.join(os.path.dirname(EXERCISE), "Exercise 2 - Alexa tell me a Joke"))
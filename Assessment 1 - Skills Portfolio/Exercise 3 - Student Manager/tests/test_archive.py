@@ -0,0 +1,76 @@
+# Tests for student_archive: a packed archive must answer get() and the summary as the text file does
+import random
+
+import pytest
+
+from student_archive import ArchiveStudentStore, pack, unpack
+from student_core import LoadStats, StudentStore
+
+
+def fields(student):
+    return None if student is None else (student.code, student.name, student.c1, student.c2, student.c3,
+                                         student.exam, student.percentage, student.grade)
+
+
+@pytest.fixture(scope="module")
+def marks_file(tmp_path_factory):
+    rng = random.Random(45)
+    # Codes of different lengths sort as text ('100' < '99'), and some codes repeat
+    codes = [str(rng.randrange(10, 5000)) for _ in range(800)]
+    lines = [f"{code},Student {i},{rng.randrange(21)},{rng.randrange(21)},{rng.randrange(21)},{rng.randrange(101)}"
+             for i, code in enumerate(codes)]
+    lines.insert(100, "bad line")
+    lines.insert(200, "1,Bad,a,1,1,1")
+    path = tmp_path_factory.mktemp("archive") / "marks.txt"
+    path.write_text("798\n" + "\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture(scope="module", params=['zlib', 'lzma'])
+def archive(marks_file, tmp_path_factory, request):
+    path = str(tmp_path_factory.mktemp("packed") / "marks.mka")
+    # Small blocks, so codes are split over block boundaries
+    stats = pack(marks_file, path, request.param, block_bytes=300)
+    assert (stats.loaded, stats.skipped, stats.header_count) == (800, 2, 798)
+    return path
+
+
+def test_get_matches_the_text_store(marks_file, archive):
+    text = StudentStore.from_file(marks_file)
+    codes = {student.code for student in text}
+    probes = sorted(codes) + ["0", "09", "10 ", " 4999", "5000", "99999", "abc", ""]
+    for code in probes:
+        packed = ArchiveStudentStore(archive)
+        try:
+            # The first student with a code in the file, decompressing at most one block
+            assert fields(packed.get(code)) == fields(text.get(code))
+            assert packed.blocks_read <= 1
+        finally:
+            packed.close()
+
+
+def test_summary_comes_from_the_footer(marks_file, archive):
+    text = StudentStore.from_file(marks_file, LoadStats())
+    packed = ArchiveStudentStore(archive)
+    try:
+        summary = packed.summary
+        assert len(packed) == summary.count == text.summary.count == 800
+        assert summary.average_percentage == pytest.approx(text.summary.average_percentage)
+        assert fields(packed.highest()) == fields(text.highest())
+        assert fields(packed.lowest()) == fields(text.lowest())
+        assert (summary.header_count, summary.skipped) == (798, 2)
+        assert packed.blocks_read == 0
+        # The same students, highest first; equal totals are in archive order rather than file order
+        found = packed.between(40, 60)
+        assert sorted(map(fields, found)) == sorted(map(fields, text.between(40, 60)))
+        assert [s.overall_total for s in found] == sorted((s.overall_total for s in found), reverse=True)
+    finally:
+        packed.close()
+
+
+def test_unpack_gives_the_records_sorted_by_code(marks_file, archive, tmp_path):
+    restored = str(tmp_path / "restored.txt")
+    assert unpack(archive, restored) == 800
+    original = [fields(s) for s in StudentStore.from_file(marks_file)]
+    # A stable sort by code: students sharing a code stay in file order
+    assert [fields(s) for s in StudentStore.from_file(restored)] == sorted(original, key=lambda f: f[0])
@@ -0,0 +1,52 @@
+# Tests for student_cli: report options and grading that match the GUI
+import json
+
+import pytest
+
+import student_cli
+
+MARKS = (
+    "3\n"
+    "1345,John Curry,8,15,7,45\n"
+    "2345,Sam Sturtivant,14,15,14,77\n"
+    "9876,Lee Scott,17,11,16,99\n"
+)
+
+
+@pytest.fixture
+def marks_file(tmp_path):
+    path = tmp_path / "studentMarks.txt"
+    path.write_text(MARKS, encoding='utf-8')
+    return str(path)
+
+
+def run_jsonl(capsys, *argv):
+    assert student_cli.main(["--format", "jsonl", *argv]) == 0
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_individual_needs_search(marks_file, capsys):
+    assert student_cli.main(["individual", marks_file]) == 2
+    assert "--search" in capsys.readouterr().err
+
+
+def test_code_filter_ignores_spaces(marks_file, capsys):
+    records = run_jsonl(capsys, "all", "--code", " 2345 ", marks_file)
+    assert [r['code'] for r in records if r['type'] == 'student'] == ["2345"]
+
+
+def test_top_lists_some_but_summarises_all(marks_file, capsys):
+    records = run_jsonl(capsys, "all", "--top", "1", marks_file)
+    assert [r['code'] for r in records if r['type'] == 'student'] == ["9876"]
+    summary = [r for r in records if r['type'] == 'summary'][0]
+    assert summary['count'] == 3
+
+
+def test_config_default_scheme_is_applied(marks_file, tmp_path, capsys):
+    schemes = tmp_path / "grading_schemes.json"
+    schemes.write_text(json.dumps({"default": "honours", "schemes": {"honours": {
+        "bands": [["First", 70], ["2:1", 60], ["2:2", 50], ["Third", 40], ["Fail", 0]]}}}), encoding='utf-8')
+    records = run_jsonl(capsys, "highest", "--schemes", str(schemes), marks_file)
+    assert records[-1]['grade'] == "First"
+    records = run_jsonl(capsys, "highest", "--schemes", str(schemes), "--scheme", "standard", marks_file)
+    assert records[-1]['grade'] == "A"
@@ -0,0 +1,103 @@
+# Tests for student_core.StudentStore: edits keep lookups and the summary right without needless rebuilds
+import threading
+import time
+
+import pytest
+
+from student_core import Student, StudentStore
+
+ROWS = [("1345", "John Curry", 8, 15, 7, 45), ("2345", "Sam Sturtivant", 14, 15, 14, 77),
+        ("9876", "Lee Scott", 17, 11, 16, 99), ("3000", "John Curry", 1, 2, 3, 4)]
+
+
+def make_store():
+    return StudentStore(Student(*row) for row in ROWS)
+
+
+def count_rebuilds(store, monkeypatch):
+    rebuilds = []
+    original = store._rebuild
+    monkeypatch.setattr(store, '_rebuild', lambda: (rebuilds.append(1), original()))
+    return rebuilds
+
+
+def assert_matches_fresh(store):
+    """Every lookup and the summary agree with a store built from scratch from the same list."""
+    fresh = StudentStore(store.students)
+    for student in fresh:
+        assert store.get(student.code) is fresh.get(student.code)
+        assert store.find(student.name) is fresh.find(student.name)
+    assert store.summary.count == fresh.summary.count
+    assert store.summary.average_percentage == pytest.approx(fresh.summary.average_percentage)
+    assert store.highest() is fresh.highest()
+    assert store.lowest() is fresh.lowest()
+
+
+def test_mark_edits_never_rebuild(monkeypatch):
+    store = make_store()
+    rebuilds = count_rebuilds(store, monkeypatch)
+    store.update("9876", exam=10)
+    store.update("1345", exam=100, c1=20)
+    store.update("2345", name="SAM STURTIVANT")
+    assert rebuilds == []
+    assert store.highest().code == "1345" and store.lowest().code == "3000"
+    assert_matches_fresh(store)
+    assert rebuilds == []
+
+
+def test_edits_in_a_row_cost_at_most_one_rebuild(monkeypatch):
+    store = make_store()
+    rebuilds = count_rebuilds(store, monkeypatch)
+    store.delete("1345")
+    store.update("2345", code="2346")
+    store.update("9876", name="Lee Scot", exam=50)
+    store.add("5555", "New Person", 1, 2, 3, 4)
+    store.delete("3000")
+    with pytest.raises(KeyError):
+        store.update("1345", exam=1)
+    with pytest.raises(ValueError):
+        store.add("2346", "Someone", 1, 2, 3, 4)
+    assert rebuilds == []
+    assert [s.code for s in store] == ["2346", "9876", "5555"]
+    assert store.get("2346").name == "Sam Sturtivant"
+    assert len(rebuilds) == 1
+    assert_matches_fresh(store)
+
+
+def test_duplicate_names_find_the_first():
+    store = make_store()
+    store.update("1345", name="Jo Curry")
+    assert store.find("john curry").code == "3000"
+    store.update("3000", code="3001")
+    assert store.find("jo curry").code == "1345"
+    assert_matches_fresh(store)
+
+
+def test_threads_share_one_rebuild(monkeypatch):
+    # The search worker and the GUI thread may both query a stale store at once
+    store = StudentStore(Student(str(1000 + i), f"Person {i}", 1, 2, 3, i % 101) for i in range(2000))
+    store.delete("1000")
+    rebuilds = []
+    original = store._rebuild
+
+    def slow_rebuild():
+        rebuilds.append(1)
+        # Widens the window in which a second thread could start its own rebuild
+        time.sleep(0.05)
+        original()
+    monkeypatch.setattr(store, '_rebuild', slow_rebuild)
+    start = threading.Barrier(4)
+    results = []
+
+    def query(func):
+        start.wait()
+        results.append(func())
+    threads = [threading.Thread(target=query, args=(func,)) for func in
+               (lambda: store.summary.count, lambda: store.get("2999").code,
+                lambda: store.find("person 5").code, lambda: store.highest().exam)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(rebuilds) == 1
+    assert sorted(map(str, results)) == sorted(["1999", "2999", "1005", "100"])
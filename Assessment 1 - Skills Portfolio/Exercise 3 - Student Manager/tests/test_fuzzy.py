@@ -0,0 +1,80 @@
+# Tests for student_fuzzy: the trigram index must find exactly what checking every name finds
+import random
+
+import pytest
+
+from student_core import Student, StudentStore
+from student_fuzzy import NameIndex, brute_force_search, levenshtein
+
+FIRST = ["john", "jon", "joan", "sam", "samuel", "lee", "leigh", "ann", "anne", "anna", "mohammed", "muhammad"]
+LAST = ["curry", "currie", "scott", "scot", "sturtivant", "smith", "smyth", "o'neill", "oneil", "ng", "li", "lee"]
+
+
+def edit_distance(a, b):
+    """Plain Levenshtein distance, with no bound or early exit."""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def mistype(rng, text, edits):
+    """Applies random inserts, deletes and substitutions to text."""
+    for _ in range(edits):
+        i = rng.randrange(len(text) + 1)
+        kind = rng.choice("ids") if text else "i"
+        char = rng.choice("abcehijlmnorstuy ")
+        if kind == "i":
+            text = text[:i] + char + text[i:]
+        elif kind == "d" and i < len(text):
+            text = text[:i] + text[i + 1:]
+        elif i < len(text):
+            text = text[:i] + char + text[i + 1:]
+    return text
+
+
+@pytest.fixture(scope="module")
+def names():
+    rng = random.Random(36)
+    found = {f"{first} {last}" for first in FIRST for last in LAST}
+    found.update(f"{rng.choice(FIRST)} {rng.choice(LAST)}{rng.randrange(100)}" for _ in range(300))
+    return sorted(found)
+
+
+def test_bounded_levenshtein_matches_the_plain_distance():
+    rng = random.Random(1)
+    for _ in range(500):
+        a = mistype(rng, rng.choice(FIRST), rng.randrange(4))
+        b = mistype(rng, a, rng.randrange(5))
+        distance = edit_distance(a, b)
+        assert levenshtein(a, b) == distance
+        for bound in range(4):
+            assert levenshtein(a, b, bound) == (distance if distance <= bound else None)
+
+
+def test_index_matches_brute_force(names):
+    index = NameIndex(names)
+    rng = random.Random(2)
+    queries = [mistype(rng, rng.choice(names), rng.randrange(5)) for _ in range(300)]
+    queries += ["", " ", "x", "jo", "LEE SCOTT ", "zzzzzzzzzzzz"]
+    for query in queries:
+        expected = brute_force_search(names, query, limit=len(names))
+        assert index.search(query, limit=len(names)) == expected, query
+        assert index.search(query) == expected[:10]
+        for bound in (1, 3):
+            assert index.search(query, len(names), bound) == brute_force_search(names, query, len(names), bound)
+
+
+def test_store_fuzzy_find_follows_edits():
+    store = StudentStore([Student("1345", "John Curry", 8, 15, 7, 45), Student("2345", "Sam Sturtivant", 14, 15, 14, 77)])
+    assert [(d, s.code) for d, s in store.fuzzy_find("jon curry")] == [(1, "1345")]
+    store.update("1345", name="Joan Currie")
+    store.add("9876", "Sam Sturtevant", 17, 11, 16, 99)
+    assert [(d, s.code) for d, s in store.fuzzy_find("joan curie")] == [(1, "1345")]
+    assert store.fuzzy_find("john curry") == []
+    assert [(d, s.code) for d, s in store.fuzzy_find("sam sturtivant")] == [(0, "2345"), (1, "9876")]
+    store.delete("2345")
+    assert [(d, s.code) for d, s in store.fuzzy_find("sam sturtivant")] == [(1, "9876")]
@@ -0,0 +1,57 @@
+# Tests for student_grading: the compiled lookup tables against the weights, caps and bands worked out directly
+import itertools
+import os
+from fractions import Fraction
+
+import pytest
+
+from student_core import Student
+from student_grading import COMPONENT_MAX, COMPONENTS, STANDARD, GradingScheme, load_schemes
+
+CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "grading_schemes.json")
+SCHEMES, _ = load_schemes(CONFIG)
+SCHEMES['fractional'] = GradingScheme("fractional", [("P", 33.3), ("F", 0)],
+                                      {'c1': 0.25, 'c2': "1.5", 'c3': 0, 'exam': 0.7}, {'c1': 12, 'exam': 55})
+
+# Every exam mark, with coursework marks at the edges, the middle and either side of the caps
+MARKS = list(itertools.product((0, 1, 7, 11, 12, 13, 20), (0, 7, 13, 20), (0, 20), range(101)))
+
+
+def direct_result(scheme, marks):
+    """(exact fraction of the maximum, grade) worked out from the scheme's settings without the tables."""
+    def weighted(values):
+        return sum(scheme.weights[c] * (v if cap is None else min(v, cap))
+                   for c, cap, v in zip(COMPONENTS, scheme.caps, values))
+    share = weighted(marks) / sum(scheme.weights[c] * COMPONENT_MAX[c] for c in COMPONENTS)
+    grade = next(grade for grade, minimum in scheme.bands if share * 100 >= Fraction(str(minimum)))
+    return share, grade
+
+
+@pytest.mark.parametrize('name', sorted(SCHEMES))
+def test_tables_match_the_direct_calculation(name):
+    scheme = SCHEMES[name]
+    for marks in MARKS:
+        share, grade = direct_result(scheme, marks)
+        assert Fraction(scheme.total(*marks), scheme.max_total) == share
+        percentage, table_grade = scheme.result(*marks)
+        assert percentage == pytest.approx(float(share * 100))
+        assert table_grade == grade, marks
+
+
+def test_standard_scheme_matches_student():
+    for marks in MARKS:
+        student = Student("1000", "Someone", *marks)
+        assert STANDARD.result(*marks) == (student.percentage, student.grade)
+
+
+@pytest.mark.parametrize('name', sorted(SCHEMES))
+def test_regrade_matches_result_in_and_out_of_range(name):
+    scheme = SCHEMES[name]
+    students = [Student("1000", "Someone", *marks) for marks in
+                [(0, 0, 0, 0), (20, 20, 20, 100), (7, 13, 20, 64), (25, 20, 20, 100), (-1, 5, 5, 50), (5, 5, 5, 130)]]
+    scheme.regrade(students)
+    for student in students:
+        assert (student.percentage, student.grade) == scheme.result(student.c1, student.c2, student.c3, student.exam)
+        assert scheme.total(student.c1, student.c2, student.c3, student.exam) == sum(
+            m * (v if cap is None else min(v, cap)) for m, cap, v in
+            zip(scheme.multipliers, scheme.caps, (student.c1, student.c2, student.c3, student.exam)))
@@ -0,0 +1,115 @@
+# Tests for joke_ingest: exact and near-duplicate removal, and the bulk signature comparison it relies on
+import json
+import random
+from array import array
+
+import pytest
+
+import joke_ingest
+from joke_ingest import NUM_PERM, SIGNATURE_BYTES, JokeIngest, NearDuplicateIndex, equal_values, minhash
+
+# Long enough that changing one word leaves well over 80% of the shingles shared
+LONG = ("Why did the old lighthouse keeper refuse to leave his post during the storm?"
+        "Because he said the ships still needed someone who could see the funny side of a dark night.")
+REWORDED = LONG.replace("refuse to leave", "refuse to quit")
+
+
+def random_signature(rng, base=None, keep=0):
+    """A signature of random values, sharing its first keep values with base."""
+    values = array('I', (rng.getrandbits(32) for _ in range(NUM_PERM)))
+    if base is not None:
+        values[:keep] = array('I', base[:keep * 4])
+    return values.tobytes()
+
+
+def test_equal_values_counts_equal_words():
+    rng = random.Random(39)
+    signature = random_signature(rng)
+    others = [random_signature(rng, signature, keep) for keep in (0, 1, 64, 127, 128)]
+    # Values that differ only in their top or middle bytes must not count as equal
+    near = array('I', signature)
+    near[0] ^= 1 << 31
+    near[1] ^= 1 << 16
+    near[2] ^= 1 << 8
+    others.append(near.tobytes())
+    expected = [sum(a == b for a, b in zip(array('I', signature), array('I', other))) for other in others]
+    assert expected == [0, 1, 64, 127, 128, 125]
+    assert equal_values(signature, b"".join(others), len(others)) == expected
+    assert joke_ingest.similarity(signature, others[3]) == expected[3] / NUM_PERM
+
+
+def test_index_finds_the_earliest_closest_signature():
+    rng = random.Random(1)
+    index = NearDuplicateIndex(threshold=0.8)
+    original = random_signature(rng)
+    assert index.find(original) is None
+    first = index.add(original)
+    index.add(random_signature(rng))
+    index.add(original)
+    # Equal similarity to two kept jokes: the earlier one is reported
+    assert index.find(original) == (first, 1.0)
+    # Shares its first 14 bands and 115 of 128 values with the original
+    close = random_signature(rng, original, 115)
+    assert index.find(close) == (first, 115 / NUM_PERM)
+    # 96 of 128 values is under the threshold, though 12 bands match
+    assert index.find(random_signature(rng, original, 96)) is None
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    text = tmp_path / "jokes.txt"
+    text.write_text(
+        "Why did the chicken cross the road?To get to the other side.\n"
+        "no question mark here\n"
+        "\n"
+        f"{LONG}\n"
+        "WHY did the chicken   cross the road ?  to get to the other side!\n", encoding='utf-8')
+    table = tmp_path / "more.csv"
+    table.write_text(
+        "setup,punchline\n"
+        "What happens if you boil a clown?,You get a laughing stock.\n"
+        "“Why did the chicken cross the road”?,To get to the other side…\n"
+        f"\"{REWORDED.split('?')[0]}?\",\"{REWORDED.split('?')[1]}\"\n"
+        ",Empty setup\n", encoding='utf-8')
+    lines = tmp_path / "scraped.jsonl"
+    lines.write_text(
+        json.dumps({'joke': "What happens if you boil a clown? You get a laughing stock"}) + "\n"
+        + json.dumps({'setup': "Why was the maths book sad", 'punchline': "It had too many problems."}) + "\n"
+        + "{not json\n", encoding='utf-8')
+    return [str(text), str(table), str(lines)]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_ingest_keeps_the_first_copy_of_each_joke(inputs, tmp_path, workers):
+    output = tmp_path / "clean.txt"
+    ingest = JokeIngest(inputs, str(output), workers=workers, batch_size=2)
+    report = ingest.run()
+    assert output.read_text(encoding='utf-8').splitlines() == [
+        "Why did the chicken cross the road?To get to the other side.",
+        LONG,
+        "What happens if you boil a clown?You get a laughing stock.",
+        "Why was the maths book sad?It had too many problems.",
+    ]
+    assert (report.read, report.exact_duplicates, report.near_duplicates, report.kept) == (8, 3, 1, 4)
+    assert sum(report.malformed.values()) == 3
+    assert [s['records'] for s in report.sources] == [3, 3, 2]
+    (dropped, text, kept, score), = report.examples
+    assert dropped == f"{inputs[1]}:4" and kept == f"{inputs[0]}:4" and text == REWORDED
+    assert score >= 0.8
+    assert joke_ingest.similarity(minhash(joke_ingest.dedup_key(*LONG.split("?"))),
+                                  minhash(joke_ingest.dedup_key(*REWORDED.split("?")))) == score
+    assert len(ingest.index.signatures) == 4 * SIGNATURE_BYTES
+
+
+def test_lookups_compare_a_bounded_number_of_signatures():
+    rng = random.Random(2)
+    index = NearDuplicateIndex()
+    original = random_signature(rng)
+    # Every one shares a different band with the original, so every bucket fills up
+    for _ in range(200):
+        variant = array('I', random_signature(rng))
+        band = rng.randrange(joke_ingest.LSH_BANDS) * joke_ingest.BAND_ROWS
+        variant[band:band + joke_ingest.BAND_ROWS] = array('I', original)[band:band + joke_ingest.BAND_ROWS]
+        index.add(variant.tobytes())
+    assert index.find(original) is None
+    assert 0 < index.comparisons <= joke_ingest.LSH_BANDS * joke_ingest.BUCKET_LIMIT
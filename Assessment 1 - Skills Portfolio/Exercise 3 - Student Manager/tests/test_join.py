@@ -0,0 +1,60 @@
+# Tests for student_join: the spilled sort-merge join must give what the in-memory hash join gives
+import os
+import random
+
+import pytest
+
+from student_grading import GradingScheme
+from student_join import CohortJoin
+
+
+def write_cohort(path, rng, codes):
+    """Writes a marks file for some of the codes, with a repeated code, a renamed student and a bad line."""
+    chosen = rng.sample(codes, len(codes) * 2 // 3)
+    lines = [f"{code},Student {code}{rng.choice(['', ' Jr'])},{rng.randrange(21)},{rng.randrange(21)},"
+             f"{rng.randrange(21)},{rng.randrange(101)}" for code in chosen]
+    # A later record for a code already in this file is ignored by both joins
+    lines.insert(rng.randrange(len(lines)), f"{chosen[0]},Duplicate,1,1,1,1")
+    lines.append(f"{chosen[1]},Duplicate,1,1,1,1")
+    lines.insert(rng.randrange(len(lines)), "not,a,student")
+    path.write_text(f"{len(lines)}\n" + "\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def cohorts(tmp_path):
+    rng = random.Random(38)
+    codes = [str(rng.randrange(1000, 100000)) for _ in range(300)]
+    return [write_cohort(tmp_path / f"{year}.txt", rng, codes) for year in (2022, 2023, 2024, 2025)]
+
+
+def joined(join):
+    return [(r.code, r.name, r.results, r.deltas, r.trend) for r in join]
+
+
+@pytest.mark.parametrize('scheme', [None, GradingScheme("exam_weighted", weights={'exam': 1.5})])
+def test_spilled_join_matches_hash_join(cohorts, tmp_path, scheme):
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+    in_memory = CohortJoin(cohorts, scheme=scheme)
+    # Runs of 16 records with a fan-in of 3 need several merge passes
+    spilled = CohortJoin(cohorts, scheme=scheme, max_codes=50, run_size=16, spill_dir=str(spill_dir), fan_in=3)
+    expected = joined(in_memory)
+    assert joined(spilled) == expected
+    assert not in_memory.spilled and spilled.spilled
+    assert [r[0] for r in expected] == sorted(r[0] for r in expected)
+    assert spilled.movement.format() == in_memory.movement.format()
+    assert [s.skipped for s in spilled.load_stats] == [s.skipped for s in in_memory.load_stats] == [1] * 4
+    # The temporary run files are removed when the join finishes
+    assert os.listdir(spill_dir) == []
+
+
+def test_spilled_join_keeps_the_first_record_per_file(tmp_path):
+    first = tmp_path / "a.txt"
+    second = tmp_path / "b.txt"
+    first.write_text("3\n2,Bo,10,10,10,50\n1,Al,20,20,20,100\n2,Bo,0,0,0,0\n", encoding='utf-8')
+    second.write_text("2\n3,Cy,5,5,5,5\n1,Alan,10,10,10,50\n", encoding='utf-8')
+    for options in ({}, {'max_codes': 1, 'run_size': 1, 'fan_in': 2}):
+        records = list(CohortJoin([str(first), str(second)], **options))
+        assert [(r.code, r.name, [x and x[1] for x in r.results]) for r in records] == [
+            ("1", "Alan", ["A", "C"]), ("2", "Bo", ["C", None]), ("3", "Cy", [None, "F"])]
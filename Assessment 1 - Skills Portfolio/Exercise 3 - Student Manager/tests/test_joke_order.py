@@ -0,0 +1,32 @@
+# Tests for joke_server.NoRepeatOrder: every cycle is a permutation, and no joke repeats across a reshuffle
+import random
+
+import pytest
+
+from joke_server import NoRepeatOrder
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 4, 5, 7, 8, 100, 255, 256, 257, 1000, 4097])
+def test_every_cycle_is_a_permutation(n):
+    order = NoRepeatOrder(n, random.Random(n))
+    previous = None
+    for _ in range(3):
+        cycle = [next(order) for _ in range(n)]
+        assert sorted(cycle) == list(range(n))
+        if n > 1 and previous is not None:
+            # The joke that ended one cycle never starts the next
+            assert cycle[0] != previous[-1]
+        previous = cycle
+
+
+def test_orders_differ_between_clients_and_cycles():
+    first = NoRepeatOrder(1000, random.Random(1))
+    second = NoRepeatOrder(1000, random.Random(2))
+    a = [next(first) for _ in range(2000)]
+    b = [next(second) for _ in range(1000)]
+    assert a[:1000] != b and a[:1000] != a[1000:]
+    assert a[:1000] != list(range(1000))
+
+
+def test_empty_corpus_stops():
+    assert list(NoRepeatOrder(0, random.Random())) == []
@@ -0,0 +1,40 @@
+# Tests for student_server.ResponseCache: bounded by body bytes, not entry count
+import json
+
+from student_server import ResponseCache, StudentServer
+
+
+def test_cache_evicts_least_recently_used_by_bytes():
+    cache = ResponseCache(maxbytes=100, max_body=60)
+    cache.put('a', (200, b"x" * 40))
+    cache.put('b', (200, b"x" * 40))
+    assert cache.get('a') is not None
+    cache.put('c', (200, b"x" * 40))
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.bytes == 80
+    cache.put('a', (200, b"x" * 10))
+    assert cache.bytes == 50
+    cache.clear()
+    assert cache.bytes == 0 and cache.stats()['size'] == 0
+
+
+def test_large_bodies_are_not_cached():
+    cache = ResponseCache(maxbytes=100, max_body=60)
+    cache.put('small', (200, b"x" * 10))
+    cache.put('big', (200, b"x" * 61))
+    assert cache.get('big') is None and cache.get('small') is not None
+    assert cache.stats()['uncached'] == 1
+
+
+def test_full_pages_stay_within_the_byte_budget(tmp_path):
+    path = tmp_path / "marks.txt"
+    rows = [f"{1000 + i},Student Number {i},{i % 21},{i % 21},{i % 21},{i % 101}" for i in range(3000)]
+    path.write_text(f"{len(rows)}\n" + "\n".join(rows) + "\n", encoding='utf-8')
+    server = StudentServer(str(path), cache_bytes=400 * 1024)
+    for page in (1, 2, 3, 1, 2, 3):
+        status, body = server.respond(f"/students?page={page}&per_page=1000")
+        assert status == 200 and len(json.loads(body)['students']) == 1000
+    stats = server.cache.stats()
+    assert stats['bytes'] <= 400 * 1024
+    assert stats['size'] >= 1
@@ -0,0 +1,77 @@
+# Tests for student_shared: the partitioned pool analysis must agree with a plain pass over the students
+import random
+from collections import Counter
+
+import pytest
+
+import student_shared
+from student_core import Student
+from student_grading import STANDARD, GradingScheme
+from student_shared import ParallelAnalytics, SharedCohort
+
+SCHEMES = [STANDARD, GradingScheme("capped", [("P", 45), ("F", 0)], {'exam': 1.5}, {'c1': 15, 'exam': 90})]
+
+
+@pytest.fixture(scope="module")
+def students():
+    rng = random.Random(44)
+    found = [Student(str(1000 + i), f"Person {i}", rng.randrange(21), rng.randrange(21), rng.randrange(21),
+                     rng.randrange(101)) for i in range(3000)]
+    # Marks outside the brief's ranges take the slow path in every partition they land in
+    found[5] = Student("9005", "Over", 25, 20, 20, 100)
+    found[2000] = Student("9006", "Under", -3, 0, 0, 0)
+    return found
+
+
+@pytest.fixture(scope="module")
+def cohort(students):
+    cohort = SharedCohort.from_marks((s.c1, s.c2, s.c3, s.exam) for s in students)
+    yield cohort
+    cohort.close()
+    cohort.unlink()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    analytics = ParallelAnalytics(workers=2)
+    yield analytics
+    analytics.close()
+
+
+def serial_results(students, scheme):
+    """(grade counts, average percentage, top 10 (total, row)) worked out one student at a time."""
+    results = [scheme.result(s.c1, s.c2, s.c3, s.exam) for s in students]
+    grades = Counter(grade for _, grade in results)
+    average = sum(percentage for percentage, _ in results) / len(students)
+    top = sorted(((s.overall_total, row) for row, s in enumerate(students)), key=lambda pair: (-pair[0], pair[1]))
+    return grades, average, top[:10]
+
+
+@pytest.mark.parametrize('scheme', SCHEMES, ids=lambda scheme: scheme.name)
+def test_pool_matches_a_serial_pass(students, cohort, pool, monkeypatch, scheme):
+    # Partition even this small cohort across the pool
+    monkeypatch.setattr(student_shared, 'PARALLEL_MIN_ROWS', 0)
+    parallel = pool.analyse(cohort, scheme)
+    assert pool._pool is not None
+    in_process = ParallelAnalytics(workers=1).analyse(cohort, scheme)
+    grades, average, top = serial_results(students, scheme)
+    for stats in (parallel, in_process):
+        assert {grade: n for grade, n in stats.grades.items() if n} == grades
+        assert stats.average_percentage == pytest.approx(average)
+        assert stats.top == top
+        assert stats.count == len(students)
+        exams = Counter(s.exam for s in students)
+        assert stats.columns['exam'].max == max(exams) and stats.columns['exam'].min == min(exams)
+        assert stats.columns['coursework_total'].mean == pytest.approx(
+            sum(s.coursework_total for s in students) / len(students))
+    assert parallel.format() == in_process.format()
+
+
+def test_empty_cohort():
+    cohort = SharedCohort.from_marks([])
+    try:
+        stats = ParallelAnalytics(workers=1).analyse(cohort)
+        assert stats.count == 0 and stats.top == [] and stats.average_percentage == 0.0
+    finally:
+        cohort.close()
+        cohort.unlink()
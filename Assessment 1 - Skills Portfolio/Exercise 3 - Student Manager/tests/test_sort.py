@@ -0,0 +1,75 @@
+# Tests for student_sort: spilled and in-memory leaderboards against a plain sort of the same students
+import os
+import random
+
+import pytest
+
+from student_core import parse_line
+from student_sort import SORT_KEYS, ExternalSorter, Leaderboard, percentile_table
+
+NAMES = ["amy khan", "Amy Khan", "Ben Ode", "Çelik Ayşe", "zoe li", "ZOË LI", "Ng", "o'neill"]
+
+
+@pytest.fixture(scope="module")
+def marks_file(tmp_path_factory):
+    rng = random.Random(40)
+    lines = [f"{1000 + i},{rng.choice(NAMES)},{rng.randrange(21)},{rng.randrange(21)},"
+             f"{rng.randrange(21)},{rng.randrange(101)}" for i in range(1500)]
+    for bad in ("1,Too,Few", "2,Bad,x,1,1,1", ""):
+        lines.insert(rng.randrange(len(lines)), bad)
+    path = tmp_path_factory.mktemp("sort") / "marks.txt"
+    path.write_text(f"{len(lines)}\n" + "\n".join(lines) + "\n", encoding='utf-8')
+    return str(path), [s for s in map(parse_line, lines) if s is not None]
+
+
+def key_value(by, student):
+    return student.name.casefold() if by == 'name' else getattr(student, by)
+
+
+def expected_order(by, students):
+    """Key values best first, as a plain in-memory sort gives them."""
+    return sorted((key_value(by, s) for s in students), reverse=by != 'name')
+
+
+def summarise(by, rankings):
+    return [(rank, percentile, key_value(by, student), student.code) for rank, percentile, student in rankings]
+
+
+@pytest.mark.parametrize('by', SORT_KEYS)
+def test_spilled_rankings_match_in_memory(marks_file, tmp_path, by):
+    path, students = marks_file
+    in_memory = Leaderboard(path, by)
+    full = summarise(by, in_memory.rankings())
+    assert in_memory.sorter.runs == 1
+    # A few kilobytes per run and a fan-in of 2 mean dozens of runs and several merge passes
+    spilled = Leaderboard(path, by, memory_bytes=8 * 1024, spill_dir=str(tmp_path), fan_in=2)
+    assert summarise(by, spilled.rankings()) == full
+    assert spilled.sorter.runs > 8 and spilled.sorter.merge_passes > 2
+    assert os.listdir(tmp_path) == []
+    assert spilled.stats.loaded == len(students) and spilled.stats.skipped == 2
+
+    assert [entry[2] for entry in full] == expected_order(by, students)
+    table = percentile_table(spilled.histogram) if spilled.histogram is not None else None
+    for position, (rank, percentile, value, _) in enumerate(full, start=1):
+        if by == 'name':
+            assert rank == position and percentile is None
+        else:
+            # Standard competition ranking: one more than the number of better students
+            assert rank == 1 + sum(1 for s in students if key_value(by, s) > value)
+            assert percentile == table[value]
+
+
+@pytest.mark.parametrize('by', SORT_KEYS)
+@pytest.mark.parametrize('top', [1, 10, 1499, 5000])
+def test_top_matches_the_head_of_the_full_ranking(marks_file, by, top):
+    path, _ = marks_file
+    full = summarise(by, Leaderboard(path, by).rankings())
+    assert summarise(by, Leaderboard(path, by, memory_bytes=4096).rankings(top)) == full[:top]
+
+
+def test_sorter_orders_strings_like_sorted(tmp_path):
+    rng = random.Random(4)
+    entries = ["".join(rng.choice("ab\x00\t é") for _ in range(rng.randrange(6))) for _ in range(3000)]
+    sorter = ExternalSorter(memory_bytes=2048, spill_dir=str(tmp_path), fan_in=3)
+    assert list(sorter.sort(entries)) == sorted(entries)
+    assert sorter.runs > 3
@@ -0,0 +1,207 @@
+# Tests for student_writeback: edits saved back to a marks file and read again
+import os
+
+import pytest
+
+import student_writeback
+from student_core import LoadStats, StudentStore
+from student_writeback import WriteBackEngine
+
+MARKS = (
+    "3\n"
+    "1345,John Curry,8,15,7,45\n"
+    "2345,Sam Sturtivant,14,15,14,77\n"
+    "9876,Lee Scott,17,11,16,99"
+)
+
+
+def open_engine(path):
+    stats = LoadStats()
+    store = StudentStore.from_file(path, stats)
+    return store, WriteBackEngine(store, path)
+
+
+def reload(path):
+    """Returns ([(code, name, c1, c2, c3, exam)], LoadStats) as a fresh load sees the file."""
+    stats = LoadStats()
+    store = StudentStore.from_file(path, stats)
+    return [(s.code, s.name, s.c1, s.c2, s.c3, s.exam) for s in store], stats
+
+
+@pytest.fixture
+def marks_file(tmp_path):
+    path = tmp_path / "studentMarks.txt"
+    path.write_text(MARKS, encoding='utf-8')
+    return str(path)
+
+
+def test_add_round_trip(marks_file):
+    _, engine = open_engine(marks_file)
+    engine.add_student("5555", "New Person", "1", "2", "3", "4")
+    records, stats = reload(marks_file)
+    assert records[-1] == ("5555", "New Person", 1, 2, 3, 4)
+    assert len(records) == 4
+    assert stats.header_count == 4 and stats.skipped == 0
+    assert not engine.dirty
+
+
+def test_delete_round_trip(marks_file):
+    _, engine = open_engine(marks_file)
+    engine.delete_student("2345")
+    records, stats = reload(marks_file)
+    assert [r[0] for r in records] == ["1345", "9876"]
+    assert stats.header_count == 2
+
+
+def test_update_round_trip(marks_file):
+    _, engine = open_engine(marks_file)
+    engine.update_student("9876", exam=50, name="Lee Scot")
+    engine.update_student("1345", code="1346")
+    records, stats = reload(marks_file)
+    assert records == [("1346", "John Curry", 8, 15, 7, 45),
+                       ("2345", "Sam Sturtivant", 14, 15, 14, 77),
+                       ("9876", "Lee Scot", 17, 11, 16, 50)]
+    assert stats.header_count == 3
+
+
+def test_update_to_existing_code_is_rejected(marks_file):
+    _, engine = open_engine(marks_file)
+    with pytest.raises(ValueError):
+        engine.update_student("1345", code="9876")
+    assert reload(marks_file)[0][0][0] == "1345"
+
+
+def test_invalid_edit_leaves_file_untouched(marks_file):
+    _, engine = open_engine(marks_file)
+    with pytest.raises(ValueError):
+        engine.add_student("5555", "New Person", "1", "2", "3", "101")
+    with open(marks_file, encoding='utf-8') as f:
+        assert f.read() == MARKS
+
+
+def test_rewrite_repairs_header_and_keeps_malformed_lines(tmp_path):
+    # The header is wrong and one line is malformed; the save fixes the count but keeps the line
+    path = tmp_path / "studentMarks.txt"
+    path.write_text("7\n1345,John Curry,8,15,7,45\nnot a record\n2345,Sam Sturtivant,14,15,14,77\n",
+                    encoding='utf-8')
+    _, engine = open_engine(str(path))
+    engine.add_student("5555", "New Person", 1, 2, 3, 4)
+    assert path.read_text(encoding='utf-8') == (
+        "3\n1345,John Curry,8,15,7,45\nnot a record\n2345,Sam Sturtivant,14,15,14,77\n"
+        "5555,New Person,1,2,3,4\n")
+
+
+def test_malformed_lines_stay_in_place_through_edits(tmp_path):
+    path = tmp_path / "studentMarks.txt"
+    path.write_text("4\nbad first\n1345,John Curry,8,15,7,45\n2345,Sam,x,15,14,77\n2345,Sam Sturtivant,14,15,14,77\n"
+                    "9876,Lee Scott,17,11,16,99\n3000,Amy Patel,1,2,3,4\nbad last\n", encoding='utf-8')
+    stats = LoadStats()
+    store = StudentStore.from_file(str(path), stats)
+    engine = WriteBackEngine(store, str(path), load_stats=stats)
+    with engine.batch():
+        engine.update_student("1345", exam=50)
+        # The line kept before Sam moves to Lee when Sam goes
+        engine.delete_student("2345")
+        engine.add_student("5555", "New Person", 1, 2, 3, 4)
+        # The line at the end moves before nothing: it stays last
+        engine.delete_student("3000")
+    assert path.read_text(encoding='utf-8') == (
+        "3\nbad first\n1345,John Curry,8,15,7,50\n2345,Sam,x,15,14,77\n9876,Lee Scott,17,11,16,99\n"
+        "5555,New Person,1,2,3,4\nbad last\n")
+    engine.delete_student("1345")
+    engine.delete_student("9876")
+    engine.delete_student("5555")
+    assert path.read_text(encoding='utf-8') == "0\nbad first\n2345,Sam,x,15,14,77\nbad last\n"
+
+
+def test_engine_finds_malformed_lines_without_load_stats(tmp_path):
+    path = tmp_path / "studentMarks.txt"
+    path.write_text("2\n1345,John Curry,8,15,7,45\nnot a record\n2345,Sam Sturtivant,14,15,14,77\n",
+                    encoding='utf-8')
+    _, engine = open_engine(str(path))
+    engine.update_student("2345", exam=1)
+    assert "not a record\n2345,Sam Sturtivant,14,15,14,1\n" in path.read_text(encoding='utf-8')
+
+
+def test_additions_are_appended(marks_file, monkeypatch):
+    # A malformed last line without a newline, as hand-edited files often end
+    with open(marks_file, 'a', encoding='utf-8') as f:
+        f.write("\nhalf a line")
+    _, engine = open_engine(marks_file)
+
+    def no_rewrite():
+        raise AssertionError("pure additions should not rewrite the file")
+    monkeypatch.setattr(engine, '_rewrite', no_rewrite)
+    engine.add_student("5555", "New Person", 1, 2, 3, 4)
+    with engine.batch():
+        engine.add_student("5556", "Other Person", 5, 6, 7, 8)
+        engine.add_student("5557", "Third Person", 5, 6, 7, 9)
+    assert reload(marks_file)[1].header_count == 6
+    with open(marks_file, encoding='utf-8') as f:
+        assert f.read() == (MARKS.replace("3\n", "6\n", 1) + "\nhalf a line\n5555,New Person,1,2,3,4\n"
+                            "5556,Other Person,5,6,7,8\n5557,Third Person,5,6,7,9\n")
+    # The kept line stays before the first added record when the file is later rewritten
+    monkeypatch.undo()
+    engine.delete_student("5557")
+    with open(marks_file, encoding='utf-8') as f:
+        assert f.read().endswith("\nhalf a line\n5555,New Person,1,2,3,4\n5556,Other Person,5,6,7,8\n")
+
+
+def test_append_falls_back_to_rewrite_when_the_count_grows_a_digit(tmp_path):
+    path = tmp_path / "studentMarks.txt"
+    path.write_text("9\n" + "".join(f"{1000 + i},Person {i},1,2,3,4\n" for i in range(9)), encoding='utf-8')
+    _, engine = open_engine(str(path))
+    engine.add_student("5555", "New Person", 1, 2, 3, 4)
+    records, stats = reload(str(path))
+    assert stats.header_count == 10 and len(records) == 10 and stats.skipped == 0
+
+
+def test_batch_saves_once(marks_file, monkeypatch):
+    _, engine = open_engine(marks_file)
+    rewrites = []
+    original = engine._rewrite
+    monkeypatch.setattr(engine, '_rewrite', lambda: (rewrites.append(1), original()))
+    with engine.batch():
+        engine.add_student("5555", "New Person", 1, 2, 3, 4)
+        engine.update_student("5555", exam=90)
+        engine.delete_student("1345")
+        assert engine.dirty
+    assert len(rewrites) == 1
+    records, _ = reload(marks_file)
+    assert [r[0] for r in records] == ["2345", "9876", "5555"]
+    assert records[-1][-1] == 90
+
+
+def test_rewrite_keeps_file_permissions(marks_file):
+    os.chmod(marks_file, 0o640)
+    _, engine = open_engine(marks_file)
+    engine.delete_student("1345")
+    assert os.stat(marks_file).st_mode & 0o777 == 0o640
+
+
+@pytest.mark.parametrize("fail_at", ["write", "replace"])
+def test_failed_save_leaves_original_intact(marks_file, monkeypatch, fail_at):
+    _, engine = open_engine(marks_file)
+    folder = os.path.dirname(marks_file)
+
+    def fail(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+    if fail_at == "write":
+        # Fails part way through writing the temporary file
+        monkeypatch.setattr(student_writeback, 'format_lines', fail)
+    else:
+        monkeypatch.setattr(student_writeback.os, 'replace', fail)
+
+    with pytest.raises(OSError):
+        engine.add_student("5555", "New Person", 1, 2, 3, 4)
+    with open(marks_file, encoding='utf-8') as f:
+        assert f.read() == MARKS
+    # No temporary file is left behind
+    assert os.listdir(folder) == [os.path.basename(marks_file)]
+    assert engine.dirty
+
+    # The edit is kept in memory and saved by the next successful flush
+    monkeypatch.undo()
+    engine.flush()
+    records, stats = reload(marks_file)
+    assert records[-1][0] == "5555" and stats.header_count == 4
@@ -0,0 +1,6 @@
+# Benchmarks for the Skills Portfolio exercises.
+# Run each one from the 'Assessment 1 - Skills Portfolio' folder, e.g.
+#   python -m benchmarks.bench_import      cold import time of the headless modules
+#   python -m benchmarks.bench_suite       hot paths of all three apps, with regression gates
+#   python -m benchmarks.ui_latency        click-to-idle latency of the Tk apps under Xvfb
+#   python -m benchmarks.generators        synthetic marks and joke files
@@ -0,0 +1,152 @@
+# Marks Archive Benchmark
+# Packs a generated marks file with student_archive using each codec and a few
+# block sizes, and compares the archives with the plain text file: size, time
+# to pack, time to open and answer the class summary, and the latency of
+# lookups by student code.
+#
+# Usage (from the 'Assessment 1 - Skills Portfolio' folder):
+#   python -m benchmarks.bench_archive
+#   python -m benchmarks.bench_archive --rows 5000000 --block-kb 16,64,256 --output archive.json
+#
+# Archive lookups are timed cold (the block cache is emptied before each one,
+# so every lookup reads and decompresses its block) and again straight after a
+# lookup of the same code, when the block is cached. The text file has no
+# index, so its lookup reads lines until the code turns up; loading it into a
+# StudentStore first is reported separately.
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import zlib
+
+from benchmarks.bench_suite import MALFORMED_RATIO, STUDENT_DIR
+from benchmarks.generators import generate_marks_file
+
+sys.path.insert(0, STUDENT_DIR)
+import student_archive  # noqa: E402
+from student_core import LoadStats, StudentStore, parse_line  # noqa: E402
+
+PERCENTILES = [50, 90, 99]
+# Lookups that scan the text file, which take far longer than archive lookups
+TEXT_LOOKUPS = 20
+
+
+def percentiles_ms(seconds):
+    ordered = sorted(seconds)
+    return {f"p{point}": round(ordered[min(len(ordered) - 1, len(ordered) * point // 100)] * 1000, 3)
+            for point in PERCENTILES}
+
+
+def text_lookup(path, code):
+    """Finds the first student with a code by reading the marks file from the top."""
+    prefix = code + ","
+    with open(path, encoding='utf-8') as f:
+        f.readline()
+        for line in f:
+            if line.lstrip().startswith(prefix):
+                student = parse_line(line)
+                if student is not None and student.code == code:
+                    return student
+    return None
+
+
+def bench_text(path, codes):
+    start = time.perf_counter()
+    store = StudentStore.from_file(path, LoadStats())
+    summary = store.summary
+    load_seconds = time.perf_counter() - start
+    scans = []
+    for code in codes[:TEXT_LOOKUPS]:
+        start = time.perf_counter()
+        text_lookup(path, code)
+        scans.append(time.perf_counter() - start)
+    return {'bytes': os.path.getsize(path), 'summary_seconds': round(load_seconds, 4),
+            'average_percentage': summary.average_percentage, 'scan_lookup_ms': percentiles_ms(scans)}
+
+
+def bench_archive(text_path, archive_path, codec, block_kb, codes):
+    start = time.perf_counter()
+    student_archive.pack(text_path, archive_path, codec, block_kb * 1024)
+    pack_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store = student_archive.ArchiveStudentStore(archive_path)
+    summary = store.summary
+    summary_seconds = time.perf_counter() - start
+    try:
+        lookups = []
+        for code in codes:
+            # Cold lookups: every one reads and decompresses its block
+            store._cache.clear()
+            start = time.perf_counter()
+            store.get(code)
+            lookups.append(time.perf_counter() - start)
+        blocks_per_lookup = store.blocks_read / len(codes)
+        # Repeat lookups: the block is still in the cache
+        warm = []
+        for code in codes:
+            store.get(code)
+            start = time.perf_counter()
+            store.get(code)
+            warm.append(time.perf_counter() - start)
+        blocks = len(store._blocks)
+    finally:
+        store.close()
+    return {
+        'codec': codec, 'block_kb': block_kb, 'blocks': blocks, 'bytes': os.path.getsize(archive_path),
+        'pack_seconds': round(pack_seconds, 3), 'summary_seconds': round(summary_seconds, 5),
+        'average_percentage': summary.average_percentage, 'blocks_per_lookup': round(blocks_per_lookup, 2),
+        'cold_lookup_ms': percentiles_ms(lookups), 'cached_lookup_ms': percentiles_ms(warm),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark student_archive against the text marks format.")
+    parser.add_argument("--rows", type=int, default=1000000, help="generated students (default: %(default)s)")
+    parser.add_argument("--codecs", default="zlib,lzma", help="comma-separated codecs (default: %(default)s)")
+    parser.add_argument("--block-kb", default="16,64,256", help="comma-separated block sizes (default: %(default)s)")
+    parser.add_argument("--lookups", type=int, default=1000, help="codes looked up per archive")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results JSON here")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    # Mostly codes in the generated range, plus a few that are never used
+    codes = [str(rng.randint(1000, 9999) if rng.random() < 0.95 else rng.randint(10000, 99999))
+             for _ in range(args.lookups)]
+    with tempfile.TemporaryDirectory() as scratch:
+        text_path = os.path.join(scratch, "marks.txt")
+        generate_marks_file(text_path, args.rows, MALFORMED_RATIO, args.seed)
+        text = bench_text(text_path, codes)
+        with open(text_path, 'rb') as f:
+            # Whole-file compression: the size to beat, but with no random access
+            whole_file = len(zlib.compress(f.read(), 9))
+        print(f"{args.rows:,} rows, text {text['bytes'] / 1e6:.1f} MB (whole file zlib -9: {whole_file / 1e6:.1f} MB); "
+              f"load + summary {text['summary_seconds']:.2f} s; scanning lookup {text['scan_lookup_ms']}")
+        archives = []
+        for codec in args.codecs.split(","):
+            for block_kb in (int(kb) for kb in args.block_kb.split(",")):
+                result = bench_archive(text_path, os.path.join(scratch, f"marks_{codec}_{block_kb}.mka"),
+                                       codec, block_kb, codes)
+                if result['average_percentage'] != text['average_percentage']:
+                    raise AssertionError(f"{codec} archive summary differs from the text file's")
+                result['ratio'] = round(text['bytes'] / result['bytes'], 2)
+                archives.append(result)
+                print(f"  {codec:<5}{block_kb:>4} KB blocks: {result['bytes'] / 1e6:6.2f} MB ({result['ratio']}x), "
+                      f"pack {result['pack_seconds']:.2f} s, summary {result['summary_seconds'] * 1000:.2f} ms, "
+                      f"cold lookup {result['cold_lookup_ms']}, cached {result['cached_lookup_ms']}", flush=True)
+
+    results = {'python': platform.python_version(), 'platform': platform.platform(), 'rows': args.rows,
+               'text': text, 'whole_file_zlib_bytes': whole_file, 'archives': archives}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
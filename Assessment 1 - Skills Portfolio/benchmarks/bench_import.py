@@ -0,0 +1,68 @@
+# Import-Time Benchmark for the Student Manager core
+# Runs 'python -X importtime' in a fresh interpreter and checks that the
+# headless modules stay under a cold-start budget and never pull in tkinter.
+#
+# Usage:
+#   python -m benchmarks.bench_import [--budget-ms 50] [--runs 5]
+import argparse
+import os
+import subprocess
+import sys
+
+# Folder holding student_core.py and the Student Manager apps
+STUDENT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "Exercise 3 - Student Manager")
+
+# Modules that headless users import, with their cold-start budget in milliseconds
+DEFAULT_MODULES = ("student_core", "student_cli")
+DEFAULT_BUDGET_MS = 50.0
+
+
+def measure_import(module):
+    """Imports a module in a new interpreter and returns (cumulative_us, imported_names)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=STUDENT_DIR, capture_output=True, text=True, check=True)
+    cumulative = None
+    imported = set()
+    # Each stderr line looks like 'import time:   self |  cumulative | name'
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "|").split("|")]
+        imported.add(name)
+        if name == module:
+            cumulative = int(cumulative_us)
+    if cumulative is None:
+        raise RuntimeError(f"'{module}' did not appear in the -X importtime output")
+    return cumulative, imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check cold import time of the headless Student Manager modules.")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES))
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"maximum cumulative import time per module (default: {DEFAULT_BUDGET_MS})")
+    parser.add_argument("--runs", type=int, default=5, help="runs per module; the best run is reported")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.modules:
+        timings = []
+        for _ in range(max(args.runs, 1)):
+            cumulative_us, imported = measure_import(module)
+            timings.append(cumulative_us)
+        best_ms = min(timings) / 1000
+        status = "ok"
+        if any(name == "tkinter" or name.startswith("tkinter.") or name == "_tkinter" for name in imported):
+            status = "FAIL (imports tkinter)"
+            failed = True
+        elif best_ms > args.budget_ms:
+            status = f"FAIL (over {args.budget_ms:.1f} ms budget)"
+            failed = True
+        print(f"{module:<20} {best_ms:8.2f} ms  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
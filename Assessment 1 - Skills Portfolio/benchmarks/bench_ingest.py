@@ -0,0 +1,83 @@
+# Joke Ingestion Scaling Benchmark
+# Runs joke_ingest on generated inputs of growing size and reports the time
+# per joke read at each size, which stays about flat when ingestion scales
+# linearly, next to the signatures compared per near-duplicate lookup.
+#
+# Usage (from the 'Assessment 1 - Skills Portfolio' folder):
+#   python -m benchmarks.bench_ingest
+#   python -m benchmarks.bench_ingest --rows 10000,40000,160000,640000 --workers 4 --output ingest.json
+#
+# Two corpora: 'template' is the bench_suite jokes file (a few thousand
+# distinct jokes, repeated and re-cased), so most lines are exact duplicates;
+# 'distinct' numbers every setup, so the corpus keeps growing and every line
+# goes through the near-duplicate index.
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_joke_server import JOKES_DIR, distinct_joke_lines
+from benchmarks.bench_suite import DUPLICATE_RATIO, MALFORMED_RATIO
+from benchmarks.generators import joke_lines, write_lines
+
+sys.path.insert(0, JOKES_DIR)
+import joke_ingest  # noqa: E402
+
+CORPORA = {
+    'template': lambda rows, seed: joke_lines(rows, MALFORMED_RATIO, DUPLICATE_RATIO, seed),
+    'distinct': distinct_joke_lines,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark joke_ingest time against input size.")
+    parser.add_argument("--rows", default="10000,40000,160000", help="comma-separated line counts (default: %(default)s)")
+    parser.add_argument("--corpora", default="template,distinct", help="comma-separated corpora (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1, help="hashing processes (default: 1, no pool)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results JSON here")
+    args = parser.parse_args(argv)
+
+    runs = []
+    with tempfile.TemporaryDirectory() as scratch:
+        output = os.path.join(scratch, "clean.txt")
+        for corpus in args.corpora.split(","):
+            first = None
+            for rows in (int(r) for r in args.rows.split(",")):
+                path = os.path.join(scratch, f"jokes_{corpus}_{rows}.txt")
+                write_lines(path, CORPORA[corpus](rows, args.seed))
+                ingest = joke_ingest.JokeIngest([path], output, workers=args.workers)
+                start = time.perf_counter()
+                report = ingest.run()
+                seconds = time.perf_counter() - start
+                os.remove(path)
+                lookups = report.read - report.exact_duplicates
+                per_joke_us = seconds / report.read * 1e6
+                if first is None:
+                    first = per_joke_us
+                runs.append({
+                    'corpus': corpus, 'rows': rows, 'read': report.read, 'kept': report.kept,
+                    'exact_duplicates': report.exact_duplicates, 'near_duplicates': report.near_duplicates,
+                    'seconds': round(seconds, 3), 'us_per_joke': round(per_joke_us, 1),
+                    # 1.0 is perfectly linear; quadratic work doubles it every time rows double
+                    'vs_smallest': round(per_joke_us / first, 2),
+                    'comparisons_per_lookup': round(ingest.index.comparisons / lookups, 1) if lookups else 0.0,
+                })
+                run = runs[-1]
+                print(f"{corpus:<9}{rows:>10,} lines: {seconds:7.2f} s, {run['us_per_joke']:7.1f} us/joke "
+                      f"({run['vs_smallest']}x the smallest), {run['comparisons_per_lookup']} comparisons "
+                      f"per lookup, {report.kept:,} kept, {report.near_duplicates:,} near-duplicates", flush=True)
+
+    results = {'python': platform.python_version(), 'platform': platform.platform(),
+               'workers': args.workers, 'runs': runs}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+# Joke Server Scaling Benchmark
+# Starts joke_server on generated corpora with different worker counts and
+# drives it with many concurrent clients (each asking for a joke and then its
+# punchline, over and over), reporting requests per second for each worker
+# count and each worker's private memory next to the size of the shared corpus.
+#
+# Usage (from the 'Assessment 1 - Skills Portfolio' folder):
+#   python -m benchmarks.bench_joke_server
+#   python -m benchmarks.bench_joke_server --workers 1,2,4,8 --rows 10000,1000000 --output jokes.json
+#
+# Clients are spread over --client-processes processes (default: one per CPU)
+# so the client side is not the bottleneck. Throughput only scales while there
+# are free cores: with W workers and C client processes, W + C cores are busy.
+# Private memory is read from /proc and is reported as None on other platforms.
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_suite import DUPLICATE_RATIO, MALFORMED_RATIO, PORTFOLIO_DIR
+from benchmarks.generators import joke_lines, write_lines
+
+JOKES_DIR = os.path.join(PORTFOLIO_DIR, "Exercise 2 - Alexa tell me a Joke")
+
+
+def distinct_joke_lines(rows, seed):
+    """Yields generated joke chunks with every setup numbered, so the corpus grows with rows.
+
+    The generator builds jokes from a few templates, which the loader would
+    deduplicate down to a few thousand whatever the row count.
+    """
+    number = 0
+    for chunk in joke_lines(rows, MALFORMED_RATIO, DUPLICATE_RATIO, seed):
+        lines = []
+        for line in chunk.splitlines(True):
+            setup, mark, punchline = line.partition("?")
+            if mark:
+                number += 1
+                line = f"{setup} (no. {number}){mark}{punchline}"
+            lines.append(line)
+        yield "".join(lines)
+
+
+async def _client(port, pairs, deadline, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for _ in range(pairs):
+            if time.perf_counter() > deadline:
+                break
+            began = time.perf_counter()
+            writer.write(b"tell me a joke\n")
+            await reader.readline()
+            writer.write(b"punchline\n")
+            await reader.readline()
+            latencies.append(time.perf_counter() - began)
+    finally:
+        writer.close()
+
+
+def client_process(port, clients, pairs, seconds):
+    """Runs clients connections on one event loop; returns (requests, seconds, pair latencies)."""
+    async def run():
+        latencies = []
+        began = time.perf_counter()
+        await asyncio.gather(*(_client(port, pairs, began + seconds, latencies) for _ in range(clients)))
+        return 2 * len(latencies), time.perf_counter() - began, latencies
+    return asyncio.run(run())
+
+
+def private_memory_mb(pid):
+    """Returns a process's private (unshared) resident memory in MB, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding='ascii') as f:
+            kb = sum(int(line.split()[1]) for line in f if line.startswith(("Private_Clean", "Private_Dirty")))
+    except OSError:
+        return None
+    return round(kb / 1024, 1)
+
+
+def worker_pids(loader_pid):
+    """Returns the pids of the loader's worker processes (Linux only)."""
+    pids = []
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else ():
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding='ascii') as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/cmdline", 'rb') as f:
+                cmdline = f.read()
+        except (OSError, IndexError, ValueError):
+            continue
+        # The resource tracker is a child too, but is not started through spawn_main
+        if ppid == loader_pid and b"spawn_main" in cmdline:
+            pids.append(int(entry))
+    return pids
+
+
+def run_server(path, workers, args):
+    """Benchmarks one server configuration and returns its results dict."""
+    server = subprocess.Popen([sys.executable, "joke_server.py", "--file", os.path.abspath(path),
+                               "--port", "0", "--workers", str(workers)],
+                              cwd=JOKES_DIR, stdout=subprocess.PIPE, text=True)
+    try:
+        line = server.stdout.readline()
+        if not line:
+            raise RuntimeError("joke_server did not start")
+        # "Serving N jokes (X MB shared) with W workers on host:port"
+        words = line.split()
+        jokes, shared_mb = int(words[1]), float(words[3].lstrip("("))
+        port = int(words[-1].rsplit(":", 1)[1])
+        # Let the workers finish starting before the clock does
+        time.sleep(1)
+        per_process = max(1, args.clients // args.client_processes)
+        with multiprocessing.get_context('spawn').Pool(args.client_processes) as pool:
+            results = pool.starmap(client_process, [(port, per_process, args.pairs, args.seconds)]
+                                   * args.client_processes)
+        memory = [private_memory_mb(pid) for pid in worker_pids(server.pid)]
+    finally:
+        server.terminate()
+        server.wait()
+    requests = sum(r[0] for r in results)
+    seconds = max(r[1] for r in results)
+    latencies = sorted(l for r in results for l in r[2])
+    return {
+        'workers': workers,
+        'jokes': jokes,
+        'shared_mb': shared_mb,
+        'requests': requests,
+        'requests_per_second': round(requests / seconds),
+        'pair_latency_ms': {
+            'p50': round(latencies[len(latencies) // 2] * 1000, 2),
+            'p99': round(latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] * 1000, 2),
+        } if latencies else None,
+        'worker_private_mb': memory if None not in memory else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark joke_server throughput and memory by worker count.")
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts (default: %(default)s)")
+    parser.add_argument("--rows", default="10000,1000000",
+                        help="comma-separated generated corpus sizes in lines (default: %(default)s)")
+    parser.add_argument("--clients", type=int, default=200, help="concurrent connections (default: %(default)s)")
+    parser.add_argument("--client-processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pairs", type=int, default=1000, help="joke/punchline pairs per client at most")
+    parser.add_argument("--seconds", type=float, default=5.0, help="time limit per run (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results JSON here")
+    args = parser.parse_args(argv)
+
+    runs = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for rows in (int(r) for r in args.rows.split(",")):
+            path = os.path.join(scratch, f"jokes_{rows}.txt")
+            write_lines(path, distinct_joke_lines(rows, args.seed))
+            for workers in (int(w) for w in args.workers.split(",")):
+                result = run_server(path, workers, args)
+                result['rows'] = rows
+                runs.append(result)
+                print(f"{result['jokes']:>9,} jokes ({result['shared_mb']:.1f} MB shared), {workers} workers: "
+                      f"{result['requests_per_second']:>7,} req/s, pair latency {result['pair_latency_ms']}, "
+                      f"worker private MB {result['worker_private_mb']}", flush=True)
+
+    results = {'python': platform.python_version(), 'platform': platform.platform(),
+               'cpus': os.cpu_count(), 'clients': args.clients, 'runs': runs}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
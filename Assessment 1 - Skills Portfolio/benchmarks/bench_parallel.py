@@ -0,0 +1,115 @@
+# Parallel Analytics Scaling Benchmark
+# Loads a generated cohort, copies its marks into a student_shared block and
+# runs the full cohort statistics (histograms, percentiles, grade counts and
+# the top students) with 1, 2, 4 and 8 worker processes, reporting the time and
+# speedup for each next to a plain loop over the Student objects.
+#
+# Usage (from the 'Assessment 1 - Skills Portfolio' folder):
+#   python -m benchmarks.bench_parallel
+#   python -m benchmarks.bench_parallel --rows 5000000 --workers 1,2,4,8,16 --output parallel.json
+#
+# It also reports what the alternative would cost: pickling the Student list
+# to send it to the workers. Speedup can only reach the number of free cores;
+# with workers > cores the runs just share them.
+import argparse
+import heapq
+import json
+import os
+import pickle
+import platform
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from benchmarks.bench_suite import MALFORMED_RATIO, STUDENT_DIR, best_of
+from benchmarks.generators import generate_marks_file
+
+sys.path.insert(0, STUDENT_DIR)
+from student_core import LoadStats, StudentStore  # noqa: E402
+from student_shared import ParallelAnalytics, SharedCohort, STAT_COLUMNS  # noqa: E402
+
+REPEAT = 3
+
+
+def serial_statistics(students, top):
+    """The same counts as ParallelAnalytics.analyse, by looping over Student objects."""
+    histograms = {name: Counter() for name in STAT_COLUMNS}
+    grades = Counter()
+    percentage_sum = 0.0
+    for s in students:
+        for name in STAT_COLUMNS:
+            histograms[name][getattr(s, name)] += 1
+        grades[s.grade] += 1
+        percentage_sum += s.percentage
+    best = heapq.nlargest(top, ((s.overall_total, -row) for row, s in enumerate(students)))
+    return histograms, grades, percentage_sum, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark student_shared analytics by worker count.")
+    parser.add_argument("--rows", type=int, default=2000000, help="generated students (default: %(default)s)")
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results JSON here")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, "marks.txt")
+        generate_marks_file(path, args.rows, MALFORMED_RATIO, args.seed)
+        store = StudentStore.from_file(path, LoadStats())
+    students = store.students
+
+    serial_seconds, _ = best_of(REPEAT, lambda: serial_statistics(students, args.top))
+    pickle_seconds, payload = best_of(1, lambda: pickle.dumps(students, pickle.HIGHEST_PROTOCOL))
+    pickle_mb = len(payload) / 1e6
+    del payload
+    share_seconds, cohort = best_of(1, lambda: SharedCohort.from_store(store))
+    shared_mb = cohort.block.size / 1e6
+    print(f"{len(students):,} students; {os.cpu_count()} CPUs")
+    print(f"  serial loop over Students: {serial_seconds:.3f} s")
+    print(f"  pickling the Students: {pickle_seconds:.3f} s, {pickle_mb:.1f} MB")
+    print(f"  copying marks to shared memory: {share_seconds:.3f} s, {shared_mb:.1f} MB")
+
+    runs = []
+    expected = None
+    try:
+        for workers in (int(w) for w in args.workers.split(",")):
+            analytics = ParallelAnalytics(workers)
+            try:
+                # The first run also starts the pool
+                start = time.perf_counter()
+                stats = analytics.analyse(cohort, top=args.top)
+                first = time.perf_counter() - start
+                seconds, stats = best_of(REPEAT, lambda: analytics.analyse(cohort, top=args.top))
+            finally:
+                analytics.close()
+            result = (stats.grades, stats.top, stats.columns['overall_total'].percentiles)
+            if expected is None:
+                expected = result
+            elif result != expected:
+                raise AssertionError(f"{workers} workers gave different statistics")
+            runs.append({'workers': workers, 'seconds': round(seconds, 4), 'first_run_seconds': round(first, 4),
+                         'speedup': round(runs[0]['seconds'] / seconds, 2) if runs else 1.0,
+                         'vs_serial': round(serial_seconds / seconds, 2)})
+            print(f"  {workers} workers: {seconds:.3f} s (first run {first:.3f} s), "
+                  f"speedup {runs[-1]['speedup']}x, {runs[-1]['vs_serial']}x the serial loop", flush=True)
+    finally:
+        cohort.close()
+        cohort.unlink()
+
+    results = {
+        'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+        'students': len(students), 'serial_seconds': round(serial_seconds, 4),
+        'pickle_seconds': round(pickle_seconds, 4), 'pickle_mb': round(pickle_mb, 1),
+        'share_seconds': round(share_seconds, 4), 'shared_mb': round(shared_mb, 1), 'runs': runs,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
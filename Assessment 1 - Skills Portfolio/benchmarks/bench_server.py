@@ -0,0 +1,218 @@
+# Student Server Load Test
+# Opens many concurrent keep-alive connections to student_server and has each
+# one send a stream of queries (single lookups, name searches, pages of the
+# list, highest/lowest and the summary), then reports requests per second and
+# the latency distribution including the tail.
+#
+# Usage (from the 'Assessment 1 - Skills Portfolio' folder):
+#   python -m benchmarks.bench_server                        # starts a server on 100,000 generated rows
+#   python -m benchmarks.bench_server --clients 1000 --requests 50 --output server.json
+#   python -m benchmarks.bench_server --url http://127.0.0.1:8765 --file "Exercise 3 - Student Manager/resources/studentMarks.txt"
+#
+# Queries are drawn from a pool of --distinct requests, so the server's response
+# cache sees a realistic mix of repeats and misses. The client runs on one
+# event loop; on a machine with few cores it competes with the server for CPU,
+# so the figures are a floor for what the server can do.
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import quote, urlsplit
+
+from benchmarks.bench_suite import MALFORMED_RATIO, STUDENT_DIR
+from benchmarks.generators import generate_marks_file
+
+sys.path.insert(0, STUDENT_DIR)
+from student_core import iter_students  # noqa: E402
+
+# Share of each kind of query in the generated pool
+QUERY_MIX = [('code', 0.5), ('search', 0.3), ('page', 0.15), ('summary', 0.05)]
+PERCENTILES = [50, 90, 99, 99.9]
+
+
+def query_pool(path, distinct, seed):
+    """Returns distinct request paths drawn from the students in a marks file."""
+    rng = random.Random(seed)
+    students = list(iter_students(path))
+    pages = max(1, len(students) // 100)
+    kinds = [kind for kind, _ in QUERY_MIX]
+    weights = [weight for _, weight in QUERY_MIX]
+    pool = []
+    for kind in rng.choices(kinds, weights, k=distinct):
+        if kind == 'code':
+            pool.append(f"/students/{rng.choice(students).code}")
+        elif kind == 'search':
+            pool.append(f"/search?q={quote(rng.choice(students).name)}")
+        elif kind == 'page':
+            pool.append(f"/students?page={rng.randint(1, pages)}&per_page=100")
+        else:
+            pool.append(rng.choice(["/summary", "/highest", "/lowest"]))
+    return pool
+
+
+async def fetch(reader, writer, host, path):
+    """Sends one GET on an open connection and returns (status, body)."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('latin-1'))
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+class Gate:
+    """Holds every client until all of them have connected, then releases them together."""
+    def __init__(self, clients):
+        self.waiting = clients
+        self.connected = asyncio.Event()
+        self.start = asyncio.Event()
+
+    def arrived(self):
+        self.waiting -= 1
+        if self.waiting == 0:
+            self.connected.set()
+
+
+async def client(host, port, paths, gate, latencies, errors):
+    """One keep-alive connection sending its paths back to back once the gate opens."""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        errors['connect'] += 1
+        gate.arrived()
+        return
+    gate.arrived()
+    try:
+        await gate.start.wait()
+        for path in paths:
+            began = time.perf_counter()
+            status, _ = await fetch(reader, writer, host, path)
+            latencies.append(time.perf_counter() - began)
+            if status != 200:
+                errors['status'] += 1
+    except (OSError, asyncio.IncompleteReadError):
+        errors['connection'] += 1
+    finally:
+        writer.close()
+
+
+async def get_json(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, body = await fetch(reader, writer, host, path)
+        return json.loads(body)
+    finally:
+        writer.close()
+
+
+async def load_test(host, port, pool, clients, requests, seed):
+    """Runs the test and returns (wall seconds, latencies, errors, connect seconds)."""
+    rng = random.Random(seed)
+    latencies = []
+    errors = {'connect': 0, 'connection': 0, 'status': 0}
+    gate = Gate(clients)
+    connecting = time.perf_counter()
+    tasks = [asyncio.create_task(client(host, port, rng.choices(pool, k=requests), gate, latencies, errors))
+             for _ in range(clients)]
+    # Every client connects before the clock starts, so only request latency is measured
+    await gate.connected.wait()
+    connected = time.perf_counter()
+    gate.start.set()
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - connected, latencies, errors, connected - connecting
+
+
+def percentile(ordered, point):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * point / 100))]
+
+
+def start_server(path):
+    """Starts student_server on a free port and returns (process, port)."""
+    process = subprocess.Popen([sys.executable, "student_server.py", "--file", os.path.abspath(path), "--port", "0"],
+                               cwd=STUDENT_DIR, stdout=subprocess.PIPE, text=True)
+    # The server prints its address once it is listening, or exits without printing
+    line = process.stdout.readline()
+    if not line:
+        process.wait()
+        raise RuntimeError("student_server did not start")
+    return process, urlsplit(line.rsplit(" ", 1)[1].strip()).port
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test student_server with many concurrent clients.")
+    parser.add_argument("--url", help="server to test (default: start one on generated data)")
+    parser.add_argument("--file", help="marks file the server is serving, to draw queries from")
+    parser.add_argument("--rows", type=int, default=100000, help="rows to generate when starting a server")
+    parser.add_argument("--clients", type=int, default=1000, help="concurrent connections (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=20, help="requests per client (default: %(default)s)")
+    parser.add_argument("--distinct", type=int, default=5000, help="distinct queries in the pool")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results JSON here")
+    args = parser.parse_args(argv)
+
+    process = None
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.url:
+            if not args.file:
+                parser.error("--file is needed with --url")
+            path = args.file
+            parts = urlsplit(args.url)
+            host, port = parts.hostname, parts.port
+        else:
+            path = os.path.join(scratch, "marks.txt")
+            generate_marks_file(path, args.rows, MALFORMED_RATIO, args.seed)
+            process, port = start_server(path)
+            host = "127.0.0.1"
+        try:
+            pool = query_pool(path, args.distinct, args.seed)
+            seconds, latencies, errors, connect_seconds = asyncio.run(
+                load_test(host, port, pool, args.clients, args.requests, args.seed))
+            server_stats = asyncio.run(get_json(host, port, "/stats"))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    ordered = sorted(latencies)
+    if not ordered:
+        print("No requests completed.", file=sys.stderr)
+        return 1
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'students': server_stats['students'],
+        'clients': args.clients,
+        'requests': len(ordered),
+        'errors': errors,
+        'connect_seconds': round(connect_seconds, 3),
+        'seconds': round(seconds, 3),
+        'requests_per_second': round(len(ordered) / seconds),
+        'latency_ms': {f"p{point:g}": round(percentile(ordered, point) * 1000, 2) for point in PERCENTILES},
+        'cache': server_stats['cache'],
+    }
+    results['latency_ms']['max'] = round(ordered[-1] * 1000, 2)
+    results['latency_ms']['mean'] = round(sum(ordered) / len(ordered) * 1000, 2)
+    print(f"{len(ordered):,} requests from {args.clients:,} clients against {results['students']:,} students "
+          f"in {seconds:.2f} s: {results['requests_per_second']:,} req/s")
+    print("  latency ms: " + ", ".join(f"{name} {value}" for name, value in results['latency_ms'].items()))
+    print(f"  errors: {errors}; cache hit rate {server_stats['cache']['hit_rate']:.1%}; "
+          f"connecting took {connect_seconds:.2f} s")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0 if not any(errors.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
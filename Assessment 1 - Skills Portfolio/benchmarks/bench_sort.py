@@ -0,0 +1,118 @@
+# Out-of-Core Sort Benchmark
+# Generates a synthetic marks file of a given size (10 GB by default) and ranks
+# it with student_sort under a memory cap, reporting the sustained throughput
+# of the spill and merge phases and the peak memory of the process.
+#
+# Usage (from the 'Assessment 1 - Skills Portfolio' folder):
+#   python -m benchmarks.bench_sort --data-dir /scratch
+#   python -m benchmarks.bench_sort --size-gb 0.5 --memory-mb 64 --by exam --output sort.json
+#
+# The generated file is kept in --data-dir (default: the system temporary
+# folder, never the working copy) and reused by later runs; delete it when
+# done. Spill files go to --spill-dir (default: --data-dir), which needs about
+# as much free space as the input again.
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_suite import MALFORMED_RATIO, STUDENT_DIR
+from benchmarks.generators import generate_marks_file, marks_lines
+
+sys.path.insert(0, STUDENT_DIR)
+import student_sort  # noqa: E402
+
+# Rows sampled to estimate the bytes per generated line
+SAMPLE_ROWS = 10000
+
+
+def peak_memory_mb():
+    """Returns the peak resident memory of this process in MB, or None where it cannot be read."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def marks_file(data_dir, size_gb, seed):
+    """Returns the path of a generated marks file of about size_gb, generating it if needed."""
+    path = os.path.join(data_dir, f"marks_{size_gb:g}gb_{seed}.txt")
+    if not os.path.exists(path):
+        sample = "".join(marks_lines(SAMPLE_ROWS, MALFORMED_RATIO, seed))
+        rows = int(size_gb * 1024 ** 3 / (len(sample) / SAMPLE_ROWS))
+        print(f"Generating {path} ({rows:,} rows)...", flush=True)
+        generate_marks_file(path, rows, MALFORMED_RATIO, seed)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark student_sort on a large generated marks file.")
+    parser.add_argument("--size-gb", type=float, default=10.0, help="size of the generated file (default: 10)")
+    parser.add_argument("--memory-mb", type=float, default=student_sort.DEFAULT_MEMORY_MB,
+                        help="student_sort memory cap (default: %(default)s)")
+    parser.add_argument("--by", choices=student_sort.SORT_KEYS, default="overall_total")
+    parser.add_argument("--data-dir", default=tempfile.gettempdir(),
+                        help="folder for the generated file (default: %(default)s)")
+    parser.add_argument("--spill-dir", help="folder for run files (default: --data-dir)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results JSON here")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    path = marks_file(args.data_dir, args.size_gb, args.seed)
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    board = student_sort.Leaderboard(path, args.by, int(args.memory_mb * 1024 * 1024),
+                                     args.spill_dir or args.data_dir)
+
+    start = time.perf_counter()
+    rankings = board.rankings()
+    ranked = 0
+    # The first record arrives once every run is spilled and all but the last merge pass is done
+    for _ in rankings:
+        ranked += 1
+        break
+    spilled = time.perf_counter()
+    for _ in rankings:
+        ranked += 1
+    finished = time.perf_counter()
+
+    spill_seconds = spilled - start
+    merge_seconds = finished - spilled
+    total_seconds = finished - start
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'file_mb': round(size_mb, 1),
+        'rows': ranked,
+        'skipped': board.stats.skipped,
+        'by': args.by,
+        'memory_mb': args.memory_mb,
+        'runs': board.sorter.runs,
+        'merge_passes': board.sorter.merge_passes,
+        'spill_seconds': round(spill_seconds, 2),
+        'merge_seconds': round(merge_seconds, 2),
+        'total_seconds': round(total_seconds, 2),
+        'mb_per_second': round(size_mb / total_seconds, 2),
+        'rows_per_second': round(ranked / total_seconds),
+        'peak_memory_mb': peak_memory_mb(),
+    }
+    print(f"{ranked:,} rows ({size_mb:,.0f} MB) ranked by {args.by} with a {args.memory_mb:g} MB cap")
+    print(f"  spill (read, sort, write runs): {spill_seconds:8.1f} s  {size_mb / spill_seconds:7.1f} MB/s")
+    print(f"  merge ({board.sorter.merge_passes} passes, {board.sorter.runs} runs):"
+          f" {merge_seconds:8.1f} s  {size_mb / merge_seconds:7.1f} MB/s")
+    print(f"  total: {total_seconds:.1f} s, {results['mb_per_second']} MB/s, "
+          f"{results['rows_per_second']:,} rows/s, peak memory {results['peak_memory_mb']} MB")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+# Benchmark Suite with Regression Gates
+# Times the hot paths of all three apps on generated data, saves the results
+# as JSON and fails when a metric is slower than a stored baseline.
+#
+# Usage (from the 'Assessment 1 - Skills Portfolio' folder):
+#   python -m benchmarks.bench_suite --rows 1000 100000 --output results.json
+#   python -m benchmarks.bench_suite --rows 100000 --save-baseline benchmarks/baseline.json
+#   python -m benchmarks.bench_suite --rows 100000 --baseline benchmarks/baseline.json --threshold 0.25
+#
+# Each metric is the best of --repeat runs. Generated files are cached in
+# --data-dir (default: a temporary folder) and are identical for a given seed.
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import types
+
+from benchmarks.generators import generate_jokes_file, generate_marks_file, unique_names
+
+PORTFOLIO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUDENT_DIR = os.path.join(PORTFOLIO_DIR, "Exercise 3 - Student Manager")
+JOKES_APP = os.path.join(PORTFOLIO_DIR, "Exercise 2 - Alexa tell me a Joke", "alexa.py")
+QUIZ_APP = os.path.join(PORTFOLIO_DIR, "Exercise 1 - Maths Quiz", "math quiz.py")
+
+# The Student Manager and joke modules are imported by name from their own folders
+sys.path.insert(0, STUDENT_DIR)
+sys.path.insert(0, os.path.dirname(JOKES_APP))
+import joke_ingest  # noqa: E402
+import student_core  # noqa: E402
+import student_fuzzy  # noqa: E402
+import student_grading  # noqa: E402
+import student_search  # noqa: E402
+import student_sort  # noqa: E402
+
+# Fraction of malformed lines in generated files, so the skip paths are timed too
+MALFORMED_RATIO = 0.01
+LOOKUPS = 10000
+QUESTIONS = 100000
+RESIZES = 50
+# Runs the sort benchmark spills, so the merge is timed as well as the in-memory sort
+SORT_RUNS = 8
+# Fraction of repeated (sometimes re-cased or re-spaced) jokes in the ingestion input
+DUPLICATE_RATIO = 0.2
+# Misspelt names looked up by the fuzzy search benchmarks (brute force only checks a few)
+FUZZY_QUERIES = 100
+BRUTE_FORCE_QUERIES = 3
+# Names typed one character at a time by the search-as-you-type benchmark
+SEARCH_QUERIES = 100
+
+
+def load_app(name, path):
+    """Imports one of the app scripts (their file names contain spaces) as a module."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def best_of(repeat, func):
+    """Runs func() repeat times and returns (best seconds, last return value)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Suite:
+    """Collects metrics as {name: {'seconds': ..., 'items': ..., 'items_per_s': ...}}."""
+    def __init__(self, repeat, only=None):
+        self.repeat = repeat
+        self.only = only
+        self.metrics = {}
+        self.skipped = {}
+
+    def wanted(self, name):
+        return not self.only or any(name.startswith(prefix) for prefix in self.only)
+
+    def run(self, name, items, func):
+        if not self.wanted(name):
+            return None
+        seconds, result = best_of(self.repeat, func)
+        self.metrics[name] = {
+            'seconds': round(seconds, 6),
+            'items': items,
+            'items_per_s': round(items / seconds) if seconds > 0 else None,
+        }
+        print(f"{name:<40} {seconds * 1000:10.2f} ms  ({items} items)")
+        return result
+
+    def skip(self, name, reason):
+        if self.wanted(name):
+            self.skipped[name] = reason
+            print(f"{name:<40} skipped: {reason}")
+
+
+# --- Benchmarks ---
+def bench_marks(suite, data_dir, rows, seed):
+    path = os.path.join(data_dir, f"marks_{rows}_{seed}.txt")
+    if not os.path.exists(path):
+        generate_marks_file(path, rows, MALFORMED_RATIO, seed)
+
+    students = suite.run(f"marks.parse[{rows}]", rows,
+                         lambda: list(student_core.iter_students(path)))
+    if students is None:
+        students = list(student_core.iter_students(path))
+    store = suite.run(f"marks.index[{rows}]", len(students),
+                      lambda: student_core.StudentStore(students))
+    if store is None:
+        store = student_core.StudentStore(students)
+
+    rng = random.Random(seed)
+    terms = [rng.choice((s.code, s.name)) for s in rng.choices(students, k=LOOKUPS)] if students else []
+    suite.run(f"marks.lookup[{rows}]", len(terms), lambda: [store.find(t) for t in terms])
+
+    def aggregate():
+        summary = student_core.Summary()
+        for student in students:
+            summary.add(student)
+        return summary
+    suite.run(f"marks.aggregate[{rows}]", len(students), aggregate)
+    suite.run(f"marks.grading[{rows}]", len(students),
+              lambda: [s.calculate_grade() for s in students])
+
+    def format_cold():
+        student_core.record_cache.clear()
+        return "".join(s.format_details() for s in students)
+    suite.run(f"marks.format_all[{rows}]", len(students), format_cold)
+    # Repeat views are served from the record cache while the cohort fits in it
+    suite.run(f"marks.format_all_repeat[{rows}]", len(students),
+              lambda: "".join(s.format_details() for s in students))
+
+    weighted = student_grading.GradingScheme("bench", weights={"exam": 1.5}, caps={"exam": 90})
+    suite.run(f"marks.regrade[{rows}]", len(students), lambda: weighted.regrade(students))
+    suite.run(f"marks.compare_schemes[{rows}]", len(students),
+              lambda: student_grading.SchemeComparison(student_grading.STANDARD, weighted, students))
+    # Put the standard grades back for any later metrics
+    student_grading.STANDARD.regrade(students)
+
+    # About 110 bytes of sort memory per row, split into SORT_RUNS runs
+    board = student_sort.Leaderboard(path, memory_bytes=max(rows * 110 // SORT_RUNS, 64 * 1024),
+                                     spill_dir=data_dir)
+    suite.run(f"marks.sort[{rows}]", rows, lambda: sum(1 for _ in board.rankings()))
+
+
+def misspell(rng, name):
+    """Deletes, inserts or replaces one character of a name."""
+    i = rng.randrange(len(name))
+    kind = rng.randrange(3)
+    if kind == 0:
+        return name[:i] + name[i + 1:]
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return name[:i] + letter + name[i + (kind == 2):]
+
+
+def bench_fuzzy(suite, rows, seed):
+    """Fuzzy name search over `rows` distinct names: trigram index against brute-force edit distance."""
+    wanted = [n for n in (f"fuzzy.index[{rows}]", f"fuzzy.search[{rows}]", f"fuzzy.brute_force[{rows}]")
+              if suite.wanted(n)]
+    if not wanted:
+        return
+    names = unique_names(rows, seed)
+    rng = random.Random(seed)
+    queries = [misspell(rng, name) for name in rng.choices(names, k=FUZZY_QUERIES)]
+
+    index = suite.run(f"fuzzy.index[{rows}]", rows, lambda: student_fuzzy.NameIndex(names))
+    if index is None:
+        index = student_fuzzy.NameIndex(names)
+    lowered = index.names
+    suite.run(f"fuzzy.search[{rows}]", len(queries), lambda: [index.search(q) for q in queries])
+    few = queries[:BRUTE_FORCE_QUERIES]
+    suite.run(f"fuzzy.brute_force[{rows}]", len(few),
+              lambda: [student_fuzzy.brute_force_search(lowered, q) for q in few])
+
+
+def bench_search(suite, rows, seed):
+    """Search-as-you-type over `rows` students with distinct names: every prefix of typed names."""
+    wanted = [n for n in (f"search.index[{rows}]", f"search.keystrokes[{rows}]") if suite.wanted(n)]
+    if not wanted:
+        return
+    rng = random.Random(seed)
+    names = unique_names(rows, seed)
+    # unique_names is sorted, which would flatter the index build
+    rng.shuffle(names)
+    store = student_core.StudentStore(student_core.Student(str(100000 + i), name, 10, 10, 10, 50)
+                                      for i, name in enumerate(names))
+    index = suite.run(f"search.index[{rows}]", rows,
+                      lambda: student_search.PrefixIndex(store.by_code, store.by_name))
+    if index is None:
+        index = student_search.PrefixIndex(store.by_code, store.by_name)
+    prefixes = [name[:k] for name in rng.choices(names, k=SEARCH_QUERIES) for k in range(1, len(name) + 1)]
+    suite.run(f"search.keystrokes[{rows}]", len(prefixes),
+              lambda: [list(student_search.prefix_find(store, index, p)) for p in prefixes])
+
+
+def bench_jokes(suite, data_dir, rows, seed):
+    bench_ingest(suite, data_dir, rows, seed)
+    name = f"jokes.parse[{rows}]"
+    if not suite.wanted(name):
+        return
+    try:
+        alexa = load_app("alexa", JOKES_APP)
+    except ImportError as e:
+        suite.skip(name, str(e))
+        return
+    path = os.path.join(data_dir, f"jokes_{rows}_{seed}.txt")
+    if not os.path.exists(path):
+        generate_jokes_file(path, rows, MALFORMED_RATIO, 0.0, seed)
+    # load_jokes_from_file only uses self for error dialogs, which valid files never reach
+    suite.run(name, rows, lambda: alexa.JokeTellerApp.load_jokes_from_file(None, path))
+
+
+def bench_ingest(suite, data_dir, rows, seed):
+    name = f"jokes.ingest[{rows}]"
+    if not suite.wanted(name):
+        return
+    path = os.path.join(data_dir, f"jokes_dup_{rows}_{seed}.txt")
+    if not os.path.exists(path):
+        generate_jokes_file(path, rows, MALFORMED_RATIO, DUPLICATE_RATIO, seed)
+    output = os.path.join(data_dir, f"jokes_clean_{rows}_{seed}.txt")
+    # Hashed in this process, so the metric does not depend on the number of cores
+    suite.run(name, rows, lambda: joke_ingest.JokeIngest([path], output, workers=1).run())
+
+
+def bench_quiz(suite, seed):
+    wanted = [n for n in ("quiz.questions", "quiz.resize") if suite.wanted(n)]
+    if not wanted:
+        return
+    try:
+        quiz = load_app("math_quiz", QUIZ_APP)
+    except ImportError as e:
+        for name in wanted:
+            suite.skip(name, f"{e} (the Maths Quiz needs Pillow)")
+        return
+
+    def questions():
+        random.seed(seed)
+        for level in (1, 2, 3):
+            game = types.SimpleNamespace(difficulty=level)
+            for _ in range(QUESTIONS // 3):
+                quiz.GameQuiz.randomInt(game)
+                quiz.GameQuiz.decideOperation(game)
+    suite.run("quiz.questions", QUESTIONS // 3 * 3, questions)
+
+    background = quiz.GameQuiz.load_image(None, os.path.join(os.path.dirname(QUIZ_APP), "IMAGES", "background.png"))
+
+    def resizes():
+        # Alternate sizes like a user dragging the window edge
+        for i in range(RESIZES):
+            background.resize((600 + i * 8, 500 + i * 6))
+    suite.run("quiz.resize", RESIZES, resizes)
+
+
+# --- Baselines ---
+def compare(metrics, baseline, threshold):
+    """Returns a list of (name, baseline_s, current_s) for metrics slower than the threshold allows."""
+    regressions = []
+    for name, result in metrics.items():
+        reference = baseline.get('metrics', {}).get(name)
+        if reference is None:
+            continue
+        if result['seconds'] > reference['seconds'] * (1 + threshold):
+            regressions.append((name, reference['seconds'], result['seconds']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Skills Portfolio hot paths.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000],
+                        help="data sizes to benchmark (default: 1000 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per metric; the best is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", metavar="PREFIX", help="only run metrics starting with these names")
+    parser.add_argument("--data-dir", help="folder to cache generated data in")
+    parser.add_argument("--output", help="write the results JSON here")
+    parser.add_argument("--baseline", help="fail if any metric regressed against this results JSON")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown against the baseline, as a fraction (default: 0.25)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write the results as a new baseline")
+    args = parser.parse_args(argv)
+
+    suite = Suite(max(args.repeat, 1), args.only)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = args.data_dir or temp_dir
+        os.makedirs(data_dir, exist_ok=True)
+        for rows in args.rows:
+            bench_marks(suite, data_dir, rows, args.seed)
+            bench_jokes(suite, data_dir, rows, args.seed)
+            bench_fuzzy(suite, rows, args.seed)
+            bench_search(suite, rows, args.seed)
+        bench_quiz(suite, args.seed)
+
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'metrics': suite.metrics,
+        'skipped': suite.skipped,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline:
+        try:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except OSError as e:
+            print(f"bench_suite: cannot read baseline: {e}", file=sys.stderr)
+            return 2
+        regressions = compare(suite.metrics, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms "
+                  f"(+{(after / before - 1) * 100:.0f}%)", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+# Synthetic Data Generators
+# Deterministic studentMarks.txt and randomJokes.txt style files at any size,
+# with optional malformed lines to exercise the parsers' skip paths.
+#
+# Usage:
+#   python -m benchmarks.generators marks marks_1m.txt --rows 1000000 --malformed 0.01
+#   python -m benchmarks.generators jokes jokes_100k.txt --rows 100000 --duplicates 0.1
+import argparse
+import random
+import sys
+
+# Lines are built and written in chunks of this many rows
+CHUNK_ROWS = 100000
+
+FIRST_NAMES = ["John", "Sam", "Lee", "Matt", "Ron", "Jake", "Jo", "Gareth", "Alan", "Les",
+               "Amy", "Priya", "Omar", "Chen", "Sara", "Tom", "Nina", "Ali", "Eve", "Raj"]
+LAST_NAMES = ["Curry", "Sturtivant", "Scott", "Thompson", "Herrema", "Hobbs", "Hyde",
+              "Southgate", "Shearer", "Ferdinand", "Patel", "Khan", "Smith", "Jones",
+              "Brown", "Taylor", "Wilson", "Evans", "Walker", "Wright"]
+
+SETUPS = ["Why did the {0} cross the road", "What do you call a {0} with no {1}",
+          "How does a {0} fix a {1}", "What did the {0} say to the {1}",
+          "Why was the {0} afraid of the {1}", "Where does a {0} keep its {1}"]
+PUNCHLINES = ["To get to the other {1}.", "A {1}-less {0}!", "With a {1} of course.",
+              "Nothing, it just waved.", "Because it was too {1}.", "In the {1} bank."]
+WORDS = ["chicken", "clown", "car", "hipster", "janitor", "robot", "cow", "pirate",
+         "ghost", "banana", "wizard", "penguin", "tire", "pizza", "closet", "spoon"]
+
+# Surname pieces for generating large numbers of distinct names
+SURNAME_PARTS = ["ash", "black", "brook", "bur", "cal", "dun", "el", "fair", "far", "gold", "green",
+                 "hal", "hart", "kings", "lang", "mar", "mor", "new", "ol", "pen", "ridge", "ros",
+                 "stan", "thorn", "wal", "west", "win", "wood", "ford", "ton", "ley", "well", "by",
+                 "ham", "field", "more", "wick", "worth", "den", "son", "croft", "shaw", "ing", "ver"]
+
+# Kinds of malformed marks lines, all of which load_data skips
+MALFORMED_MARKS = [
+    "{code},{name},{c1},{c2},{c3}\n",           # missing exam mark
+    "{code},{name},{c1},x{c2},{c3},{exam}\n",    # non-integer mark
+    "{code},{name},{c1},{c2},{c3},{exam},9\n",   # extra field
+]
+
+
+def marks_lines(rows, malformed_ratio=0.0, seed=0):
+    """Yields chunks of marks file lines (header first) for a deterministic cohort."""
+    rng = random.Random(seed)
+    rand = rng.random
+    names = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+    name_count = len(names)
+    yield f"{rows}\n"
+    for start in range(0, rows, CHUNK_ROWS):
+        chunk = []
+        for _ in range(min(CHUNK_ROWS, rows - start)):
+            # int(rand() * n) is several times faster than randint() for bulk data
+            code = 1000 + int(rand() * 9000)
+            name = names[int(rand() * name_count)]
+            c1, c2, c3 = int(rand() * 21), int(rand() * 21), int(rand() * 21)
+            exam = int(rand() * 101)
+            if malformed_ratio and rand() < malformed_ratio:
+                chunk.append(rng.choice(MALFORMED_MARKS).format(
+                    code=code, name=name, c1=c1, c2=c2, c3=c3, exam=exam))
+            else:
+                chunk.append(f"{code},{name},{c1},{c2},{c3},{exam}\n")
+        yield "".join(chunk)
+
+
+def unique_names(count, seed=0):
+    """Returns count distinct 'First Surname' names, with surnames built from SURNAME_PARTS."""
+    rng = random.Random(seed)
+    parts = SURNAME_PARTS
+    names = set()
+    while len(names) < count:
+        first = FIRST_NAMES[int(rng.random() * len(FIRST_NAMES))]
+        pieces = [parts[int(rng.random() * len(parts))] for _ in range(2 + int(rng.random() * 3))]
+        names.add(f"{first} {''.join(pieces).capitalize()}")
+    return sorted(names)
+
+
+def joke_lines(rows, malformed_ratio=0.0, duplicate_ratio=0.0, seed=0):
+    """Yields chunks of 'setup?punchline' lines, with optional malformed and near-duplicate lines."""
+    rng = random.Random(seed)
+    # Ring buffer of recent jokes to draw duplicates from
+    recent = []
+    written = 0
+    for start in range(0, rows, CHUNK_ROWS):
+        chunk = []
+        for _ in range(min(CHUNK_ROWS, rows - start)):
+            if recent and duplicate_ratio and rng.random() < duplicate_ratio:
+                # Same joke again, sometimes with different case or spacing
+                line = rng.choice(recent)
+                variant = rng.randrange(3)
+                if variant == 1:
+                    line = line.upper()
+                elif variant == 2:
+                    line = "  " + line.replace(" ", "  ")
+                chunk.append(line + "\n")
+                continue
+            a, b = rng.choice(WORDS), rng.choice(WORDS)
+            setup = rng.choice(SETUPS).format(a, b)
+            punchline = rng.choice(PUNCHLINES).format(a, b)
+            if malformed_ratio and rng.random() < malformed_ratio:
+                # No question mark, so load_jokes_from_file drops it
+                chunk.append(f"{setup}. {punchline}\n")
+                continue
+            line = f"{setup}?{punchline}"
+            if len(recent) < 1000:
+                recent.append(line)
+            else:
+                recent[written % 1000] = line
+            written += 1
+            chunk.append(line + "\n")
+        yield "".join(chunk)
+
+
+def write_lines(path, chunks):
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def generate_marks_file(path, rows, malformed_ratio=0.0, seed=0):
+    """Writes a marks file with a header of `rows` followed by that many lines."""
+    write_lines(path, marks_lines(rows, malformed_ratio, seed))
+
+
+def generate_jokes_file(path, rows, malformed_ratio=0.0, duplicate_ratio=0.0, seed=0):
+    """Writes a jokes file with `rows` lines."""
+    write_lines(path, joke_lines(rows, malformed_ratio, duplicate_ratio, seed))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic marks or joke files.")
+    parser.add_argument("kind", choices=("marks", "jokes"))
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--malformed", type=float, default=0.0, help="fraction of malformed lines")
+    parser.add_argument("--duplicates", type=float, default=0.0, help="fraction of repeated jokes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.kind == "marks":
+        generate_marks_file(args.path, args.rows, args.malformed, args.seed)
+    else:
+        generate_jokes_file(args.path, args.rows, args.malformed, args.duplicates, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
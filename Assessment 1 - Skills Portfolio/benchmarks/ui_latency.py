@@ -0,0 +1,280 @@
+# Scripted UI Latency Harness
+# Drives the real Tk apps with synthetic events under a virtual X display and
+# reports how long each interaction takes from input to an idle, redrawn window.
+#
+# Usage (from the 'Assessment 1 - Skills Portfolio' folder):
+#   python -m benchmarks.ui_latency                       # starts Xvfb if DISPLAY is unset
+#   python -m benchmarks.ui_latency --apps student --rows 5000 --iterations 30
+#   python -m benchmarks.ui_latency --output ui.json --max-p95-ms 150
+#
+# Clicks are injected with event_generate (<Enter>, <ButtonPress-1>,
+# <ButtonRelease-1>), so the same Tk bindings run as for a real mouse. Modal
+# messagebox/simpledialog calls are replaced with scripted answers so nothing
+# blocks. Each sample covers the event itself, any follow-up after() work
+# (such as streamed output) and update_idletasks() until the window is idle.
+import argparse
+import contextlib
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_suite import JOKES_APP, QUIZ_APP, STUDENT_DIR, load_app
+from benchmarks.generators import generate_marks_file
+
+APPS = ("student", "jokes", "quiz")
+
+
+# --- Virtual Display ---
+@contextlib.contextmanager
+def virtual_display(width=1280, height=1024):
+    """Starts Xvfb on a free display number unless a DISPLAY is already available."""
+    if os.environ.get("DISPLAY"):
+        yield os.environ["DISPLAY"]
+        return
+    if shutil.which("Xvfb") is None:
+        raise RuntimeError("No DISPLAY is set and Xvfb is not installed.")
+    number = 99
+    while os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+        number += 1
+    display = f":{number}"
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", f"{width}x{height}x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    try:
+        # Wait for the server socket before letting Tk connect
+        deadline = time.monotonic() + 10
+        while not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"Xvfb failed to start on {display}")
+            time.sleep(0.05)
+        yield display
+    finally:
+        process.terminate()
+        process.wait(timeout=5)
+        del os.environ["DISPLAY"]
+
+
+# --- Dialog Stubs ---
+@contextlib.contextmanager
+def stub_dialogs(answers):
+    """Replaces modal dialogs with functions that return scripted answers without blocking.
+
+    answers maps a dialog function name (e.g. 'askstring') to a callable that
+    returns the value the user would have entered.
+    """
+    from tkinter import messagebox, simpledialog
+    replaced = []
+    calls = {}
+
+    def stub(module, name, default):
+        original = getattr(module, name)
+        replaced.append((module, name, original))
+
+        def fake(*args, **kwargs):
+            calls[name] = calls.get(name, 0) + 1
+            return answers[name]() if name in answers else default
+        setattr(module, name, fake)
+
+    for name in ("showinfo", "showwarning", "showerror"):
+        stub(messagebox, name, "ok")
+    stub(messagebox, "askyesno", True)
+    for name in ("askstring", "askinteger", "askfloat"):
+        stub(simpledialog, name, None)
+    try:
+        yield calls
+    finally:
+        for module, name, original in replaced:
+            setattr(module, name, original)
+
+
+# --- Event Injection ---
+def find_button(widget, text):
+    """Returns the first Button under widget whose label starts with text."""
+    import tkinter as tk
+    for child in widget.winfo_children():
+        if isinstance(child, tk.Button) and str(child.cget('text')).startswith(text):
+            return child
+        found = find_button(child, text)
+        if found is not None:
+            return found
+    return None
+
+
+def click(button):
+    """Sends the same events as a mouse click to a button (its command runs synchronously)."""
+    button.event_generate("<Enter>", x=2, y=2)
+    button.event_generate("<ButtonPress-1>", x=2, y=2)
+    button.event_generate("<ButtonRelease-1>", x=2, y=2)
+
+
+def settle(root, busy=lambda: False):
+    """Processes events until busy() is False and Tk has no idle work left."""
+    root.update()
+    while busy():
+        root.update()
+    root.update_idletasks()
+
+
+def measure(root, action, busy=lambda: False):
+    """Returns milliseconds from action() until the window is idle again."""
+    start = time.perf_counter()
+    action()
+    settle(root, busy)
+    return (time.perf_counter() - start) * 1000
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+# --- Scenarios ---
+def run_student(root, iterations, rows, work_dir):
+    """View All, View Individual, Highest Score and typing in the live search box on a generated cohort."""
+    # The app reads resources/studentMarks.txt relative to the working folder
+    os.makedirs(os.path.join(work_dir, "resources"), exist_ok=True)
+    generate_marks_file(os.path.join(work_dir, "resources", "studentMarks.txt"), rows)
+    os.chdir(work_dir)
+    app_module = load_app("student_manager", os.path.join(STUDENT_DIR, "student manager.py"))
+
+    samples = {"student.view_all": [], "student.view_individual": [], "student.highest": [],
+               "student.search_keystroke": []}
+    with stub_dialogs({"askstring": lambda: app.students.students[0].name}):
+        app = app_module.StudentApp(root)
+        settle(root)
+        streaming = lambda: getattr(app, '_stream_job', None) is not None
+        buttons = {"student.view_all": find_button(root, "1."),
+                   "student.view_individual": find_button(root, "2."),
+                   "student.highest": find_button(root, "3.")}
+        for _ in range(iterations):
+            for name, button in buttons.items():
+                samples[name].append(measure(root, lambda: click(button), streaming))
+
+        # Each sample is one more character typed, up to the matches being listed (debounce included)
+        searching = lambda: app._search_job is not None or app._search_poll is not None
+        name = app.students.students[-1].name
+        # The first query waits for the worker to build its index, which is not a keystroke
+        measure(root, lambda: app.search_text.set(name), searching)
+        for i in range(iterations):
+            prefix = name[:i % len(name) + 1]
+            samples["student.search_keystroke"].append(
+                measure(root, lambda: app.search_text.set(prefix), searching))
+    return samples
+
+
+def run_jokes(root, iterations, rows, work_dir):
+    """'Alexa tell me a Joke' / 'Next Joke' and 'Show Punchline'."""
+    os.chdir(os.path.dirname(JOKES_APP))
+    app_module = load_app("alexa", JOKES_APP)
+    samples = {"jokes.next_joke": [], "jokes.show_punchline": []}
+    with stub_dialogs({}):
+        app = app_module.JokeTellerApp(root)
+        settle(root)
+        for _ in range(iterations):
+            samples["jokes.next_joke"].append(measure(root, lambda: click(app.joke_button)))
+            samples["jokes.show_punchline"].append(measure(root, lambda: click(app.punchline_button)))
+    return samples
+
+
+def run_quiz(root, iterations, rows, work_dir):
+    """Submit a correct answer and wait for the next question to be drawn."""
+    app_module = load_app("math_quiz", QUIZ_APP)
+    samples = {"quiz.submit_answer": []}
+    with stub_dialogs({}):
+        app = app_module.GameQuiz(root)
+        settle(root)
+        app.startQuiz(1)
+        settle(root)
+        while len(samples["quiz.submit_answer"]) < iterations:
+            if app.current_screen != "quiz":
+                app.startQuiz(1)
+                settle(root)
+            entry = next(w for w in app.widgets if w.winfo_class() == "Entry")
+            submit = next(w for w in app.widgets if w.winfo_class() == "Button")
+            entry.delete(0, "end")
+            entry.insert(0, str(app.current_answer))
+            samples["quiz.submit_answer"].append(measure(root, lambda: click(submit)))
+    return samples
+
+
+SCENARIOS = {"student": run_student, "jokes": run_jokes, "quiz": run_quiz}
+
+
+def run_app(name, iterations, rows):
+    """Runs one scenario in a fresh Tk root and returns {interaction: samples}."""
+    import tkinter as tk
+    start_dir = os.getcwd()
+    root = tk.Tk()
+    root.geometry("800x600+0+0")
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            return SCENARIOS[name](root, iterations, rows, work_dir)
+    finally:
+        os.chdir(start_dir)
+        root.destroy()
+
+
+def collect(apps, iterations, rows):
+    """Runs each app's scenario and returns ({interaction: percentiles}, {app: skip reason})."""
+    results = {}
+    skipped = {}
+    for name in apps:
+        try:
+            samples = run_app(name, iterations, rows)
+        except ImportError as e:
+            skipped[name] = str(e)
+            print(f"{name:<26} skipped: {e}")
+            continue
+        for interaction, values in samples.items():
+            results[interaction] = r = {
+                'samples': len(values),
+                'p50_ms': round(percentile(values, 0.50), 3),
+                'p95_ms': round(percentile(values, 0.95), 3),
+                'p99_ms': round(percentile(values, 0.99), 3),
+                'max_ms': round(max(values), 3),
+            }
+            print(f"{interaction:<26} p50 {r['p50_ms']:8.2f} ms  p95 {r['p95_ms']:8.2f} ms  "
+                  f"p99 {r['p99_ms']:8.2f} ms")
+    return results, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure click-to-idle latency of the Tk apps.")
+    parser.add_argument("--apps", nargs="+", choices=APPS, default=list(APPS))
+    parser.add_argument("--iterations", type=int, default=50, help="samples per interaction")
+    parser.add_argument("--rows", type=int, default=1000, help="students in the generated cohort")
+    parser.add_argument("--output", help="write the results JSON here")
+    parser.add_argument("--max-p95-ms", type=float,
+                        help="exit with an error if any interaction's p95 exceeds this")
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        try:
+            stack.enter_context(virtual_display())
+        except RuntimeError as e:
+            print(f"ui_latency: {e}", file=sys.stderr)
+            return 2
+        results, skipped = collect(args.apps, args.iterations, args.rows)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'rows': args.rows, 'interactions': results, 'skipped': skipped}, f, indent=2)
+
+    if args.max_p95_ms is not None:
+        slow = [name for name, r in results.items() if r['p95_ms'] > args.max_p95_ms]
+        for name in slow:
+            print(f"SLOW {name}: p95 {results[name]['p95_ms']:.2f} ms > {args.max_p95_ms} ms", file=sys.stderr)
+        if slow:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
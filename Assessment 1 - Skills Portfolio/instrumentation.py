@@ -0,0 +1,254 @@
+# Shared Instrumentation for the Skills Portfolio apps
+# Timers, counters and latency histograms for the Maths Quiz, Joke Teller and
+# Student Manager, with optional cProfile / tracemalloc capture.
+#
+# Everything is switched off unless an environment variable turns it on:
+#   PORTFOLIO_PERF=1                  record timings and counters
+#   PORTFOLIO_PERF=cprofile           ... and profile every timed operation with cProfile
+#   PORTFOLIO_PERF=tracemalloc        ... and record peak memory per timed operation
+#   PORTFOLIO_PERF_REPORT=report.json write the JSON report when the app exits
+#
+# While disabled, @timed returns the function unchanged and timer() returns a
+# shared no-op context manager, so instrumented code runs at full speed.
+# Inside a running app, Ctrl+Shift+D opens a hidden debug panel with the report.
+import atexit
+import bisect
+import contextlib
+import functools
+import io
+import json
+import os
+import time
+
+PERF_ENV_VAR = "PORTFOLIO_PERF"
+REPORT_ENV_VAR = "PORTFOLIO_PERF_REPORT"
+
+# Histogram bucket upper bounds in milliseconds (1-2-5 series from 10 us to 10 s)
+BUCKET_BOUNDS_MS = [m * 10 ** e for e in range(-2, 4) for m in (1, 2, 5)] + [10000]
+
+_mode = os.environ.get(PERF_ENV_VAR, "").strip().lower()
+enabled = _mode not in ("", "0", "off", "false", "no")
+capture = _mode if _mode in ("cprofile", "tracemalloc") else None
+
+
+# --- Metrics ---
+class Histogram:
+    """Latency distribution for one operation, bucketed by BUCKET_BOUNDS_MS."""
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.peak_memory_kb = 0
+
+    def add(self, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.min_ms = elapsed_ms if self.min_ms is None else min(self.min_ms, elapsed_ms)
+        self.max_ms = elapsed_ms if self.max_ms is None else max(self.max_ms, elapsed_ms)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+
+    def percentile(self, fraction):
+        """Returns the bucket upper bound below which this fraction of samples fall."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bound, bucket_count in zip(BUCKET_BOUNDS_MS + [self.max_ms], self.buckets):
+            seen += bucket_count
+            if seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': _round(self.total_ms / self.count) if self.count else None,
+            'min_ms': _round(self.min_ms),
+            'max_ms': _round(self.max_ms),
+            'p50_ms': _round(self.percentile(0.50)),
+            'p95_ms': _round(self.percentile(0.95)),
+            'p99_ms': _round(self.percentile(0.99)),
+            'peak_memory_kb': self.peak_memory_kb if capture == "tracemalloc" else None,
+        }
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
+
+
+histograms = {}
+counters = {}
+gauges = {}
+_profiler = None
+_profile_depth = 0
+
+
+def count(name, amount=1):
+    """Adds to a named counter (no-op while disabled)."""
+    if enabled:
+        counters[name] = counters.get(name, 0) + amount
+
+
+def gauge(name, read):
+    """Registers read() -> JSON-ready value, which is called each time a report is built."""
+    gauges[name] = read
+
+
+def record(name, elapsed_ms):
+    """Adds one latency sample to the named histogram."""
+    histogram = histograms.get(name)
+    if histogram is None:
+        histogram = histograms[name] = Histogram()
+    histogram.add(elapsed_ms)
+
+
+# --- Timers ---
+class _Timer:
+    """Context manager that records the time (and optionally memory) of one operation."""
+    __slots__ = ('name', 'start', 'memory_start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        if capture == "tracemalloc":
+            import tracemalloc
+            tracemalloc.reset_peak()
+            self.memory_start = tracemalloc.get_traced_memory()[0]
+        elif capture == "cprofile":
+            _profile_start()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed_ms = (time.perf_counter() - self.start) * 1000
+        if capture == "cprofile":
+            _profile_stop()
+        record(self.name, elapsed_ms)
+        if capture == "tracemalloc":
+            import tracemalloc
+            peak_kb = (tracemalloc.get_traced_memory()[1] - self.memory_start) // 1024
+            histogram = histograms[self.name]
+            histogram.peak_memory_kb = max(histogram.peak_memory_kb, peak_kb)
+        return False
+
+
+def _profile_start():
+    # Nested timers share one profiler; only the outermost one switches it on and off
+    global _profile_depth
+    if _profile_depth == 0:
+        _profiler.enable()
+    _profile_depth += 1
+
+
+def _profile_stop():
+    global _profile_depth
+    _profile_depth -= 1
+    if _profile_depth == 0:
+        _profiler.disable()
+
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+def timer(name):
+    """Returns a context manager that times its block under the given operation name."""
+    return _Timer(name) if enabled else _NULL_TIMER
+
+
+def timed(name=None):
+    """Decorator that times every call of a function; returns it unchanged while disabled."""
+    def decorate(func):
+        if not enabled:
+            return func
+        operation = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(operation):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# --- Reporting ---
+def report():
+    """Returns every histogram and counter (plus the top cProfile entries) as a JSON-ready dict."""
+    result = {
+        'mode': capture or ("timing" if enabled else "disabled"),
+        'operations': {name: h.to_dict() for name, h in sorted(histograms.items())},
+        'counters': dict(sorted(counters.items())),
+        'gauges': {name: read() for name, read in sorted(gauges.items())},
+    }
+    if capture == "cprofile" and _profiler is not None:
+        import pstats
+        stream = io.StringIO()
+        stats = pstats.Stats(_profiler, stream=stream)
+        stats.sort_stats("cumulative").print_stats(25)
+        result['cprofile_top'] = stream.getvalue().splitlines()
+    return result
+
+
+def report_json():
+    return json.dumps(report(), indent=2)
+
+
+def dump_report(path):
+    """Writes the JSON report to a file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(report_json())
+
+
+def reset():
+    """Clears all recorded histograms and counters."""
+    histograms.clear()
+    counters.clear()
+
+
+def install_debug_panel(root):
+    """Binds Ctrl+Shift+D on a Tk window to a panel showing the live JSON report."""
+    # Imported here so headless users of this module never load tkinter
+    import tkinter as tk
+    from tkinter import filedialog, scrolledtext
+
+    def open_panel(event=None):
+        panel = tk.Toplevel(root)
+        panel.title("Performance Report")
+        panel.geometry("520x420")
+        text = scrolledtext.ScrolledText(panel, wrap=tk.NONE, font=('Consolas', 9))
+        text.pack(fill='both', expand=True)
+
+        def refresh():
+            text.delete('1.0', tk.END)
+            text.insert(tk.END, report_json())
+
+        def save():
+            path = filedialog.asksaveasfilename(parent=panel, defaultextension=".json",
+                                                filetypes=[("JSON", "*.json")])
+            if path:
+                dump_report(path)
+
+        buttons = tk.Frame(panel)
+        buttons.pack(fill='x')
+        tk.Button(buttons, text="Refresh", command=refresh).pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Button(buttons, text="Reset", command=lambda: (reset(), refresh())).pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Button(buttons, text="Save JSON...", command=save).pack(side=tk.LEFT, padx=5, pady=5)
+        refresh()
+
+    root.bind_all("<Control-Shift-D>", open_panel)
+    root.bind_all("<Control-Shift-d>", open_panel)
+
+
+# --- Startup ---
+if capture == "cprofile":
+    import cProfile
+    _profiler = cProfile.Profile()
+elif capture == "tracemalloc":
+    import tracemalloc
+    tracemalloc.start()
+
+if enabled and os.environ.get(REPORT_ENV_VAR):
+    atexit.register(dump_report, os.environ[REPORT_ENV_VAR])